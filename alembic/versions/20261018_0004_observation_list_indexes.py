@@ -0,0 +1,43 @@
+"""partial indexes for paginated and filtered observation lists
+
+Revision ID: 20261018_0004
+Revises: 20260218_0003
+Create Date: 2026-10-18 00:00:04.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0004"
+down_revision: Union[str, None] = "20260218_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE_INDEXES = {
+    "ix_observations_live_project_created": ["project_id", "created_at", "id"],
+    "ix_observations_live_project_status": ["project_id", "status", "created_at"],
+    "ix_observations_live_project_property_type": ["project_id", "property_type_id", "created_at"],
+    "ix_observations_live_project_valuation_date": ["project_id", "valuation_date"],
+    "ix_observations_live_project_price": ["project_id", "market_value_total"],
+    "ix_observations_live_project_surface": ["project_id", "surface_total"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in LIVE_INDEXES.items():
+        op.create_index(
+            name,
+            "observations",
+            columns,
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    for name in reversed(list(LIVE_INDEXES)):
+        op.drop_index(name, table_name="observations")
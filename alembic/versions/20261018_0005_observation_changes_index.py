@@ -0,0 +1,30 @@
+"""index observations by project and updated_at for delta sync
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 00:00:05.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0005"
+down_revision: Union[str, None] = "20261018_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Not partial: soft-deleted rows must stay visible to emit tombstones.
+    op.create_index(
+        "ix_observations_project_updated_at",
+        "observations",
+        ["project_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_observations_project_updated_at", table_name="observations")
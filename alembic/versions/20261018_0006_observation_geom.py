@@ -0,0 +1,53 @@
+"""PostGIS point geometry for observations
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 00:00:06.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0006"
+down_revision: Union[str, None] = "20261018_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.execute("ALTER TABLE observations ADD COLUMN geom geometry(Point, 4326)")
+
+    # Backfill from extras.coordinates ([lon, lat]). The CTE is materialized so the
+    # casts only run on rows whose JSON values are actually numbers.
+    op.execute(
+        """
+        WITH coords AS MATERIALIZED (
+            SELECT
+                id,
+                (extras -> 'coordinates' ->> 0)::double precision AS lon,
+                (extras -> 'coordinates' ->> 1)::double precision AS lat
+            FROM observations
+            WHERE jsonb_typeof(extras -> 'coordinates') = 'array'
+              AND jsonb_typeof(extras -> 'coordinates' -> 0) = 'number'
+              AND jsonb_typeof(extras -> 'coordinates' -> 1) = 'number'
+        )
+        UPDATE observations AS o
+        SET geom = ST_SetSRID(ST_MakePoint(coords.lon, coords.lat), 4326)
+        FROM coords
+        WHERE o.id = coords.id
+          AND coords.lon BETWEEN -180 AND 180
+          AND coords.lat BETWEEN -90 AND 90
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX ix_observations_live_geom ON observations USING gist (geom) WHERE deleted_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_observations_live_geom")
+    op.execute("ALTER TABLE observations DROP COLUMN geom")
@@ -0,0 +1,77 @@
+"""materialized view with price per m2 statistics
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 00:00:07.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0007"
+down_revision: Union[str, None] = "20261018_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# zone is a 0.01 degree grid cell "x:y" (app.services.market_stats.STATS_GRID_DEGREES),
+# "unlocated" without geometry, or "*" for the whole project; period is "YYYY-MM" or "*".
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW observation_market_stats AS
+        WITH priced AS (
+            SELECT
+                o.project_id,
+                pt.code AS property_type,
+                cur.code AS currency,
+                CASE
+                    WHEN o.geom IS NULL THEN 'unlocated'
+                    ELSE floor(ST_X(o.geom) / 0.01)::bigint || ':' || floor(ST_Y(o.geom) / 0.01)::bigint
+                END AS zone,
+                to_char(o.valuation_date, 'YYYY-MM') AS period,
+                (o.market_value_total / o.surface_total)::double precision AS price_m2
+            FROM observations AS o
+            JOIN catalog_property_type AS pt ON pt.id = o.property_type_id
+            JOIN catalog_currency AS cur ON cur.id = o.currency_id
+            WHERE o.deleted_at IS NULL
+              AND o.status NOT IN ('outlier', 'eliminado')
+              AND o.market_value_total IS NOT NULL
+              AND o.surface_total > 0
+              AND o.valuation_date IS NOT NULL
+        )
+        SELECT
+            project_id,
+            property_type,
+            currency,
+            CASE WHEN GROUPING(zone) = 1 THEN '*' ELSE zone END AS zone,
+            CASE WHEN GROUPING(period) = 1 THEN '*' ELSE period END AS period,
+            count(*)::integer AS observations,
+            avg(price_m2) AS mean,
+            percentile_cont(0.10) WITHIN GROUP (ORDER BY price_m2) AS p10,
+            percentile_cont(0.25) WITHIN GROUP (ORDER BY price_m2) AS p25,
+            percentile_cont(0.50) WITHIN GROUP (ORDER BY price_m2) AS median,
+            percentile_cont(0.75) WITHIN GROUP (ORDER BY price_m2) AS p75,
+            percentile_cont(0.90) WITHIN GROUP (ORDER BY price_m2) AS p90
+        FROM priced
+        GROUP BY GROUPING SETS (
+            (project_id, property_type, currency, zone, period),
+            (project_id, property_type, currency, zone),
+            (project_id, property_type, currency, period),
+            (project_id, property_type, currency)
+        )
+        """
+    )
+    # Unique index over plain columns: required by REFRESH ... CONCURRENTLY, and serves lookups.
+    op.execute(
+        """
+        CREATE UNIQUE INDEX ux_observation_market_stats_key
+        ON observation_market_stats (project_id, zone, period, property_type, currency)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS observation_market_stats")
@@ -0,0 +1,186 @@
+"""hash-partition observations and child tables by project_id
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18 00:00:08.000000
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0008"
+down_revision: Union[str, None] = "20261018_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match app.services.partitions.OBSERVATION_PARTITIONS. Changing it later means
+# re-partitioning, so it is sized for growth rather than for today's project count.
+PARTITIONS = 16
+CHILD_TABLES = ("observation_location", "observation_building", "observation_rural")
+
+OBSERVATION_INDEXES = {
+    "ix_observations_status": "(status)",
+    "ix_observations_deleted_at": "(deleted_at)",
+    "ix_observations_project_status": "(project_id, status)",
+    "ix_observations_project_updated_at": "(project_id, updated_at, id)",
+    "ix_observations_live_project_created": "(project_id, created_at, id) WHERE deleted_at IS NULL",
+    "ix_observations_live_project_status": "(project_id, status, created_at) WHERE deleted_at IS NULL",
+    "ix_observations_live_project_property_type": "(project_id, property_type_id, created_at) WHERE deleted_at IS NULL",
+    "ix_observations_live_project_valuation_date": "(project_id, valuation_date) WHERE deleted_at IS NULL",
+    "ix_observations_live_project_price": "(project_id, market_value_total) WHERE deleted_at IS NULL",
+    "ix_observations_live_project_surface": "(project_id, surface_total) WHERE deleted_at IS NULL",
+    "ix_observations_live_geom": "USING gist (geom) WHERE deleted_at IS NULL",
+}
+OBSERVATION_FOREIGN_KEYS = (
+    "FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE",
+    "FOREIGN KEY (property_type_id) REFERENCES catalog_property_type (id) ON DELETE RESTRICT",
+    "FOREIGN KEY (value_origin_id) REFERENCES catalog_value_origin (id) ON DELETE RESTRICT",
+    "FOREIGN KEY (currency_id) REFERENCES catalog_currency (id) ON DELETE RESTRICT",
+    "FOREIGN KEY (created_by) REFERENCES users (id) ON DELETE SET NULL",
+    "FOREIGN KEY (updated_by) REFERENCES users (id) ON DELETE SET NULL",
+)
+CHILD_FOREIGN_KEYS = {
+    "observation_location": ("FOREIGN KEY (legal_status_id) REFERENCES catalog_legal_status (id) ON DELETE SET NULL",),
+    "observation_building": (
+        "FOREIGN KEY (conservation_state_id) REFERENCES catalog_conservation_state (id) ON DELETE SET NULL",
+        "FOREIGN KEY (destination_id) REFERENCES catalog_destination (id) ON DELETE SET NULL",
+    ),
+    "observation_rural": (),
+}
+
+
+def _market_stats():
+    # observation_market_stats reads observations, so it is dropped with the old table and
+    # rebuilt from its own revision afterwards.
+    path = Path(__file__).with_name("20261018_0007_observation_market_stats.py")
+    spec = importlib.util.spec_from_file_location("observation_market_stats_0007", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _add_observation_constraints(partitioned: bool) -> None:
+    key = "(project_id, id)" if partitioned else "(id)"
+    op.execute(f"ALTER TABLE observations ADD CONSTRAINT observations_pkey PRIMARY KEY {key}")
+    op.execute(
+        "ALTER TABLE observations ADD CONSTRAINT uq_observations_project_external_uuid "
+        "UNIQUE (project_id, external_uuid)"
+    )
+    for foreign_key in OBSERVATION_FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE observations ADD {foreign_key}")
+    if not partitioned:
+        op.execute("CREATE INDEX ix_observations_project_id ON observations (project_id)")
+    for name, definition in OBSERVATION_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON observations {definition}")
+
+
+def _add_child_constraints(table: str, partitioned: bool) -> None:
+    if partitioned:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (project_id, observation_id)")
+        op.execute(
+            f"ALTER TABLE {table} ADD FOREIGN KEY (project_id, observation_id) "
+            "REFERENCES observations (project_id, id) ON DELETE CASCADE"
+        )
+    else:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (observation_id)")
+        op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (observation_id) REFERENCES observations (id) ON DELETE CASCADE")
+    for foreign_key in CHILD_FOREIGN_KEYS[table]:
+        op.execute(f"ALTER TABLE {table} ADD {foreign_key}")
+    if table == "observation_location":
+        op.execute("CREATE INDEX ix_observation_location_padron ON observation_location (padron)")
+
+
+def upgrade() -> None:
+    _market_stats().downgrade()
+
+    # Copy into bare partitioned tables first and index afterwards: one sort per index
+    # instead of maintaining every index row by row during the copy.
+    op.execute(
+        "CREATE TABLE observations_partitioned (LIKE observations INCLUDING DEFAULTS) PARTITION BY HASH (project_id)"
+    )
+    for table in CHILD_TABLES:
+        op.execute(
+            f"CREATE TABLE {table}_partitioned (project_id integer NOT NULL, LIKE {table} INCLUDING DEFAULTS) "
+            "PARTITION BY HASH (project_id)"
+        )
+    for table in ("observations", *CHILD_TABLES):
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE {table}_p{remainder:02d} PARTITION OF {table}_partitioned "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+            )
+
+    op.execute("INSERT INTO observations_partitioned SELECT * FROM observations")
+    for table in CHILD_TABLES:
+        op.execute(
+            f"INSERT INTO {table}_partitioned "
+            f"SELECT o.project_id, c.* FROM {table} AS c JOIN observations AS o ON o.id = c.observation_id"
+        )
+
+    op.execute("ALTER TABLE observation_status_history ADD COLUMN project_id integer")
+    op.execute(
+        "UPDATE observation_status_history AS h SET project_id = o.project_id "
+        "FROM observations AS o WHERE o.id = h.observation_id"
+    )
+    op.execute("ALTER TABLE observation_status_history ALTER COLUMN project_id SET NOT NULL")
+    op.execute("ALTER TABLE observation_status_history DROP CONSTRAINT observation_status_history_observation_id_fkey")
+    op.execute("DROP INDEX ix_observation_status_history_observation_id")
+
+    for table in (*CHILD_TABLES, "observations"):
+        op.execute(f"DROP TABLE {table}")
+        op.execute(f"ALTER TABLE {table}_partitioned RENAME TO {table}")
+
+    _add_observation_constraints(partitioned=True)
+    for table in CHILD_TABLES:
+        _add_child_constraints(table, partitioned=True)
+    op.execute(
+        "CREATE INDEX ix_observation_status_history_observation "
+        "ON observation_status_history (project_id, observation_id)"
+    )
+    op.execute(
+        "ALTER TABLE observation_status_history ADD FOREIGN KEY (project_id, observation_id) "
+        "REFERENCES observations (project_id, id) ON DELETE CASCADE"
+    )
+
+    _market_stats().upgrade()
+    for table in ("observations", *CHILD_TABLES):
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    _market_stats().downgrade()
+
+    op.execute("CREATE TABLE observations_unpartitioned (LIKE observations INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO observations_unpartitioned SELECT * FROM observations")
+    for table in CHILD_TABLES:
+        op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+        op.execute(f"ALTER TABLE {table}_unpartitioned DROP COLUMN project_id")
+
+    op.execute("DROP INDEX ix_observation_status_history_observation")
+    op.execute(
+        "ALTER TABLE observation_status_history "
+        "DROP CONSTRAINT observation_status_history_project_id_observation_id_fkey"
+    )
+    for table in (*CHILD_TABLES, "observations"):
+        op.execute(f"DROP TABLE {table}")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+
+    _add_observation_constraints(partitioned=False)
+    for table in CHILD_TABLES:
+        _add_child_constraints(table, partitioned=False)
+    op.execute("ALTER TABLE observation_status_history DROP COLUMN project_id")
+    op.execute(
+        "CREATE INDEX ix_observation_status_history_observation_id ON observation_status_history (observation_id)"
+    )
+    op.execute(
+        "ALTER TABLE observation_status_history ADD FOREIGN KEY (observation_id) "
+        "REFERENCES observations (id) ON DELETE CASCADE"
+    )
+
+    _market_stats().upgrade()
@@ -0,0 +1,64 @@
+"""denormalized observation_read projection
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18 00:00:09.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0009"
+down_revision: Union[str, None] = "20261018_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same hash layout as observations (20261018_0008), so a project's read rows share its partition number.
+PARTITIONS = 16
+INDEXES = {
+    "ix_observation_read_project_created": "(project_id, created_at, id)",
+    "ix_observation_read_project_status": "(project_id, status, created_at)",
+    "ix_observation_read_project_property_type": "(project_id, property_type, created_at)",
+    "ix_observation_read_project_valuation_date": "(project_id, valuation_date)",
+    "ix_observation_read_project_price": "(project_id, price)",
+    "ix_observation_read_project_surface": "(project_id, surface_total)",
+    "ix_observation_read_geom": "USING gist (geom)",
+}
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE observation_read (
+            project_id integer NOT NULL,
+            id uuid NOT NULL,
+            status varchar(32) NOT NULL,
+            property_type varchar(64),
+            price numeric(18, 2),
+            valuation_date date,
+            surface_total numeric(18, 2),
+            created_at timestamp with time zone NOT NULL,
+            geom geometry(Point, 4326),
+            document text NOT NULL,
+            PRIMARY KEY (project_id, id),
+            FOREIGN KEY (project_id, id) REFERENCES observations (project_id, id) ON DELETE CASCADE
+        ) PARTITION BY HASH (project_id)
+        """
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE observation_read_p{remainder:02d} PARTITION OF observation_read "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    # Starts empty. Documents are rendered with the API's serializer, which follows the current
+    # models, so filling it is left to `python -m scripts.rebuild_read_model` instead of being
+    # frozen into this revision. Run it before the API starts serving reads from the table.
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON observation_read {definition}")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE observation_read")
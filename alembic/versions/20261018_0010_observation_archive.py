@@ -0,0 +1,48 @@
+"""archive tables for purged soft-deleted observations
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18 00:00:10.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0010"
+down_revision: Union[str, None] = "20261018_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ARCHIVED = {
+    "observations": "(project_id, id)",
+    "observation_location": "(project_id, observation_id)",
+    "observation_building": "(project_id, observation_id)",
+    "observation_rural": "(project_id, observation_id)",
+    "observation_status_history": "(id)",
+}
+
+
+def upgrade() -> None:
+    # Plain (unpartitioned) tables with the live columns and keys; no foreign keys or defaults.
+    for table, key in ARCHIVED.items():
+        op.execute(f"CREATE TABLE {table}_archive (LIKE {table})")
+        op.execute(f"ALTER TABLE {table}_archive ADD COLUMN archived_at timestamp with time zone NOT NULL")
+        op.execute(f"ALTER TABLE {table}_archive ADD PRIMARY KEY {key}")
+    op.execute(
+        "CREATE INDEX ix_observation_status_history_archive_observation "
+        "ON observation_status_history_archive (project_id, observation_id)"
+    )
+
+    # Only the purge looks rows up by deleted_at; live rows no longer need an entry.
+    op.execute("DROP INDEX ix_observations_deleted_at")
+    op.execute("CREATE INDEX ix_observations_deleted_at ON observations (deleted_at) WHERE deleted_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX ix_observations_deleted_at")
+    op.execute("CREATE INDEX ix_observations_deleted_at ON observations (deleted_at)")
+    for table in ARCHIVED:
+        op.execute(f"DROP TABLE {table}_archive")
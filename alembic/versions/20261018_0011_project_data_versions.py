@@ -0,0 +1,31 @@
+"""per-project data version bumped by every observation write
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18 00:00:11.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0011"
+down_revision: Union[str, None] = "20261018_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_data_versions",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_data_versions")
@@ -0,0 +1,44 @@
+"""commit-ordered change_seq cursor for /changes
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18 00:00:12.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0012"
+down_revision: Union[str, None] = "20261018_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Existing rows start at 0, below the first bumped project version, so no backfill is needed;
+# old (updated_at, id) tokens are rejected and clients resync from the beginning.
+def upgrade() -> None:
+    for table in ("observations", "observations_archive"):
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+    op.drop_index("ix_observations_project_updated_at", table_name="observations")
+    # Not partial: soft-deleted rows must stay visible to emit tombstones.
+    op.create_index(
+        "ix_observations_project_change_seq",
+        "observations",
+        ["project_id", "change_seq", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_observations_project_change_seq", table_name="observations")
+    op.create_index(
+        "ix_observations_project_updated_at",
+        "observations",
+        ["project_id", "updated_at", "id"],
+        unique=False,
+    )
+    for table in ("observations", "observations_archive"):
+        op.drop_column(table, "change_seq")
@@ -0,0 +1,35 @@
+"""per-cell versions for selective tile cache invalidation
+
+Revision ID: 20261018_0013
+Revises: 20261018_0012
+Create Date: 2026-10-18 00:00:13.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0013"
+down_revision: Union[str, None] = "20261018_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Starts empty: tiles whose cells were never written since have version 0. The tile caches
+# are per process, so they start empty too once the workers restart on the new code.
+def upgrade() -> None:
+    op.create_table(
+        "tile_cell_versions",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("x", sa.Integer(), nullable=False),
+        sa.Column("y", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "x", "y"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tile_cell_versions")
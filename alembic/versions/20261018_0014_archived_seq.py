@@ -0,0 +1,41 @@
+"""per-project watermark of archived deletions for /changes
+
+Revision ID: 20261018_0014
+Revises: 20261018_0013
+Create Date: 2026-10-18 00:00:14.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0014"
+down_revision: Union[str, None] = "20261018_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_data_versions",
+        sa.Column("archived_seq", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    # Observations archived before this revision count too.
+    op.execute(
+        """
+        UPDATE project_data_versions
+        SET archived_seq = archived.change_seq
+        FROM (
+            SELECT project_id, max(change_seq) AS change_seq
+            FROM observations_archive
+            GROUP BY project_id
+        ) AS archived
+        WHERE archived.project_id = project_data_versions.project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("project_data_versions", "archived_seq")
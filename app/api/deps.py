@@ -1,26 +1,52 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
 from app.core.security import decode_token
-from app.models import User, UserProject
+from app.models import ProjectRole, User, UserProject
+from app.services.auth_cache import membership_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+@dataclass(frozen=True)
+class TokenUser:
+    """Caller identity as read from a verified access token, without touching the database."""
+
+    id: int
+    roles: dict[str, str] | None = None
+
+
+def get_token_user(token: str = Depends(oauth2_scheme)) -> TokenUser:
     payload = decode_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
+    roles = payload.get("roles") if settings.jwt_role_claims else None
+    return TokenUser(id=int(payload["sub"]), roles=roles if isinstance(roles, dict) else None)
+
+
+def get_current_user(
+    token_user: TokenUser = Depends(get_token_user), db: Session = Depends(get_db)
+) -> User:
+    user = db.scalar(select(User).where(User.id == token_user.id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
 
-    user = db.scalar(select(User).where(User.id == int(payload["sub"])))
+async def get_current_user_async(
+    token_user: TokenUser = Depends(get_token_user), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    user = await db.scalar(select(User).where(User.id == token_user.id))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
@@ -33,19 +59,72 @@ def get_active_project_id(request: Request) -> int:
     return int(project_id)
 
 
+def _known_membership(current_user: User | TokenUser, project_id: int) -> UserProject | None:
+    roles = getattr(current_user, "roles", None)
+    if roles and str(project_id) in roles:
+        return UserProject(user_id=current_user.id, project_id=project_id, role=ProjectRole(roles[str(project_id)]))
+    cached = membership_cache.get(current_user.id, project_id)
+    if cached is None:
+        return None
+    membership_id, role = cached
+    return UserProject(id=membership_id, user_id=current_user.id, project_id=project_id, role=role)
+
+
+def _membership_query(user_id: int, project_id: int):
+    # The join doubles as the "user still exists" check, so a miss costs one round trip.
+    return (
+        select(UserProject.id, UserProject.role)
+        .join(User, User.id == UserProject.user_id)
+        .where(UserProject.user_id == user_id, UserProject.project_id == project_id)
+    )
+
+
+def _membership_from_row(
+    current_user: User | TokenUser, project_id: int, generation: tuple[int, int], row, user_exists: bool
+) -> UserProject:
+    if row is None:
+        if not user_exists:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this project",
+        )
+    membership_cache.put(current_user.id, project_id, generation, row.id, row.role)
+    return UserProject(id=row.id, user_id=current_user.id, project_id=project_id, role=row.role)
+
+
 def get_project_membership(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User | TokenUser = Depends(get_token_user),
     project_id: int = Depends(get_active_project_id),
 ) -> UserProject:
-    membership = db.scalar(
-        select(UserProject).where(
-            UserProject.user_id == current_user.id, UserProject.project_id == project_id
-        )
-    )
-    if not membership:
+    # Returns a detached UserProject: handlers only read it, and it survives their commits.
+    membership = _known_membership(current_user, project_id)
+    if membership is not None:
+        return membership
+    generation = membership_cache.generation(current_user.id)
+    row = db.execute(_membership_query(current_user.id, project_id)).first()
+    user_exists = row is not None or db.scalar(select(User.id).where(User.id == current_user.id)) is not None
+    return _membership_from_row(current_user, project_id, generation, row, user_exists)
+
+
+async def get_project_membership_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User | TokenUser = Depends(get_token_user),
+    project_id: int = Depends(get_active_project_id),
+) -> UserProject:
+    membership = _known_membership(current_user, project_id)
+    if membership is not None:
+        return membership
+    generation = membership_cache.generation(current_user.id)
+    row = (await db.execute(_membership_query(current_user.id, project_id))).first()
+    user_exists = row is not None or await db.scalar(select(User.id).where(User.id == current_user.id)) is not None
+    return _membership_from_row(current_user, project_id, generation, row, user_exists)
+
+
+def require_project_scope(project_id: int, membership: UserProject) -> None:
+    if project_id != membership.project_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this project",
+            detail="Project path param does not match active project scope",
         )
-    return membership
@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(token: str) -> list:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination token",
+    )
+
+
+def encode_keyset(timestamp: datetime, item_id: UUID) -> str:
+    return _encode([timestamp.isoformat(), str(item_id)])
+
+
+def decode_keyset(token: str) -> tuple[datetime, UUID]:
+    try:
+        timestamp, item_id = _decode(token)
+        return datetime.fromisoformat(timestamp), UUID(item_id)
+    except (ValueError, TypeError):
+        raise _invalid_token() from None
+
+
+def encode_change_token(change_seq: int, item_id: UUID) -> str:
+    return _encode([change_seq, str(item_id)])
+
+
+def decode_change_token(token: str) -> tuple[int, UUID]:
+    # Tokens from the old (updated_at, id) cursor fail here; clients resync from scratch.
+    try:
+        change_seq, item_id = _decode(token)
+        if not isinstance(change_seq, int):
+            raise TypeError(change_seq)
+        return change_seq, UUID(item_id)
+    except (ValueError, TypeError):
+        raise _invalid_token() from None
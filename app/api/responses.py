@@ -0,0 +1,27 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    # Decimals stay strings, as Pydantic emits them, so clients see the same payload.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded response for content that is already plain data.
+
+    Handlers return it directly, which skips response_model validation and
+    jsonable_encoder; the response_model is still declared for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,8 +1,31 @@
 from fastapi import APIRouter
 
-from app.api.routes import auth, observations, projects
+from app.api.routes import (
+    auth,
+    auth_async,
+    internal,
+    observations,
+    observations_async,
+    projects,
+    projects_async,
+    stats,
+)
+from app.core.config import settings
 
-api_router = APIRouter()
-api_router.include_router(auth.router)
-api_router.include_router(projects.router)
-api_router.include_router(observations.router)
+
+def build_api_router(async_routes: bool = False) -> APIRouter:
+    router = APIRouter()
+    if async_routes:
+        router.include_router(auth_async.router)
+        router.include_router(projects_async.router)
+        router.include_router(observations_async.router)
+    else:
+        router.include_router(auth.router)
+        router.include_router(projects.router)
+        router.include_router(observations.router)
+    router.include_router(stats.router)
+    router.include_router(internal.router)
+    return router
+
+
+api_router = build_api_router(settings.async_routes)
@@ -1,3 +1,21 @@
-from app.api.routes import auth, observations, projects
+from app.api.routes import (
+    auth,
+    auth_async,
+    internal,
+    observations,
+    observations_async,
+    projects,
+    projects_async,
+    stats,
+)
 
-__all__ = ["auth", "projects", "observations"]
+__all__ = [
+    "auth",
+    "auth_async",
+    "internal",
+    "projects",
+    "projects_async",
+    "observations",
+    "observations_async",
+    "stats",
+]
@@ -2,16 +2,17 @@ from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_password
-from app.models import User
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.core.security import create_access_token
+from app.models import User, UserProject
 from app.schemas.auth import Token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/login", response_model=Token)
-def login(payload: dict = Body(...), db: Session = Depends(get_db)) -> Token:
+def login_credentials(payload) -> tuple[str, str]:
     if isinstance(payload, dict):
         email = str(payload.get("email") or payload.get("username") or "").strip()
         password = str(payload.get("password") or "")
@@ -23,12 +24,47 @@ def login(payload: dict = Body(...), db: Session = Depends(get_db)) -> Token:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="email/username and password are required",
         )
+    return email, password
+
+
+def invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+    )
+
+
+def login_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent logins, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def role_claims_query(user_id: int):
+    return select(UserProject.project_id, UserProject.role).where(UserProject.user_id == user_id)
 
+
+def role_claims(rows) -> dict[str, str]:
+    return {str(project_id): role.value for project_id, role in rows}
+
+
+@router.post("/login", response_model=Token)
+def login(payload: dict = Body(...), db: Session = Depends(get_db)) -> Token:
+    email, password = login_credentials(payload)
     user = db.scalar(select(User).where(User.email == email))
-    if not user or not verify_password(password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-        )
-    token = create_access_token(str(user.id))
+    if not user:
+        raise invalid_credentials()
+    try:
+        valid, new_hash = password_pool.verify_and_update(password, user.hashed_password)
+    except PasswordPoolBusy:
+        raise login_overloaded() from None
+    if not valid:
+        raise invalid_credentials()
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+    roles = role_claims(db.execute(role_claims_query(user.id))) if settings.jwt_role_claims else None
+    token = create_access_token(str(user.id), roles=roles)
     return Token(access_token=token)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Body, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes.auth import (
+    invalid_credentials,
+    login_credentials,
+    login_overloaded,
+    role_claims,
+    role_claims_query,
+)
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.core.security import create_access_token
+from app.models import User
+from app.schemas.auth import Token
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/login", response_model=Token)
+async def login(payload: dict = Body(...), db: AsyncSession = Depends(get_async_db)) -> Token:
+    email, password = login_credentials(payload)
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        raise invalid_credentials()
+    try:
+        valid, new_hash = await password_pool.verify_and_update_async(password, user.hashed_password)
+    except PasswordPoolBusy:
+        raise login_overloaded() from None
+    if not valid:
+        raise invalid_credentials()
+    user_id = user.id
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    roles = role_claims(await db.execute(role_claims_query(user_id))) if settings.jwt_role_claims else None
+    token = create_access_token(str(user_id), roles=roles)
+    return Token(access_token=token)
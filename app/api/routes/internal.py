@@ -0,0 +1,46 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.database import engine, get_async_engine
+from app.core.password_pool import password_pool
+from app.core.security import token_cache
+from app.services.auth_cache import membership_cache
+from app.services.response_cache import response_cache
+from app.services.tiles import tile_cache
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+def _require_internal_token(token: str | None) -> None:
+    if not settings.internal_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token or not secrets.compare_digest(token, settings.internal_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid internal token")
+
+
+@router.get("/pool")
+def pool_stats(x_internal_token: str | None = Header(default=None)) -> dict:
+    _require_internal_token(x_internal_token)
+    pools = {"sync": engine.pool}
+    if settings.async_routes:
+        pools["async"] = get_async_engine().pool
+    return {name: pool.stats() if hasattr(pool, "stats") else {"status": pool.status()} for name, pool in pools.items()}
+
+
+@router.get("/caches")
+def cache_stats(x_internal_token: str | None = Header(default=None)) -> dict:
+    _require_internal_token(x_internal_token)
+    return {
+        "tokens": token_cache.stats(),
+        "memberships": membership_cache.stats(),
+        "tiles": tile_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+@router.get("/password-pool")
+def password_pool_stats(x_internal_token: str | None = Header(default=None)) -> dict:
+    _require_internal_token(x_internal_token)
+    return password_pool.stats()
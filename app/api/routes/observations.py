@@ -1,12 +1,24 @@
-from datetime import datetime
+import hashlib
+from collections.abc import Iterator
+from dataclasses import asdict
+from datetime import date, datetime
+from decimal import Decimal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from app.api.deps import get_project_membership
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import cast, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, undefer
+
+from app.api.deps import get_project_membership, require_project_scope
+from app.api.pagination import decode_change_token, decode_keyset, encode_change_token, encode_keyset
+from app.api.responses import FastJSONResponse
+from app.core.database import execute_together, get_db
+from app.core.ids import new_observation_id
 from app.models import (
     CatalogConservationState,
     CatalogCurrency,
@@ -17,22 +29,65 @@ from app.models import (
     Observation,
     ObservationBuilding,
     ObservationLocation,
+    ObservationReadRow,
     ObservationRural,
     ObservationStatus,
     ObservationStatusHistory,
     UserProject,
 )
-from app.schemas.observation import ObservationCreate, ObservationRead, ObservationUpdate
+from app.models.types import point_ewkt
+from app.schemas.observation import (
+    BatchItemStatusEnum,
+    BatchModeEnum,
+    ObservationBatchItemResult,
+    ObservationBatchRequest,
+    ObservationBatchResult,
+    ObservationChanges,
+    ObservationCluster,
+    ObservationCreate,
+    ObservationRead,
+    ObservationStatusEnum,
+    ObservationUpdate,
+    OutlierDetectionReport,
+    OutlierDetectionRequest,
+    PropertyTypeEnum,
+)
+from app.services.catalogs import catalog_cache
+from app.services.clusters import cluster_observations
+from app.services.outliers import OutlierMethod, detect_outliers
+from app.services.read_model import (
+    delete_read_rows,
+    observation_row,
+    read_values,
+    refresh_read_rows,
+    resolve_catalog_codes,
+    upsert_read_rows,
+)
+from app.services.response_cache import response_cache
+from app.services.tiles import (
+    MAX_ZOOM,
+    MVT_MEDIA_TYPE,
+    is_valid_tile,
+    render_tile,
+    tile_cache,
+    tile_version,
+    touch_tiles,
+)
+from app.services.versions import archived_seq, bump_data_version, data_version
 
 router = APIRouter(prefix="/projects/{project_id}/observations", tags=["observations"])
 
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-def _require_project_scope(project_id: int, membership: UserProject) -> None:
-    if project_id != membership.project_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Project path param does not match active project scope",
-        )
+# One extra SELECT ... WHERE observation_id IN (...) per child table, whatever the page size.
+_CHILD_LOADERS = (
+    selectinload(Observation.location),
+    selectinload(Observation.building),
+    selectinload(Observation.rural),
+)
+_CHILD_MODELS = {"location": ObservationLocation, "building": ObservationBuilding, "rural": ObservationRural}
 
 
 def _catalog_id_by_code(
@@ -49,190 +104,457 @@ def _catalog_id_by_code(
                 detail=f"Missing required catalog code for {model.__tablename__}",
             )
         return None
-    item = db.scalar(select(model).where(model.code == code, model.is_active.is_(True)))
-    if not item:
+    item_id = catalog_cache.id_for_code(db, model, code)
+    if item_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid catalog code '{code}' for {model.__tablename__}",
         )
-    return item.id
+    return item_id
 
 
 def _catalog_code_by_id(db: Session, model, item_id: int | None) -> str | None:
     if not item_id:
         return None
-    item = db.scalar(select(model).where(model.id == item_id))
-    return item.code if item else None
+    return catalog_cache.code_for_id(db, model, item_id)
 
 
-def _upsert_location(
-    db: Session,
-    observation: Observation,
-    payload_location,
-) -> None:
+def _geom_from_extras(extras: dict | None) -> str | None:
+    coordinates = (extras or {}).get("coordinates")
+    if not isinstance(coordinates, (list, tuple)) or len(coordinates) < 2:
+        return None
+    lon, lat = coordinates[0], coordinates[1]
+    if isinstance(lon, bool) or isinstance(lat, bool) or not all(isinstance(v, (int, float)) for v in (lon, lat)):
+        return None
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        return None
+    return point_ewkt(lon, lat)
+
+
+def _parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox must be min_lon,min_lat,max_lon,max_lat",
+        ) from None
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bbox min must not exceed max")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def conditional(db: Session, request: Request, project_id: int) -> tuple[dict[str, str], Response | None]:
+    """Caching headers for a project read, plus a 304 when If-None-Match already has them."""
+    key = "|".join(
+        (data_version(db, project_id), request.url.path, request.url.query, request.headers.get("accept", ""))
+    )
+    etag = f'"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {item.strip().removeprefix("W/") for item in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return headers, Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return headers, None
+
+
+def _observation_values(db: Session, payload: ObservationCreate) -> dict:
+    return {
+        "external_uuid": payload.external_uuid,
+        "legacy_fid": payload.legacy_fid,
+        "property_type_id": _catalog_id_by_code(db, CatalogPropertyType, payload.property_type.value, required=True),
+        "value_origin_id": _catalog_id_by_code(db, CatalogValueOrigin, payload.value_origin_code, required=False),
+        "currency_id": _catalog_id_by_code(
+            db, CatalogCurrency, payload.currency.value if payload.currency else None, required=False
+        ),
+        "market_value_total": payload.price,
+        "unit_land_value": payload.unit_land_value,
+        "valuation_date": payload.valuation_date,
+        "surface_total": payload.surface_total,
+        "surface_unit": payload.surface_unit,
+        "status": ObservationStatus(payload.status.value),
+        "is_outlier": payload.status.value == ObservationStatus.OUTLIER.value,
+        "extras": payload.extras,
+        "geom": _geom_from_extras(payload.extras),
+    }
+
+
+def _observation_changes(db: Session, payload: ObservationUpdate, data: dict) -> dict:
+    changes: dict = {}
+    if "property_type" in data:
+        changes["property_type_id"] = _catalog_id_by_code(
+            db, CatalogPropertyType, payload.property_type.value if payload.property_type else None, required=True
+        )
+    if "value_origin_code" in data:
+        changes["value_origin_id"] = _catalog_id_by_code(
+            db, CatalogValueOrigin, payload.value_origin_code, required=False
+        )
+    if "currency" in data:
+        changes["currency_id"] = _catalog_id_by_code(
+            db, CatalogCurrency, payload.currency.value if payload.currency else None, required=False
+        )
+    if "price" in data:
+        changes["market_value_total"] = payload.price
+    if "unit_land_value" in data:
+        changes["unit_land_value"] = payload.unit_land_value
+    if "valuation_date" in data:
+        changes["valuation_date"] = payload.valuation_date
+    if "surface_total" in data:
+        changes["surface_total"] = payload.surface_total
+    if "surface_unit" in data:
+        changes["surface_unit"] = payload.surface_unit
+    if "status" in data and payload.status is not None:
+        changes["status"] = ObservationStatus(payload.status.value)
+        changes["is_outlier"] = changes["status"] == ObservationStatus.OUTLIER
+        if changes["status"] == ObservationStatus.ELIMINADO:
+            changes["deleted_at"] = datetime.utcnow()
+    if "extras" in data and payload.extras is not None:
+        changes["extras"] = payload.extras
+        changes["geom"] = _geom_from_extras(payload.extras)
+    return changes
+
+
+def _location_values(db: Session, payload_location) -> dict | None:
     if payload_location is None:
-        observation.location = None
-        return
-    location = observation.location or ObservationLocation(observation_id=observation.id)
-    location.padron = payload_location.padron
-    location.neighborhood_type_code = payload_location.neighborhood_type_code
-    location.shape_type_code = payload_location.shape_type_code
-    location.block_position_code = payload_location.block_position_code
-    location.affectation_code = payload_location.affectation_code
-    location.legal_status_id = _catalog_id_by_code(
-        db,
-        CatalogLegalStatus,
-        payload_location.legal_status_code,
-        required=False,
+        return None
+    return {
+        "padron": payload_location.padron,
+        "neighborhood_type_code": payload_location.neighborhood_type_code,
+        "shape_type_code": payload_location.shape_type_code,
+        "block_position_code": payload_location.block_position_code,
+        "affectation_code": payload_location.affectation_code,
+        "legal_status_id": _catalog_id_by_code(
+            db,
+            CatalogLegalStatus,
+            payload_location.legal_status_code,
+            required=False,
+        ),
+    }
+
+
+def _building_values(db: Session, payload_building) -> dict | None:
+    if payload_building is None:
+        return None
+    return {
+        "built_surface_total": payload_building.built_surface_total,
+        "warehouse_surface": payload_building.warehouse_surface,
+        "front_meters": payload_building.front_meters,
+        "conservation_state_id": _catalog_id_by_code(
+            db,
+            CatalogConservationState,
+            payload_building.conservation_state_code,
+            required=False,
+        ),
+        "destination_id": _catalog_id_by_code(
+            db,
+            CatalogDestination,
+            payload_building.destination_code,
+            required=False,
+        ),
+        "construction_category_code": payload_building.construction_category_code,
+        "bedrooms_count": payload_building.bedrooms_count,
+        "bathrooms_count": payload_building.bathrooms_count,
+        "garage_count": payload_building.garage_count,
+        "floors_count": payload_building.floors_count,
+        "has_pool": payload_building.has_pool,
+        "antiquity_year": payload_building.antiquity_year,
+    }
+
+
+def _rural_values(payload_rural) -> dict | None:
+    if payload_rural is None:
+        return None
+    return {
+        "main_use_code": payload_rural.main_use_code,
+        "sugarcane_surface": payload_rural.sugarcane_surface,
+        "citrus_surface": payload_rural.citrus_surface,
+        "grains_surface": payload_rural.grains_surface,
+        "forest_surface": payload_rural.forest_surface,
+        "other_crops_surface": payload_rural.other_crops_surface,
+        "has_irrigation": payload_rural.has_irrigation,
+        "irrigation_type_code": payload_rural.irrigation_type_code,
+        "irrigated_surface": payload_rural.irrigated_surface,
+        "irrigation_concession_type_code": payload_rural.irrigation_concession_type_code,
+        "has_extraordinary_improvements": payload_rural.has_extraordinary_improvements,
+        "has_rural_improvements": payload_rural.has_rural_improvements,
+    }
+
+
+def _child_values(db: Session, relation: str, payload) -> dict | None:
+    if relation == "location":
+        return _location_values(db, payload.location)
+    if relation == "building":
+        return _building_values(db, payload.building)
+    return _rural_values(payload.rural)
+
+
+def _upsert_child(db: Session, model, project_id: int, observation_id: UUID, values: dict, *gate):
+    """INSERT ... ON CONFLICT DO UPDATE ... RETURNING for a one-to-one child, only while ``gate`` holds."""
+    table = model.__table__
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    # Explicit casts: PostgreSQL would otherwise type NULL parameters in a SELECT list as text.
+    source = select(
+        *(
+            cast(literal(value, table.c[key].type), table.c[key].type)
+            for key, value in {"project_id": project_id, "observation_id": observation_id, **values}.items()
+        )
+    ).where(*gate)
+    statement = dialect_insert(table).from_select(["project_id", "observation_id", *values], source)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.observation_id],
+        set_={key: statement.excluded[key] for key in values},
     )
-    observation.location = location
+    return statement.returning(*table.c)
+
+
+def _observation_from_rows(rows: dict[str, dict | None]) -> Observation:
+    # Detached instances only feed the serializer; nothing is added to the session.
+    observation = Observation(**rows["observation"])
+    for relation, model in _CHILD_MODELS.items():
+        if rows.get(relation):
+            setattr(observation, relation, model(**rows[relation]))
+    return observation
+
 
+def observation_rows(db: Session, observations: list[Observation]) -> list[dict]:
+    """ObservationRead-shaped plain dicts for FastJSONResponse, without model validation."""
+    codes = resolve_catalog_codes(db, observations)
+    return [observation_row(observation, codes) for observation in observations]
 
-def _upsert_building(
+
+def list_query(
     db: Session,
-    observation: Observation,
-    payload_building,
-) -> None:
-    if payload_building is None:
-        observation.building = None
-        return
-    building = observation.building or ObservationBuilding(observation_id=observation.id)
-    building.built_surface_total = payload_building.built_surface_total
-    building.warehouse_surface = payload_building.warehouse_surface
-    building.front_meters = payload_building.front_meters
-    building.conservation_state_id = _catalog_id_by_code(
-        db,
-        CatalogConservationState,
-        payload_building.conservation_state_code,
-        required=False,
+    project_id: int,
+    *,
+    cursor: str | None = None,
+    status_in: list[ObservationStatusEnum] | None = None,
+    property_type: list[PropertyTypeEnum] | None = None,
+    valuation_date_from: date | None = None,
+    valuation_date_to: date | None = None,
+    price_min: Decimal | None = None,
+    price_max: Decimal | None = None,
+    surface_min: Decimal | None = None,
+    surface_max: Decimal | None = None,
+    bbox: str | None = None,
+):
+    # One scan of observation_read: it only holds live rows and carries catalog codes, so
+    # neither the filters nor the body need the child or catalog tables.
+    read = ObservationReadRow
+    query = (
+        select(read.id, read.created_at, read.document)
+        .where(read.project_id == project_id)
+        .order_by(read.created_at.desc(), read.id.desc())
     )
-    building.destination_id = _catalog_id_by_code(
+    if status_in:
+        query = query.where(read.status.in_([item.value for item in status_in]))
+    if property_type:
+        query = query.where(read.property_type.in_([item.value for item in property_type]))
+    if valuation_date_from is not None:
+        query = query.where(read.valuation_date >= valuation_date_from)
+    if valuation_date_to is not None:
+        query = query.where(read.valuation_date <= valuation_date_to)
+    if price_min is not None:
+        query = query.where(read.price >= price_min)
+    if price_max is not None:
+        query = query.where(read.price <= price_max)
+    if surface_min is not None:
+        query = query.where(read.surface_total >= surface_min)
+    if surface_max is not None:
+        query = query.where(read.surface_total <= surface_max)
+    if bbox:
+        query = query.where(read.geom.op("&&")(func.ST_MakeEnvelope(*_parse_bbox(bbox), 4326)))
+    if cursor:
+        cursor_created_at, cursor_id = decode_keyset(cursor)
+        query = query.where(tuple_(read.created_at, read.id) < (cursor_created_at, cursor_id))
+    return query
+
+
+def wants_stream(accept: str | None, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in (accept or "")
+
+
+def stream_query(query, limit: int | None):
+    # yield_per turns into a server-side cursor on PostgreSQL.
+    if limit is not None:
+        query = query.limit(limit)
+    return query.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+
+def stream_rows(rows) -> bytes:
+    return b"".join(row.document.encode() + b"\n" for row in rows)
+
+
+def page_cache_key(project_id: int, headers: dict[str, str]) -> str:
+    # The ETag already hashes the data version, path, query string and Accept header.
+    return f"observations:{project_id}:{headers['ETag']}"
+
+
+def render_page(db: Session, query, limit: int | None) -> bytes:
+    """One list page as ``<next cursor>\\n<json body>``, the form kept in the response cache."""
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = db.execute(query).all()
+    next_cursor = ""
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_keyset(rows[-1].created_at, rows[-1].id)
+    # The documents are already JSON; the page body is just their concatenation.
+    return next_cursor.encode() + b"\n[" + b",".join(row.document.encode() for row in rows) + b"]"
+
+
+def page_response(page: bytes, headers: dict[str, str]) -> Response:
+    next_cursor, body = page.split(b"\n", 1)
+    if next_cursor:
+        headers = {**headers, "X-Next-Cursor": next_cursor.decode()}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _stream_observations(bind, query) -> Iterator[bytes]:
+    # The request's session is closed before the body is sent, so the stream owns its own.
+    with Session(bind=bind) as db:
+        for partition in db.execute(query).partitions():
+            yield stream_rows(partition)
+
+
+@router.get(
+    "",
+    response_model=list[ObservationRead],
+    response_class=FastJSONResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+def list_observations(
+    project_id: int,
+    request: Request,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status_in: list[ObservationStatusEnum] | None = Query(default=None, alias="status"),
+    property_type: list[PropertyTypeEnum] | None = Query(default=None),
+    valuation_date_from: date | None = None,
+    valuation_date_to: date | None = None,
+    price_min: Decimal | None = None,
+    price_max: Decimal | None = None,
+    surface_min: Decimal | None = None,
+    surface_max: Decimal | None = None,
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat in EPSG:4326"),
+    stream: bool = Query(default=False, description="stream every match as NDJSON; same as Accept: application/x-ndjson"),
+    accept: str | None = Header(default=None),
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> Response:
+    require_project_scope(project_id, membership)
+    headers, not_modified = conditional(db, request, project_id)
+    if not_modified:
+        return not_modified
+    query = list_query(
         db,
-        CatalogDestination,
-        payload_building.destination_code,
-        required=False,
-    )
-    building.construction_category_code = payload_building.construction_category_code
-    building.bedrooms_count = payload_building.bedrooms_count
-    building.bathrooms_count = payload_building.bathrooms_count
-    building.garage_count = payload_building.garage_count
-    building.floors_count = payload_building.floors_count
-    building.has_pool = payload_building.has_pool
-    building.antiquity_year = payload_building.antiquity_year
-    observation.building = building
-
-
-def _upsert_rural(
-    observation: Observation,
-    payload_rural,
-) -> None:
-    if payload_rural is None:
-        observation.rural = None
-        return
-    rural = observation.rural or ObservationRural(observation_id=observation.id)
-    rural.main_use_code = payload_rural.main_use_code
-    rural.sugarcane_surface = payload_rural.sugarcane_surface
-    rural.citrus_surface = payload_rural.citrus_surface
-    rural.grains_surface = payload_rural.grains_surface
-    rural.forest_surface = payload_rural.forest_surface
-    rural.other_crops_surface = payload_rural.other_crops_surface
-    rural.has_irrigation = payload_rural.has_irrigation
-    rural.irrigation_type_code = payload_rural.irrigation_type_code
-    rural.irrigated_surface = payload_rural.irrigated_surface
-    rural.irrigation_concession_type_code = payload_rural.irrigation_concession_type_code
-    rural.has_extraordinary_improvements = payload_rural.has_extraordinary_improvements
-    rural.has_rural_improvements = payload_rural.has_rural_improvements
-    observation.rural = rural
-
-
-def _serialize_observation(db: Session, observation: Observation) -> ObservationRead:
-    property_type_code = _catalog_code_by_id(db, CatalogPropertyType, observation.property_type_id)
-    currency_code = _catalog_code_by_id(db, CatalogCurrency, observation.currency_id)
-    value_origin_code = _catalog_code_by_id(db, CatalogValueOrigin, observation.value_origin_id)
-
-    location = None
-    if observation.location:
-        location = {
-            "padron": observation.location.padron,
-            "neighborhood_type_code": observation.location.neighborhood_type_code,
-            "shape_type_code": observation.location.shape_type_code,
-            "block_position_code": observation.location.block_position_code,
-            "legal_status_code": _catalog_code_by_id(db, CatalogLegalStatus, observation.location.legal_status_id),
-            "affectation_code": observation.location.affectation_code,
-        }
-
-    building = None
-    if observation.building:
-        building = {
-            "built_surface_total": observation.building.built_surface_total,
-            "warehouse_surface": observation.building.warehouse_surface,
-            "front_meters": observation.building.front_meters,
-            "conservation_state_code": _catalog_code_by_id(
-                db, CatalogConservationState, observation.building.conservation_state_id
-            ),
-            "destination_code": _catalog_code_by_id(db, CatalogDestination, observation.building.destination_id),
-            "construction_category_code": observation.building.construction_category_code,
-            "bedrooms_count": observation.building.bedrooms_count,
-            "bathrooms_count": observation.building.bathrooms_count,
-            "garage_count": observation.building.garage_count,
-            "floors_count": observation.building.floors_count,
-            "has_pool": observation.building.has_pool,
-            "antiquity_year": observation.building.antiquity_year,
-        }
-
-    rural = None
-    if observation.rural:
-        rural = {
-            "main_use_code": observation.rural.main_use_code,
-            "sugarcane_surface": observation.rural.sugarcane_surface,
-            "citrus_surface": observation.rural.citrus_surface,
-            "grains_surface": observation.rural.grains_surface,
-            "forest_surface": observation.rural.forest_surface,
-            "other_crops_surface": observation.rural.other_crops_surface,
-            "has_irrigation": observation.rural.has_irrigation,
-            "irrigation_type_code": observation.rural.irrigation_type_code,
-            "irrigated_surface": observation.rural.irrigated_surface,
-            "irrigation_concession_type_code": observation.rural.irrigation_concession_type_code,
-            "has_extraordinary_improvements": observation.rural.has_extraordinary_improvements,
-            "has_rural_improvements": observation.rural.has_rural_improvements,
-        }
-
-    return ObservationRead(
-        id=observation.id,
-        project_id=observation.project_id,
-        property_type=property_type_code,
-        status=observation.status.value,
-        price=observation.market_value_total,
-        currency=currency_code,
-        valuation_date=observation.valuation_date,
-        unit_land_value=observation.unit_land_value,
-        surface_total=observation.surface_total,
-        surface_unit=observation.surface_unit,
-        value_origin_code=value_origin_code,
-        external_uuid=observation.external_uuid,
-        legacy_fid=observation.legacy_fid,
-        extras=observation.extras or {},
-        location=location,
-        building=building,
-        rural=rural,
-        created_at=observation.created_at,
-        updated_at=observation.updated_at,
+        project_id,
+        cursor=cursor,
+        status_in=status_in,
+        property_type=property_type,
+        valuation_date_from=valuation_date_from,
+        valuation_date_to=valuation_date_to,
+        price_min=price_min,
+        price_max=price_max,
+        surface_min=surface_min,
+        surface_max=surface_max,
+        bbox=bbox,
     )
+    if wants_stream(accept, stream):
+        return StreamingResponse(
+            _stream_observations(db.get_bind(), stream_query(query, limit)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
 
+    page = response_cache.get_or_compute(page_cache_key(project_id, headers), lambda: render_page(db, query, limit))
+    return page_response(page, headers)
 
-@router.get("", response_model=list[ObservationRead])
-def list_observations(
+
+@router.get("/changes", response_model=ObservationChanges, response_class=FastJSONResponse)
+def list_observation_changes(
     project_id: int,
+    request: Request,
+    since: str | None = None,
+    limit: int = Query(default=500, ge=1, le=MAX_PAGE_SIZE),
     membership: UserProject = Depends(get_project_membership),
     db: Session = Depends(get_db),
-) -> list[ObservationRead]:
-    _require_project_scope(project_id, membership)
-    items = db.scalars(
+) -> FastJSONResponse:
+    require_project_scope(project_id, membership)
+    headers, not_modified = conditional(db, request, project_id)
+    if not_modified:
+        return not_modified
+    query = (
         select(Observation)
-        .where(Observation.project_id == project_id, Observation.deleted_at.is_(None))
-        .order_by(Observation.created_at.desc())
-    ).all()
-    return [_serialize_observation(db, item) for item in items]
+        .options(*_CHILD_LOADERS, undefer(Observation.change_seq))
+        .where(Observation.project_id == project_id)
+        .order_by(Observation.change_seq.asc(), Observation.id.asc())
+        .limit(limit + 1)
+    )
+    if since:
+        # change_seq is the project data version of the write, so it grows in commit order:
+        # a row committed after this token was issued can never sort before it.
+        since_seq, since_id = decode_change_token(since)
+        if since_seq < archived_seq(db, project_id):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Deletions after this token were archived; resync from scratch",
+            )
+        query = query.where(tuple_(Observation.change_seq, Observation.id) > (since_seq, since_id))
+
+    items = list(db.scalars(query).all())
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_token = encode_change_token(items[-1].change_seq, items[-1].id) if items else since
+    return FastJSONResponse(
+        {
+            "changes": observation_rows(db, [item for item in items if item.deleted_at is None]),
+            "deleted": [item.id for item in items if item.deleted_at is not None],
+            "next_token": next_token,
+            "has_more": has_more,
+        },
+        headers=headers,
+    )
+
+
+@router.get("/clusters", response_model=list[ObservationCluster])
+def list_observation_clusters(
+    project_id: int,
+    bbox: str = Query(description="min_lon,min_lat,max_lon,max_lat in EPSG:4326"),
+    zoom: int = Query(ge=0, le=MAX_ZOOM),
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> list[ObservationCluster]:
+    require_project_scope(project_id, membership)
+    clusters = cluster_observations(db, project_id, _parse_bbox(bbox), zoom)
+    return [ObservationCluster(**cluster) for cluster in clusters]
+
+
+@router.get(
+    "/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}},
+)
+def get_observation_tile(
+    project_id: int,
+    z: int,
+    x: int,
+    y: int,
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> Response:
+    require_project_scope(project_id, membership)
+    if not is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tile out of range")
+
+    # Read before rendering: a write landing in between can only file a newer tile under an
+    # older version, never an older tile under the current one.
+    version = tile_version(db, project_id, z, x, y)
+    tile = tile_cache.get(project_id, version, z, x, y)
+    if tile is None:
+        tile = render_tile(db, project_id, z, x, y)
+        tile_cache.put(project_id, version, z, x, y, tile)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE)
 
 
 @router.post("", response_model=ObservationRead, status_code=status.HTTP_201_CREATED)
@@ -242,49 +564,321 @@ def create_observation(
     membership: UserProject = Depends(get_project_membership),
     db: Session = Depends(get_db),
 ) -> ObservationRead:
-    _require_project_scope(project_id, membership)
+    require_project_scope(project_id, membership)
     if payload.project_id != project_id:
         raise HTTPException(status_code=400, detail="project_id body and path must match")
 
-    observation = Observation(
+    values = _observation_values(db, payload)
+    observation_id = new_observation_id()
+    now = datetime.utcnow()
+    table = Observation.__table__
+    change_seq = bump_data_version(db, project_id)
+    statements = {
+        "observation": insert(table)
+        .values(
+            id=observation_id,
+            project_id=project_id,
+            change_seq=change_seq,
+            created_by=membership.user_id,
+            updated_by=membership.user_id,
+            created_at=now,
+            updated_at=now,
+            **values,
+        )
+        .returning(*table.c),
+    }
+    for relation, model in _CHILD_MODELS.items():
+        child_values = _child_values(db, relation, payload)
+        if child_values is not None:
+            statements[relation] = (
+                insert(model.__table__)
+                .values(project_id=project_id, observation_id=observation_id, **child_values)
+                .returning(*model.__table__.c)
+            )
+    statements["history"] = insert(ObservationStatusHistory.__table__).values(
         project_id=project_id,
-        external_uuid=payload.external_uuid,
-        legacy_fid=payload.legacy_fid,
-        property_type_id=_catalog_id_by_code(db, CatalogPropertyType, payload.property_type.value, required=True),
-        value_origin_id=_catalog_id_by_code(db, CatalogValueOrigin, payload.value_origin_code, required=False),
-        currency_id=_catalog_id_by_code(
-            db, CatalogCurrency, payload.currency.value if payload.currency else None, required=False
-        ),
-        market_value_total=payload.price,
-        unit_land_value=payload.unit_land_value,
-        valuation_date=payload.valuation_date,
-        surface_total=payload.surface_total,
-        surface_unit=payload.surface_unit,
-        status=ObservationStatus(payload.status.value),
-        is_outlier=payload.status.value == ObservationStatus.OUTLIER.value,
-        created_by=membership.user_id,
-        updated_by=membership.user_id,
-        extras=payload.extras,
+        observation_id=observation_id,
+        from_status=None,
+        to_status=values["status"],
+        changed_by=membership.user_id,
+        reason="create",
+        changed_at=now,
     )
-    db.add(observation)
-    db.flush()
+    rows = execute_together(db, statements)
+    observation = _observation_from_rows(rows)
+    row = observation_rows(db, [observation])[0]
+    upsert_read_rows(db, [read_values(row, observation.geom)])
+    touch_tiles(db, project_id, change_seq, [observation.geom])
+    db.commit()
+    return ObservationRead(**row)
 
-    _upsert_location(db, observation, payload.location)
-    _upsert_building(db, observation, payload.building)
-    _upsert_rural(observation, payload.rural)
 
-    db.add(
-        ObservationStatusHistory(
-            observation_id=observation.id,
-            from_status=None,
-            to_status=observation.status,
-            changed_by=membership.user_id,
-            reason="create",
+def _uuid_or_none(value) -> UUID | None:
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _batch_error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'data'}: {error['msg']}" for error in exc.errors()
         )
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    return str(exc)
+
+
+@router.post(":batch", response_model=ObservationBatchResult)
+def batch_upsert_observations(
+    project_id: int,
+    payload: ObservationBatchRequest,
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+):
+    require_project_scope(project_id, membership)
+    # Taken first: concurrent writers to the project wait here, before reading the rows below.
+    change_seq = bump_data_version(db, project_id)
+
+    ids = {item.id for item in payload.items if item.id}
+    # Keys and the external_uuids creates would insert, matched against every row, soft-deleted
+    # ones included: the unique constraint covers those too.
+    external_uuids = {
+        external_uuid
+        for item in payload.items
+        if not item.id
+        for external_uuid in (item.external_uuid, _uuid_or_none(item.data.get("external_uuid")))
+        if external_uuid
+    }
+    existing_by_id = {}
+    existing_by_external_uuid = {}
+    if ids or external_uuids:
+        rows = db.execute(
+            select(
+                Observation.id, Observation.external_uuid, Observation.status, Observation.geom, Observation.deleted_at
+            ).where(
+                Observation.project_id == project_id,
+                or_(Observation.id.in_(ids), Observation.external_uuid.in_(external_uuids)),
+            )
+        ).all()
+        existing_by_id = {row.id: row for row in rows}
+        existing_by_external_uuid = {row.external_uuid: row for row in rows if row.external_uuid}
+
+    now = datetime.utcnow()
+    results: list[ObservationBatchItemResult] = []
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    history: list[dict] = []
+    children: dict[type, list[dict]] = {ObservationLocation: [], ObservationBuilding: [], ObservationRural: []}
+    replaced_children: dict[type, set[UUID]] = {model: set() for model in children}
+    touched: set[UUID] = set()
+    written_geoms: list[str | None] = []
+    created_external_uuids: set[UUID] = set()
+
+    for index, item in enumerate(payload.items):
+        try:
+            if item.id:
+                target = existing_by_id.get(item.id)
+                if target is None or target.deleted_at is not None:
+                    raise ValueError("Observation not found")
+            else:
+                target = existing_by_external_uuid.get(item.external_uuid) if item.external_uuid else None
+                if target is not None and target.deleted_at is not None:
+                    raise ValueError("external_uuid belongs to a deleted observation")
+
+            if target is not None:
+                if target.id in touched:
+                    raise ValueError("Observation appears more than once in the batch")
+                update_payload = ObservationUpdate.model_validate(item.data)
+                data = update_payload.model_dump(exclude_unset=True)
+                changes = _observation_changes(db, update_payload, data)
+                item_children = {}
+                if "location" in data:
+                    item_children[ObservationLocation] = _location_values(db, update_payload.location)
+                if "building" in data:
+                    item_children[ObservationBuilding] = _building_values(db, update_payload.building)
+                if "rural" in data:
+                    item_children[ObservationRural] = _rural_values(update_payload.rural)
+                observation_id = target.id
+                updates.append(
+                    {
+                        "project_id": project_id,
+                        "id": observation_id,
+                        **changes,
+                        "updated_by": membership.user_id,
+                        "updated_at": now,
+                        "change_seq": change_seq,
+                    }
+                )
+                if "status" in changes and changes["status"] != target.status:
+                    history.append(
+                        {
+                            "project_id": project_id,
+                            "observation_id": observation_id,
+                            "from_status": target.status,
+                            "to_status": changes["status"],
+                            "changed_by": membership.user_id,
+                            "reason": "batch update",
+                            "changed_at": now,
+                        }
+                    )
+                for model in item_children:
+                    replaced_children[model].add(observation_id)
+                item_geoms = [target.geom, changes.get("geom", target.geom)]
+                item_status = BatchItemStatusEnum.UPDATED
+            else:
+                data = {"project_id": project_id, **item.data}
+                if item.external_uuid:
+                    data.setdefault("external_uuid", str(item.external_uuid))
+                create_payload = ObservationCreate.model_validate(data)
+                if create_payload.project_id != project_id:
+                    raise ValueError("project_id body and path must match")
+                if item.external_uuid and create_payload.external_uuid != item.external_uuid:
+                    raise ValueError("external_uuid key and data must match")
+                if create_payload.external_uuid in created_external_uuids:
+                    raise ValueError("external_uuid appears more than once in the batch")
+                if create_payload.external_uuid in existing_by_external_uuid:
+                    raise ValueError("external_uuid already belongs to another observation")
+                values = _observation_values(db, create_payload)
+                item_children = {
+                    ObservationLocation: _location_values(db, create_payload.location),
+                    ObservationBuilding: _building_values(db, create_payload.building),
+                    ObservationRural: _rural_values(create_payload.rural),
+                }
+                observation_id = new_observation_id()
+                inserts.append(
+                    {
+                        "id": observation_id,
+                        "project_id": project_id,
+                        "created_by": membership.user_id,
+                        "updated_by": membership.user_id,
+                        "created_at": now,
+                        "updated_at": now,
+                        "change_seq": change_seq,
+                        **values,
+                    }
+                )
+                history.append(
+                    {
+                        "project_id": project_id,
+                        "observation_id": observation_id,
+                        "from_status": None,
+                        "to_status": values["status"],
+                        "changed_by": membership.user_id,
+                        "reason": "batch create",
+                        "changed_at": now,
+                    }
+                )
+                if create_payload.external_uuid:
+                    created_external_uuids.add(create_payload.external_uuid)
+                item_geoms = [values["geom"]]
+                item_status = BatchItemStatusEnum.CREATED
+        except (ValidationError, HTTPException, ValueError) as exc:
+            results.append(
+                ObservationBatchItemResult(
+                    index=index,
+                    status=BatchItemStatusEnum.ERROR,
+                    id=item.id,
+                    error=_batch_error_message(exc),
+                )
+            )
+            continue
+
+        touched.add(observation_id)
+        written_geoms.extend(item_geoms)
+        for model, values in item_children.items():
+            if values is not None:
+                children[model].append({"project_id": project_id, "observation_id": observation_id, **values})
+        results.append(ObservationBatchItemResult(index=index, status=item_status, id=observation_id))
+
+    failed = sum(1 for result in results if result.status == BatchItemStatusEnum.ERROR)
+    if failed and payload.mode == BatchModeEnum.ATOMIC:
+        db.rollback()
+        body = ObservationBatchResult(committed=False, failed=failed, items=results)
+        return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=body.model_dump(mode="json"))
+
+    try:
+        if inserts:
+            db.execute(insert(Observation), inserts)
+        if updates:
+            db.execute(update(Observation), updates)
+        for model, observation_ids in replaced_children.items():
+            if observation_ids:
+                db.execute(
+                    delete(model).where(model.project_id == project_id, model.observation_id.in_(observation_ids))
+                )
+        for model, rows in children.items():
+            if rows:
+                db.execute(insert(model), rows)
+        if history:
+            db.execute(insert(ObservationStatusHistory), history)
+        rendered = refresh_read_rows(db, project_id, touched)
+        touch_tiles(db, project_id, change_seq, written_geoms)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Batch conflicts with existing observations",
+        ) from None
+
+    for result in results:
+        if result.status != BatchItemStatusEnum.ERROR and result.id in rendered:
+            result.observation = ObservationRead(**rendered[result.id])
+
+    return ObservationBatchResult(
+        committed=True,
+        created=sum(1 for result in results if result.status == BatchItemStatusEnum.CREATED),
+        updated=sum(1 for result in results if result.status == BatchItemStatusEnum.UPDATED),
+        failed=failed,
+        items=results,
     )
-    db.commit()
-    db.refresh(observation)
-    return _serialize_observation(db, observation)
+
+
+@router.post("/outliers:detect", response_model=OutlierDetectionReport)
+def detect_observation_outliers(
+    project_id: int,
+    payload: OutlierDetectionRequest,
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> OutlierDetectionReport:
+    require_project_scope(project_id, membership)
+    report = detect_outliers(
+        db,
+        project_id,
+        method=OutlierMethod(payload.method.value),
+        threshold=payload.threshold,
+        min_group_size=payload.min_group_size,
+        zone_size=payload.zone_size,
+        log_scale=payload.log_scale,
+        changed_by=membership.user_id,
+        dry_run=payload.dry_run,
+    )
+    return OutlierDetectionReport(**asdict(report))
+
+
+# Declared after /changes, /clusters and /tiles so those paths are not parsed as ids.
+@router.get("/{observation_id}", response_model=ObservationRead, response_class=FastJSONResponse)
+def get_observation(
+    project_id: int,
+    observation_id: UUID,
+    request: Request,
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> Response:
+    require_project_scope(project_id, membership)
+    headers, not_modified = conditional(db, request, project_id)
+    if not_modified:
+        return not_modified
+    document = db.scalar(
+        select(ObservationReadRow.document).where(
+            ObservationReadRow.project_id == project_id, ObservationReadRow.id == observation_id
+        )
+    )
+    if document is None:
+        raise HTTPException(status_code=404, detail="Observation not found")
+    return Response(content=document, media_type="application/json", headers=headers)
 
 
 @router.patch("/{observation_id}", response_model=ObservationRead)
@@ -295,73 +889,64 @@ def update_observation(
     membership: UserProject = Depends(get_project_membership),
     db: Session = Depends(get_db),
 ) -> ObservationRead:
-    _require_project_scope(project_id, membership)
-    observation = db.scalar(
-        select(Observation).where(
-            Observation.id == observation_id,
-            Observation.project_id == project_id,
-            Observation.deleted_at.is_(None),
+    require_project_scope(project_id, membership)
+    data = payload.model_dump(exclude_unset=True)
+    changes = _observation_changes(db, payload, data)
+    now = datetime.utcnow()
+    table = Observation.__table__
+    exists = (Observation.id == observation_id, Observation.project_id == project_id)
+    live = (*exists, Observation.deleted_at.is_(None))
+    change_seq = bump_data_version(db, project_id)
+
+    # Statements that read the observation come before the UPDATE, so they see the old row
+    # whether they run one by one or share the snapshot of a single statement.
+    statements = {"before": select(table.c.geom).where(*live)}
+    if "status" in changes:
+        statements["history"] = insert(ObservationStatusHistory.__table__).from_select(
+            ["project_id", "observation_id", "from_status", "to_status", "changed_by", "reason", "changed_at"],
+            select(
+                table.c.project_id,
+                table.c.id,
+                table.c.status,
+                literal(changes["status"], table.c.status.type),
+                cast(literal(membership.user_id), ObservationStatusHistory.changed_by.type),
+                literal("update"),
+                literal(now, ObservationStatusHistory.changed_at.type),
+            ).where(*live, table.c.status != changes["status"]),
         )
+    # Child-only edits leave the parent row clean; bump updated_at so delta sync sees them.
+    statements["observation"] = (
+        update(table)
+        .where(*live)
+        .values(**changes, updated_by=membership.user_id, updated_at=now, change_seq=change_seq)
+        .returning(*table.c)
     )
-    if not observation:
+    for relation, model in _CHILD_MODELS.items():
+        child_table = model.__table__
+        child_key = (child_table.c.project_id == project_id, child_table.c.observation_id == observation_id)
+        if relation not in data:
+            statements[relation] = select(child_table).where(*child_key)
+            continue
+        child_values = _child_values(db, relation, payload)
+        if child_values is None:
+            statements[f"{relation}_delete"] = delete(child_table).where(*child_key)
+        else:
+            statements[relation] = _upsert_child(db, model, project_id, observation_id, child_values, *exists)
+
+    rows = execute_together(db, statements)
+    if rows["observation"] is None:
         raise HTTPException(status_code=404, detail="Observation not found")
-
-    before_status = observation.status
-    data = payload.model_dump(exclude_unset=True)
-
-    if "property_type" in data:
-        observation.property_type_id = _catalog_id_by_code(
-            db, CatalogPropertyType, payload.property_type.value, required=True
-        )
-    if "value_origin_code" in data:
-        observation.value_origin_id = _catalog_id_by_code(
-            db, CatalogValueOrigin, payload.value_origin_code, required=False
-        )
-    if "currency" in data:
-        observation.currency_id = _catalog_id_by_code(
-            db, CatalogCurrency, payload.currency.value if payload.currency else None, required=False
-        )
-    if "price" in data:
-        observation.market_value_total = payload.price
-    if "unit_land_value" in data:
-        observation.unit_land_value = payload.unit_land_value
-    if "valuation_date" in data:
-        observation.valuation_date = payload.valuation_date
-    if "surface_total" in data:
-        observation.surface_total = payload.surface_total
-    if "surface_unit" in data:
-        observation.surface_unit = payload.surface_unit
-    if "status" in data:
-        observation.status = ObservationStatus(payload.status.value)
-        observation.is_outlier = observation.status == ObservationStatus.OUTLIER
-        if observation.status == ObservationStatus.ELIMINADO:
-            observation.deleted_at = datetime.utcnow()
-    if "extras" in data and payload.extras is not None:
-        observation.extras = payload.extras
-
-    if "location" in data:
-        _upsert_location(db, observation, payload.location)
-    if "building" in data:
-        _upsert_building(db, observation, payload.building)
-    if "rural" in data:
-        _upsert_rural(observation, payload.rural)
-
-    observation.updated_by = membership.user_id
-
-    if before_status != observation.status:
-        db.add(
-            ObservationStatusHistory(
-                observation_id=observation.id,
-                from_status=before_status,
-                to_status=observation.status,
-                changed_by=membership.user_id,
-                reason="update",
-            )
-        )
-
+    observation = _observation_from_rows(rows)
+    row = observation_rows(db, [observation])[0]
+    if observation.deleted_at is None:
+        upsert_read_rows(db, [read_values(row, observation.geom)])
+    else:
+        # PATCH to "eliminado" is a soft delete: the observation leaves the projection.
+        delete_read_rows(db, project_id, [observation.id])
+    # The old position too: a moved point leaves the tiles it was drawn in.
+    touch_tiles(db, project_id, change_seq, [rows["before"]["geom"], observation.geom])
     db.commit()
-    db.refresh(observation)
-    return _serialize_observation(db, observation)
+    return ObservationRead(**row)
 
 
 @router.delete("/{observation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -371,7 +956,8 @@ def delete_observation(
     membership: UserProject = Depends(get_project_membership),
     db: Session = Depends(get_db),
 ) -> None:
-    _require_project_scope(project_id, membership)
+    require_project_scope(project_id, membership)
+    change_seq = bump_data_version(db, project_id)
     observation = db.scalar(
         select(Observation).where(
             Observation.id == observation_id,
@@ -387,9 +973,11 @@ def delete_observation(
     observation.is_outlier = False
     observation.deleted_at = datetime.utcnow()
     observation.updated_by = membership.user_id
+    observation.change_seq = change_seq
 
     db.add(
         ObservationStatusHistory(
+            project_id=project_id,
             observation_id=observation.id,
             from_status=before_status,
             to_status=ObservationStatus.ELIMINADO,
@@ -397,4 +985,6 @@ def delete_observation(
             reason="delete",
         )
     )
+    delete_read_rows(db, project_id, [observation.id])
+    touch_tiles(db, project_id, change_seq, [observation.geom])
     db.commit()
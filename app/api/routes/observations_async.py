@@ -0,0 +1,255 @@
+from collections.abc import AsyncIterator
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_project_membership_async, require_project_scope
+from app.api.responses import FastJSONResponse
+from app.api.routes import observations
+from app.api.routes.observations import MAX_PAGE_SIZE, NDJSON_MEDIA_TYPE
+from app.core.database import get_async_db
+from app.models import UserProject
+from app.schemas.observation import (
+    ObservationBatchRequest,
+    ObservationBatchResult,
+    ObservationChanges,
+    ObservationCluster,
+    ObservationCreate,
+    ObservationRead,
+    ObservationStatusEnum,
+    ObservationUpdate,
+    OutlierDetectionReport,
+    PropertyTypeEnum,
+)
+from app.services.response_cache import response_cache
+from app.services.tiles import MAX_ZOOM, MVT_MEDIA_TYPE
+
+# Same endpoints as app.api.routes.observations, served from the event loop. The sync
+# handlers run through AsyncSession.run_sync: their queries go through the async driver
+# inside a greenlet, so no worker thread is parked on a socket while the database works.
+router = APIRouter(prefix="/projects/{project_id}/observations", tags=["observations"])
+
+
+async def _run(db: AsyncSession, handler, **kwargs):
+    return await db.run_sync(lambda session: handler(db=session, **kwargs))
+
+
+async def _stream_observations(bind, query) -> AsyncIterator[bytes]:
+    async with AsyncSession(bind=bind) as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield observations.stream_rows(partition)
+
+
+@router.get(
+    "",
+    response_model=list[ObservationRead],
+    response_class=FastJSONResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def list_observations(
+    project_id: int,
+    request: Request,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status_in: list[ObservationStatusEnum] | None = Query(default=None, alias="status"),
+    property_type: list[PropertyTypeEnum] | None = Query(default=None),
+    valuation_date_from: date | None = None,
+    valuation_date_to: date | None = None,
+    price_min: Decimal | None = None,
+    price_max: Decimal | None = None,
+    surface_min: Decimal | None = None,
+    surface_max: Decimal | None = None,
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat in EPSG:4326"),
+    stream: bool = Query(default=False, description="stream every match as NDJSON; same as Accept: application/x-ndjson"),
+    accept: str | None = Header(default=None),
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    filters = {
+        "cursor": cursor,
+        "status_in": status_in,
+        "property_type": property_type,
+        "valuation_date_from": valuation_date_from,
+        "valuation_date_to": valuation_date_to,
+        "price_min": price_min,
+        "price_max": price_max,
+        "surface_min": surface_min,
+        "surface_max": surface_max,
+        "bbox": bbox,
+    }
+    require_project_scope(project_id, membership)
+    headers, not_modified = await db.run_sync(lambda session: observations.conditional(session, request, project_id))
+    if not_modified:
+        return not_modified
+    query = await db.run_sync(lambda session: observations.list_query(session, project_id, **filters))
+    if observations.wants_stream(accept, stream):
+        return StreamingResponse(
+            _stream_observations(db.bind, observations.stream_query(query, limit)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    page = await response_cache.get_or_compute_async(
+        observations.page_cache_key(project_id, headers),
+        lambda: db.run_sync(lambda session: observations.render_page(session, query, limit)),
+    )
+    return observations.page_response(page, headers)
+
+
+@router.get("/changes", response_model=ObservationChanges, response_class=FastJSONResponse)
+async def list_observation_changes(
+    project_id: int,
+    request: Request,
+    since: str | None = None,
+    limit: int = Query(default=500, ge=1, le=MAX_PAGE_SIZE),
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> FastJSONResponse:
+    return await _run(
+        db,
+        observations.list_observation_changes,
+        project_id=project_id,
+        request=request,
+        since=since,
+        limit=limit,
+        membership=membership,
+    )
+
+
+@router.get("/clusters", response_model=list[ObservationCluster])
+async def list_observation_clusters(
+    project_id: int,
+    bbox: str = Query(description="min_lon,min_lat,max_lon,max_lat in EPSG:4326"),
+    zoom: int = Query(ge=0, le=MAX_ZOOM),
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[ObservationCluster]:
+    return await _run(
+        db,
+        observations.list_observation_clusters,
+        project_id=project_id,
+        bbox=bbox,
+        zoom=zoom,
+        membership=membership,
+    )
+
+
+@router.get(
+    "/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}},
+)
+async def get_observation_tile(
+    project_id: int,
+    z: int,
+    x: int,
+    y: int,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    return await _run(
+        db,
+        observations.get_observation_tile,
+        project_id=project_id,
+        z=z,
+        x=x,
+        y=y,
+        membership=membership,
+    )
+
+
+@router.post("", response_model=ObservationRead, status_code=status.HTTP_201_CREATED)
+async def create_observation(
+    project_id: int,
+    payload: ObservationCreate,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> ObservationRead:
+    return await _run(
+        db,
+        observations.create_observation,
+        project_id=project_id,
+        payload=payload,
+        membership=membership,
+    )
+
+
+@router.post(":batch", response_model=ObservationBatchResult)
+async def batch_upsert_observations(
+    project_id: int,
+    payload: ObservationBatchRequest,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _run(
+        db,
+        observations.batch_upsert_observations,
+        project_id=project_id,
+        payload=payload,
+        membership=membership,
+    )
+
+
+# Detection is NumPy-bound rather than I/O-bound, so it stays on the thread pool.
+router.add_api_route(
+    "/outliers:detect",
+    observations.detect_observation_outliers,
+    methods=["POST"],
+    response_model=OutlierDetectionReport,
+)
+
+
+@router.get("/{observation_id}", response_model=ObservationRead, response_class=FastJSONResponse)
+async def get_observation(
+    project_id: int,
+    observation_id: UUID,
+    request: Request,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    return await _run(
+        db,
+        observations.get_observation,
+        project_id=project_id,
+        observation_id=observation_id,
+        request=request,
+        membership=membership,
+    )
+
+
+@router.patch("/{observation_id}", response_model=ObservationRead)
+async def update_observation(
+    project_id: int,
+    observation_id: UUID,
+    payload: ObservationUpdate,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> ObservationRead:
+    return await _run(
+        db,
+        observations.update_observation,
+        project_id=project_id,
+        observation_id=observation_id,
+        payload=payload,
+        membership=membership,
+    )
+
+
+@router.delete("/{observation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_observation(
+    project_id: int,
+    observation_id: UUID,
+    membership: UserProject = Depends(get_project_membership_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    await _run(
+        db,
+        observations.delete_observation,
+        project_id=project_id,
+        observation_id=observation_id,
+        membership=membership,
+    )
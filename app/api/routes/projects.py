@@ -1,28 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_project_membership
+from app.api.responses import dumps
 from app.core.database import get_db
 from app.models import Project, User, UserProject
+from app.services.response_cache import response_cache
+from app.services.versions import memberships_version_query
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
-@router.get("")
+@router.get("", response_model=list[dict])
 def list_projects(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[dict]:
-    memberships = db.scalars(
-        select(UserProject)
-        .where(UserProject.user_id == current_user.id)
-        .order_by(UserProject.project_id.asc())
-    ).all()
-    project_ids = [m.project_id for m in memberships]
-    if not project_ids:
-        return []
-    projects = db.scalars(select(Project).where(Project.id.in_(project_ids))).all()
+) -> Response:
+    def render() -> bytes:
+        memberships = db.scalars(
+            select(UserProject)
+            .where(UserProject.user_id == current_user.id)
+            .order_by(UserProject.project_id.asc())
+        ).all()
+        project_ids = [m.project_id for m in memberships]
+        if not project_ids:
+            return dumps([])
+        projects = db.scalars(select(Project).where(Project.id.in_(project_ids))).all()
+        return dumps(project_summaries(memberships, projects))
+
+    key = projects_cache_key(current_user.id, db.scalar(memberships_version_query))
+    page = response_cache.get_or_compute(key, render)
+    return Response(content=page, media_type="application/json")
+
+
+def projects_cache_key(user_id: int, memberships_version: int | None) -> str:
+    # The version is read from the database, so every worker keys the listing the same way.
+    return f"projects:{user_id}:{memberships_version or 0}"
+
+
+def project_summaries(memberships: list[UserProject], projects: list[Project]) -> list[dict]:
     projects_map = {p.id: p for p in projects}
     return [
         {
@@ -41,6 +58,10 @@ def list_projects(
 def current_project_context(
     membership: UserProject = Depends(get_project_membership),
 ) -> dict:
+    return project_context(membership)
+
+
+def project_context(membership: UserProject) -> dict:
     return {
         "project_id": membership.project_id,
         "role": membership.role.value,
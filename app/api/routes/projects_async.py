@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_async, get_project_membership_async
+from app.api.responses import dumps
+from app.api.routes.projects import project_context, project_summaries, projects_cache_key
+from app.core.database import get_async_db
+from app.models import Project, User, UserProject
+from app.services.response_cache import response_cache
+from app.services.versions import memberships_version_query
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+
+
+@router.get("", response_model=list[dict])
+async def list_projects(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> Response:
+    async def render() -> bytes:
+        memberships = (
+            await db.scalars(
+                select(UserProject)
+                .where(UserProject.user_id == current_user.id)
+                .order_by(UserProject.project_id.asc())
+            )
+        ).all()
+        project_ids = [m.project_id for m in memberships]
+        if not project_ids:
+            return dumps([])
+        projects = (await db.scalars(select(Project).where(Project.id.in_(project_ids)))).all()
+        return dumps(project_summaries(memberships, projects))
+
+    key = projects_cache_key(current_user.id, await db.scalar(memberships_version_query))
+    page = await response_cache.get_or_compute_async(key, render)
+    return Response(content=page, media_type="application/json")
+
+
+@router.get("/current")
+async def current_project_context(
+    membership: UserProject = Depends(get_project_membership_async),
+) -> dict:
+    return project_context(membership)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_project_membership, require_project_scope
+from app.core.database import get_db
+from app.models import UserProject
+from app.schemas.observation import CurrencyEnum, PropertyTypeEnum
+from app.schemas.stats import MarketStatRead
+from app.services.market_stats import ALL, query_market_stats, zone_for_point
+
+router = APIRouter(prefix="/projects/{project_id}/stats", tags=["stats"])
+
+PERIOD_PATTERN = r"^\d{4}-\d{2}$"
+
+
+@router.get("", response_model=list[MarketStatRead])
+def get_market_stats(
+    project_id: int,
+    property_type: PropertyTypeEnum | None = None,
+    currency: CurrencyEnum | None = None,
+    zone: str = Query(default=ALL, max_length=64),
+    lon: float | None = Query(default=None, ge=-180, le=180),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    monthly: bool = False,
+    period_from: str | None = Query(default=None, pattern=PERIOD_PATTERN),
+    period_to: str | None = Query(default=None, pattern=PERIOD_PATTERN),
+    membership: UserProject = Depends(get_project_membership),
+    db: Session = Depends(get_db),
+) -> list[MarketStatRead]:
+    require_project_scope(project_id, membership)
+    if lon is not None and lat is not None:
+        zone = zone_for_point(lon, lat)
+    rows = query_market_stats(
+        db,
+        project_id,
+        property_type=property_type.value if property_type else None,
+        currency=currency.value if currency else None,
+        zone=zone,
+        monthly=monthly,
+        period_from=period_from,
+        period_to=period_to,
+    )
+    return [MarketStatRead(**row) for row in rows]
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU bounded by entry count and, optionally, by total weight.
+
+    Entries may carry their own expiry (monotonic seconds); ``ttl_seconds`` is the
+    default when none is given.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        *,
+        ttl_seconds: float | None = None,
+        max_weight: int | None = None,
+        weigher: Callable[[Any], int] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_weight = max_weight
+        self._weigher = weigher or (lambda value: 1)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None, int]] = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, *, expires_at: float | None = None) -> None:
+        if expires_at is None and self.ttl_seconds:
+            expires_at = time.monotonic() + self.ttl_seconds
+        weight = self._weigher(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, weight)
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value = self._entries[key][0]
+            self._remove(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "weight": self._weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, weight = self._entries.pop(key)
+        self._weight -= weight
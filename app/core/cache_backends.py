@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from collections.abc import Callable
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # optional: only needed for RESPONSE_CACHE_BACKEND=redis
+    redis = None
+
+
+class MemoryBackend:
+    """Per-process blobs (LRU bounded by entries and bytes) and counters."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float | None = None):
+        self._blobs = LRUCache(max_entries, ttl_seconds=ttl_seconds, max_weight=max_bytes, weigher=len)
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self._blobs.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._blobs.set(key, value)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+        self._blobs.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._blobs.stats()
+
+
+class RedisBackend:
+    """Shared across workers. Size-based eviction is Redis' own: run it with
+    ``maxmemory`` and ``maxmemory-policy allkeys-lru``."""
+
+    # Every call is a network round trip on a synchronous client.
+    blocking = True
+
+    def __init__(self, url: str, max_entry_bytes: int, ttl_seconds: float | None = None, prefix: str = "omi:"):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+        self._max_entry_bytes = max_entry_bytes
+        self._ttl_seconds = int(ttl_seconds) if ttl_seconds else None
+        self._prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        value = self._client.get(self._prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) <= self._max_entry_bytes:
+            self._client.set(self._prefix + key, value, ex=self._ttl_seconds)
+
+    def counter(self, key: str) -> int:
+        return int(self._client.get(self._prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(self._prefix + key)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self._prefix}*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+async def offload(backend: MemoryBackend | RedisBackend, call: Callable, *args):
+    """Run a backend call from async code without stalling the event loop on network I/O."""
+    if backend.blocking:
+        return await asyncio.to_thread(call, *args)
+    return call(*args)
+
+
+def build_backend() -> MemoryBackend | RedisBackend:
+    if settings.response_cache_backend == "redis":
+        return RedisBackend(
+            settings.redis_url,
+            max_entry_bytes=settings.response_cache_max_bytes // 16,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+        )
+    return MemoryBackend(
+        max_entries=settings.response_cache_max_entries,
+        max_bytes=settings.response_cache_max_bytes,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+    )
+
+
+shared_backend = build_backend()
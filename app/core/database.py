@@ -1,11 +1,25 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import Executable, create_engine, select, true
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
-engine = create_engine(settings.database_url, future=True)
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(settings.database_url, future=True, poolclass=InstrumentedQueuePool, **pool_options())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
@@ -15,3 +29,57 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    # Built on first use so sync-only deployments never need an async driver.
+    return create_async_engine(
+        settings.async_database_url or settings.database_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **pool_options(),
+    )
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def execute_together(db: Session, statements: dict[str, Executable]) -> dict[str, dict | None]:
+    """Run statements in order and return each one's RETURNING (or SELECT) row by name.
+
+    On PostgreSQL they are sent as a single statement of data-modifying CTEs: one round
+    trip, every part reading the snapshot from before the write. Elsewhere they run one
+    after another, so callers order them to read the same pre-write state both ways.
+    Rows come back as plain dicts; a statement that returned nothing maps to None.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        rows = {}
+        for name, statement in statements.items():
+            result = db.execute(statement)
+            row = result.mappings().first() if statement.exported_columns else None
+            rows[name] = dict(row) if row is not None else None
+        return rows
+
+    ctes = {name: statement.cte(f"write_{name}") for name, statement in statements.items()}
+    readable = [name for name, statement in statements.items() if statement.exported_columns]
+    joined = ctes[readable[0]]
+    for name in readable[1:]:
+        joined = joined.outerjoin(ctes[name], true())
+    query = select(
+        *(column.label(f"{name}__{column.key}") for name in readable for column in ctes[name].c)
+    ).select_from(joined)
+    query = query.add_cte(*(cte for name, cte in ctes.items() if name not in readable))
+    row = db.execute(query).mappings().first()
+    rows = {name: None for name in statements}
+    for name in readable:
+        prefix = f"{name}__"
+        values = {key[len(prefix) :]: value for key, value in (row or {}).items() if key.startswith(prefix)}
+        rows[name] = values if any(value is not None for value in values.values()) else None
+    return rows
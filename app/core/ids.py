@@ -0,0 +1,37 @@
+import os
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7: 48-bit Unix milliseconds, then a 12-bit counter, then 62 random bits.
+
+    The counter keeps ids generated within the same millisecond in this process in order,
+    so consecutive inserts land on the right-most B-tree page instead of a random one.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms, _counter = now_ms, int.from_bytes(os.urandom(2)) & 0x1FF
+        else:
+            # Same millisecond (or the clock stepped back): keep counting from the last id.
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms, _counter = _last_ms + 1, 0
+        unix_ms, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8)) & 0x3FFF_FFFF_FFFF_FFFF
+    value = unix_ms << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+def new_observation_id() -> uuid.UUID:
+    # Both versions share the uuid column, so flipping the setting needs no migration.
+    return uuid7() if settings.observation_id_version == 7 else uuid.uuid4()
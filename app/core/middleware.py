@@ -0,0 +1,65 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROJECT_ID_EXEMPT_PATHS = {
+    "/auth/login",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/health",
+    "/internal/caches",
+    "/internal/password-pool",
+    "/internal/pool",
+    "/projects",
+    "/projects/",
+}
+
+
+class ProjectScopeMiddleware:
+    """Requires a numeric ``X-Project-Id`` and exposes it as ``request.state.active_project_id``.
+
+    Plain ASGI: the response body is passed through untouched, so streaming responses
+    keep streaming. With ``server_timing`` on, responses carry ``Server-Timing: app;dur=<ms>``
+    measured up to the start of the response.
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: set[str] = PROJECT_ID_EXEMPT_PATHS, server_timing: bool = False):
+        self.app = app
+        self.exempt_paths = exempt_paths
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        if scope["path"] not in self.exempt_paths:
+            project_id = next((value for key, value in scope["headers"] if key == b"x-project-id"), None)
+            error = None
+            if not project_id:
+                error = "Missing X-Project-Id header"
+            elif not project_id.isdigit():
+                error = "X-Project-Id must be numeric"
+            if error:
+                response = JSONResponse(status_code=400, content={"detail": error})
+                await response(scope, receive, self._timed(send, started))
+                return
+            scope.setdefault("state", {})["active_project_id"] = int(project_id)
+
+        await self.app(scope, receive, self._timed(send, started))
+
+    def _timed(self, send: Send, started: float) -> Send:
+        if not self.server_timing:
+            return send
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f"app;dur={(time.perf_counter() - started) * 1000:.1f}")
+            await send(message)
+
+        return send_with_timing
@@ -0,0 +1,80 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from app.core.config import settings
+from app.core.security import verify_and_update_password
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+class PasswordPool:
+    """Bounded process pool for bcrypt.
+
+    At most ``max_pending`` verifications may be queued or running; beyond that
+    callers are rejected immediately instead of piling up behind the workers.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            if self._executor is None:
+                # spawn: forking a threaded server process is not safe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+            if not future.cancelled() and future.exception() is None and future.result()[1]:
+                self.rehashed += 1
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return self._submit(verify_and_update_password, plain_password, hashed_password).result()
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await asyncio.wrap_future(self._submit(verify_and_update_password, plain_password, hashed_password))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "queued": max(self._pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_pool = PasswordPool(
+    workers=settings.password_pool_workers,
+    max_pending=settings.password_pool_max_pending,
+)
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolWaitStats:
+    """Cumulative histogram of checkout waits plus the checkouts that timed out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = [0] * len(WAIT_BUCKETS_MS)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.timeouts = 0
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum_ms += wait_ms
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self._buckets[index] += 1
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {str(bound): count for bound, count in zip(WAIT_BUCKETS_MS, self._buckets)}
+            buckets["+Inf"] = self.count
+            return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": buckets, "timeouts": self.timeouts}
+
+
+class _InstrumentedPoolMixin:
+    # Waits include opening a fresh connection when the pool grows. Stats restart when
+    # the engine is disposed, since dispose() swaps in a new pool instance.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.timeout()
+            raise
+        self.wait_stats.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "wait": self.wait_stats.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
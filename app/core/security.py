@@ -1,32 +1,57 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import LRUCache
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Raising BCRYPT_ROUNDS makes existing hashes "deprecated"; they are upgraded on the next login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """(valid, new hash when the stored one uses outdated cost parameters)."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+def create_access_token(
+    subject: str, expires_delta: timedelta | None = None, roles: dict[str, str] | None = None
+) -> str:
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
     to_encode: dict[str, Any] = {"sub": subject, "exp": expire}
+    if roles is not None:
+        to_encode["roles"] = roles
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+# sha256(token) -> verified claims; each entry lives until the token's own exp.
+token_cache = LRUCache(settings.token_cache_max_entries)
+
+
 def decode_token(token: str) -> dict[str, Any] | None:
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None:
+        return dict(claims)
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         return None
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(digest, claims, expires_at=time.monotonic() + (exp - time.time()))
+    return dict(claims)
@@ -1,3 +1,4 @@
+from app.models.archive import ARCHIVE_TABLES
 from app.models.base import Base
 from app.models.catalogs import (
     CatalogConservationState,
@@ -11,11 +12,12 @@ from app.models.observation import (
     Observation,
     ObservationBuilding,
     ObservationLocation,
+    ObservationReadRow,
     ObservationRural,
     ObservationStatus,
     ObservationStatusHistory,
 )
-from app.models.project import Project
+from app.models.project import MembershipVersion, Project, ProjectDataVersion, TileCellVersion
 from app.models.user import User
 from app.models.user_project import ProjectRole, UserProject
 
@@ -23,6 +25,9 @@ __all__ = [
     "Base",
     "User",
     "Project",
+    "ProjectDataVersion",
+    "MembershipVersion",
+    "TileCellVersion",
     "UserProject",
     "ProjectRole",
     "CatalogPropertyType",
@@ -37,4 +42,6 @@ __all__ = [
     "ObservationLocation",
     "ObservationBuilding",
     "ObservationRural",
+    "ObservationReadRow",
+    "ARCHIVE_TABLES",
 ]
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, DateTime, Index, Table
+
+# Imported for their tables: a foreign key column only gets its type once the referenced
+# table exists, and the archive copies column types at import time.
+from app.models import catalogs, project, user  # noqa: F401
+from app.models.base import Base
+from app.models.observation import (
+    Observation,
+    ObservationBuilding,
+    ObservationLocation,
+    ObservationRural,
+    ObservationStatusHistory,
+)
+
+
+def _archive_of(table: Table, *indexes: Index) -> Table:
+    # Same columns and keys as the live table but no foreign keys or defaults: archived rows
+    # must not pin users or catalog entries, and are only copied in and out verbatim.
+    return Table(
+        f"{table.name}_archive",
+        Base.metadata,
+        *(
+            Column(
+                column.name,
+                column.type.copy(),
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                autoincrement=False,
+            )
+            for column in table.c
+        ),
+        Column("archived_at", DateTime(timezone=True), nullable=False),
+        *indexes,
+    )
+
+
+observations_archive = _archive_of(Observation.__table__)
+observation_location_archive = _archive_of(ObservationLocation.__table__)
+observation_building_archive = _archive_of(ObservationBuilding.__table__)
+observation_rural_archive = _archive_of(ObservationRural.__table__)
+observation_status_history_archive = _archive_of(
+    ObservationStatusHistory.__table__,
+    Index("ix_observation_status_history_archive_observation", "project_id", "observation_id"),
+)
+
+# Live table -> archive table, parents first.
+ARCHIVE_TABLES = {
+    Observation.__table__: observations_archive,
+    ObservationLocation.__table__: observation_location_archive,
+    ObservationBuilding.__table__: observation_building_archive,
+    ObservationRural.__table__: observation_rural_archive,
+    ObservationStatusHistory.__table__: observation_status_history_archive,
+}
@@ -2,11 +2,29 @@ import enum
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, Enum, ForeignKey, Numeric, String, Uuid, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Numeric,
+    String,
+    Text,
+    Uuid,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.ids import new_observation_id
 from app.models.base import Base
+from app.models.types import GeometryPoint
 
 
 class ObservationStatus(str, enum.Enum):
@@ -18,14 +36,65 @@ class ObservationStatus(str, enum.Enum):
     ELIMINADO = "eliminado"
 
 
+# On PostgreSQL observations and its one-to-one child tables are hash-partitioned by project_id
+# (migration 20261018_0008, app.services.partitions). Partitioned keys must include the
+# partition key, hence the composite primary and foreign keys.
 class Observation(Base):
     __tablename__ = "observations"
     __table_args__ = (
         UniqueConstraint("project_id", "external_uuid", name="uq_observations_project_external_uuid"),
+        # Not partial: soft-deleted rows must stay visible to emit tombstones.
+        Index("ix_observations_project_change_seq", "project_id", "change_seq", "id"),
+        Index(
+            "ix_observations_live_project_created",
+            "project_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_project_status",
+            "project_id",
+            "status",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_project_property_type",
+            "project_id",
+            "property_type_id",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_project_valuation_date",
+            "project_id",
+            "valuation_date",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_project_price",
+            "project_id",
+            "market_value_total",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_project_surface",
+            "project_id",
+            "surface_total",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_observations_live_geom",
+            "geom",
+            postgresql_using="gist",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_observations_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=new_observation_id)
     external_uuid: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True)
     legacy_fid: Mapped[int | None] = mapped_column(nullable=True)
 
@@ -57,7 +126,7 @@ class Observation(Base):
         index=True,
     )
     is_outlier: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     created_by: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     updated_by: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -65,12 +134,17 @@ class Observation(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Project data version of the last write, the /changes cursor; deferred because only
+    # that feed reads it.
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0", deferred=True)
 
     extras: Mapped[dict] = mapped_column(
         JSON().with_variant(JSONB, "postgresql"),
         nullable=False,
         default=dict,
     )
+    # EWKT "SRID=4326;POINT(lon lat)", derived from extras.coordinates on write.
+    geom: Mapped[str | None] = mapped_column(GeometryPoint(4326), nullable=True)
 
     status_history = relationship(
         "ObservationStatusHistory",
@@ -99,11 +173,17 @@ class Observation(Base):
 
 class ObservationStatusHistory(Base):
     __tablename__ = "observation_status_history"
+    # Append-only audit log; stays a plain table keyed by id, pointing at partitioned observations.
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["project_id", "observation_id"], ["observations.project_id", "observations.id"], ondelete="CASCADE"
+        ),
+        Index("ix_observation_status_history_observation", "project_id", "observation_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    observation_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("observations.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    project_id: Mapped[int] = mapped_column(nullable=False)
+    observation_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
     from_status: Mapped[ObservationStatus | None] = mapped_column(
         Enum(
             ObservationStatus,
@@ -131,12 +211,14 @@ class ObservationStatusHistory(Base):
 
 class ObservationLocation(Base):
     __tablename__ = "observation_location"
-
-    observation_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid,
-        ForeignKey("observations.id", ondelete="CASCADE"),
-        primary_key=True,
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["project_id", "observation_id"], ["observations.project_id", "observations.id"], ondelete="CASCADE"
+        ),
     )
+
+    project_id: Mapped[int] = mapped_column(primary_key=True)
+    observation_id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
     padron: Mapped[str | None] = mapped_column(String(255), nullable=True)
     neighborhood_type_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
     shape_type_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -152,12 +234,14 @@ class ObservationLocation(Base):
 
 class ObservationBuilding(Base):
     __tablename__ = "observation_building"
-
-    observation_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid,
-        ForeignKey("observations.id", ondelete="CASCADE"),
-        primary_key=True,
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["project_id", "observation_id"], ["observations.project_id", "observations.id"], ondelete="CASCADE"
+        ),
     )
+
+    project_id: Mapped[int] = mapped_column(primary_key=True)
+    observation_id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
     built_surface_total: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
     warehouse_surface: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
     front_meters: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
@@ -182,12 +266,14 @@ class ObservationBuilding(Base):
 
 class ObservationRural(Base):
     __tablename__ = "observation_rural"
-
-    observation_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid,
-        ForeignKey("observations.id", ondelete="CASCADE"),
-        primary_key=True,
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["project_id", "observation_id"], ["observations.project_id", "observations.id"], ondelete="CASCADE"
+        ),
     )
+
+    project_id: Mapped[int] = mapped_column(primary_key=True)
+    observation_id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
     main_use_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
     sugarcane_surface: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
     citrus_surface: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
@@ -202,3 +288,33 @@ class ObservationRural(Base):
     has_rural_improvements: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
 
     observation = relationship("Observation", back_populates="rural")
+
+
+# Flat projection of live observations served by the list, stream, detail and tile reads
+# (app.services.read_model). Rows are written in the same transaction as the observation;
+# document holds the ObservationRead JSON already rendered, with catalog codes resolved.
+class ObservationReadRow(Base):
+    __tablename__ = "observation_read"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["project_id", "id"], ["observations.project_id", "observations.id"], ondelete="CASCADE"
+        ),
+        Index("ix_observation_read_project_created", "project_id", "created_at", "id"),
+        Index("ix_observation_read_project_status", "project_id", "status", "created_at"),
+        Index("ix_observation_read_project_property_type", "project_id", "property_type", "created_at"),
+        Index("ix_observation_read_project_valuation_date", "project_id", "valuation_date"),
+        Index("ix_observation_read_project_price", "project_id", "price"),
+        Index("ix_observation_read_project_surface", "project_id", "surface_total"),
+        Index("ix_observation_read_geom", "geom", postgresql_using="gist"),
+    )
+
+    project_id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    property_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    price: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
+    valuation_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    surface_total: Mapped[float | None] = mapped_column(Numeric(18, 2), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    geom: Mapped[str | None] = mapped_column(GeometryPoint(4326), nullable=True)
+    document: Mapped[str] = mapped_column(Text, nullable=False)
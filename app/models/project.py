@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import BigInteger, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -11,3 +11,39 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
 
     users = relationship("UserProject", back_populates="project", cascade="all, delete-orphan")
+
+
+class ProjectDataVersion(Base):
+    """Counter advanced inside every transaction that changes what a project read returns."""
+
+    __tablename__ = "project_data_versions"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Newest change_seq among the project's archived observations: /changes tokens older than
+    # this may have missed deletions that are no longer in the live tables.
+    archived_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class MembershipVersion(Base):
+    """Single-row counter advanced inside every transaction that changes what GET /projects lists."""
+
+    __tablename__ = "membership_versions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class TileCellVersion(Base):
+    """Project data version of the last write that touched a fixed-zoom tile cell.
+
+    Cached tiles are keyed on the newest version among the cells they cover, so a write only
+    retires the tiles around the points it moved or changed.
+    """
+
+    __tablename__ = "tile_cell_versions"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    x: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    y: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,80 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import UserDefinedType
+
+
+class GeometryPoint(UserDefinedType):
+    """PostGIS ``geometry(Point, srid)``; values travel as EWKT strings.
+
+    Other dialects (SQLite in tests) store the EWKT text as is.
+    """
+
+    cache_ok = True
+
+    def __init__(self, srid: int = 4326):
+        self.srid = srid
+
+    def get_col_spec(self, **kw) -> str:
+        return f"geometry(Point,{self.srid})"
+
+    def bind_expression(self, bindvalue):
+        return _GeomFromEWKT(bindvalue, type_=self)
+
+    def column_expression(self, col):
+        return _AsEWKT(col, type_=self)
+
+
+class _GeomFromEWKT(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, *clauses, type_=None):
+        super().__init__(*clauses)
+        self.type = type_
+
+
+class _AsEWKT(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, *clauses, type_=None):
+        super().__init__(*clauses)
+        self.type = type_
+
+
+@compiles(GeometryPoint)
+def _compile_geometry_point_default(type_, compiler, **kw) -> str:
+    return "TEXT"
+
+
+@compiles(GeometryPoint, "postgresql")
+def _compile_geometry_point_postgresql(type_, compiler, **kw) -> str:
+    return type_.get_col_spec()
+
+
+@compiles(_GeomFromEWKT)
+@compiles(_AsEWKT)
+def _compile_passthrough(element, compiler, **kw) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_GeomFromEWKT, "postgresql")
+def _compile_geom_from_ewkt_postgresql(element, compiler, **kw) -> str:
+    return f"ST_GeomFromEWKT({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(_AsEWKT, "postgresql")
+def _compile_as_ewkt_postgresql(element, compiler, **kw) -> str:
+    return f"ST_AsEWKT({compiler.process(element.clauses, **kw)})"
+
+
+def point_ewkt(lon: float, lat: float, srid: int = 4326) -> str:
+    return f"SRID={srid};POINT({lon} {lat})"
+
+
+def parse_point_ewkt(value: str | None) -> tuple[float, float] | None:
+    if not value:
+        return None
+    body = value.split(";", 1)[-1].strip()
+    if not body.upper().startswith("POINT(") or not body.endswith(")"):
+        return None
+    lon, lat = body[len("POINT(") : -1].split()
+    return float(lon), float(lat)
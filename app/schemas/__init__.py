@@ -1,12 +1,24 @@
 from app.schemas.auth import LoginRequest, Token
 from app.schemas.observation import (
+    BatchItemStatusEnum,
+    BatchModeEnum,
     CurrencyEnum,
+    ObservationBatchItem,
+    ObservationBatchItemResult,
+    ObservationBatchRequest,
+    ObservationBatchResult,
+    ObservationChanges,
+    ObservationCluster,
     ObservationCreate,
     ObservationRead,
     ObservationStatusEnum,
     ObservationUpdate,
+    OutlierDetectionReport,
+    OutlierDetectionRequest,
+    OutlierMethodEnum,
     PropertyTypeEnum,
 )
+from app.schemas.stats import MarketStatRead
 
 __all__ = [
     "Token",
@@ -17,4 +29,16 @@ __all__ = [
     "ObservationStatusEnum",
     "PropertyTypeEnum",
     "CurrencyEnum",
+    "BatchModeEnum",
+    "BatchItemStatusEnum",
+    "ObservationBatchItem",
+    "ObservationBatchRequest",
+    "ObservationBatchItemResult",
+    "ObservationBatchResult",
+    "ObservationChanges",
+    "ObservationCluster",
+    "OutlierMethodEnum",
+    "OutlierDetectionRequest",
+    "OutlierDetectionReport",
+    "MarketStatRead",
 ]
@@ -2,6 +2,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -162,3 +163,90 @@ class ObservationRead(BaseModel):
     rural: ObservationRuralPayload | None = None
     created_at: datetime
     updated_at: datetime
+
+
+class BatchModeEnum(str, Enum):
+    ATOMIC = "atomic"
+    PARTIAL = "partial"
+
+
+class BatchItemStatusEnum(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    ERROR = "error"
+
+
+class ObservationBatchItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    # Upsert key: an existing observation id, or an external_uuid that creates the row when unknown.
+    id: uuid.UUID | None = None
+    external_uuid: uuid.UUID | None = None
+    # Validated per item as ObservationCreate or ObservationUpdate so one bad item
+    # does not reject the whole batch in partial mode.
+    data: dict[str, Any]
+
+
+class ObservationBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    mode: BatchModeEnum = BatchModeEnum.ATOMIC
+    items: list[ObservationBatchItem] = Field(min_length=1, max_length=1000)
+
+
+class ObservationBatchItemResult(BaseModel):
+    index: int
+    status: BatchItemStatusEnum
+    id: uuid.UUID | None = None
+    error: str | None = None
+    observation: ObservationRead | None = None
+
+
+class ObservationBatchResult(BaseModel):
+    committed: bool
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    items: list[ObservationBatchItemResult]
+
+
+class ObservationChanges(BaseModel):
+    changes: list[ObservationRead]
+    deleted: list[uuid.UUID]
+    next_token: str | None = None
+    has_more: bool = False
+
+
+class ObservationCluster(BaseModel):
+    lon: float
+    lat: float
+    count: int
+    # Set when the cluster holds a single observation, so the map can draw it as a point.
+    observation_id: uuid.UUID | None = None
+    statuses: dict[ObservationStatusEnum, int] = Field(default_factory=dict)
+
+
+class OutlierMethodEnum(str, Enum):
+    IQR = "iqr"
+    MAD = "mad"
+
+
+class OutlierDetectionRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    method: OutlierMethodEnum = OutlierMethodEnum.MAD
+    # IQR fences multiplier, or robust z-score cutoff for MAD.
+    threshold: float = Field(default=3.5, gt=0)
+    min_group_size: int = Field(default=8, ge=3)
+    # Grid cell edge in degrees; groups are per property_type and currency only when omitted.
+    zone_size: float | None = Field(default=None, gt=0)
+    log_scale: bool = True
+    dry_run: bool = False
+
+
+class OutlierDetectionReport(BaseModel):
+    scanned: int
+    groups: int
+    flagged: int
+    updated: int
+    dry_run: bool
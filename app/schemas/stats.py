@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class MarketStatRead(BaseModel):
+    property_type: str
+    currency: str
+    zone: str
+    period: str
+    observations: int
+    mean: float
+    p10: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
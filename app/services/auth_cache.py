@@ -0,0 +1,113 @@
+import threading
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models import Project, ProjectRole, User, UserProject
+from app.services.versions import bump_memberships_version
+
+
+class MembershipCache:
+    """(user_id, project_id) -> (membership id, role) for the auth dependencies.
+
+    Only memberships that exist are cached. Writes in this process invalidate the
+    affected users on commit; the TTL bounds staleness from other workers.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None):
+        self._entries = LRUCache(max_entries, ttl_seconds=ttl_seconds)
+        self._epoch = 0
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, user_id: int) -> tuple[int, int]:
+        """Snapshot taken before querying; ``put`` drops the row if the user changed since."""
+        return self._epoch, self._versions.get(user_id, 0)
+
+    def get(self, user_id: int, project_id: int) -> tuple[int, ProjectRole] | None:
+        return self._entries.get((user_id, self.generation(user_id), project_id))
+
+    def put(
+        self, user_id: int, project_id: int, generation: tuple[int, int], membership_id: int, role: ProjectRole
+    ) -> None:
+        if generation == self.generation(user_id):
+            self._entries.set((user_id, generation, project_id), (membership_id, role))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._versions.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._entries.stats()
+
+
+membership_cache = MembershipCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
+
+
+def _affected_user_ids(obj) -> set[int]:
+    if isinstance(obj, User):
+        return {obj.id}
+    history = inspect(obj).attrs.user_id.history
+    return {user_id for user_id in chain([obj.user_id], history.deleted or ()) if user_id is not None}
+
+
+def _memberships_changed(session: Session) -> None:
+    # Once per transaction; the row lock is held until it ends, like the project data versions.
+    if not session.info.get("memberships_version_bumped"):
+        session.info["memberships_version_bumped"] = True
+        bump_memberships_version(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_membership_writes(session: Session, flush_context) -> None:
+    listed = False
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, (User, UserProject)):
+            session.info.setdefault("auth_users_changed", set()).update(_affected_user_ids(obj))
+            # A password rehash on login does not change any project listing.
+            listed = listed or isinstance(obj, UserProject) or obj in session.deleted
+        elif isinstance(obj, Project):
+            session.info["auth_cache_stale"] = True
+            listed = True
+    if listed or any(isinstance(obj, UserProject) for obj in session.new):
+        _memberships_changed(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_membership_writes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (User, UserProject, Project):
+        orm_execute_state.session.info["auth_cache_stale"] = True
+        _memberships_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_memberships_on_commit(session: Session) -> None:
+    stale = session.info.pop("auth_cache_stale", False)
+    users = session.info.pop("auth_users_changed", ())
+    if stale:
+        membership_cache.clear()
+    for user_id in users:
+        membership_cache.invalidate_user(user_id)
+    session.info.pop("memberships_version_bumped", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_membership_writes(session: Session) -> None:
+    session.info.pop("auth_cache_stale", None)
+    session.info.pop("auth_users_changed", None)
+    session.info.pop("memberships_version_bumped", None)
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import (
+    CatalogConservationState,
+    CatalogCurrency,
+    CatalogDestination,
+    CatalogLegalStatus,
+    CatalogPropertyType,
+    CatalogValueOrigin,
+)
+
+CATALOG_MODELS = (
+    CatalogPropertyType,
+    CatalogCurrency,
+    CatalogValueOrigin,
+    CatalogLegalStatus,
+    CatalogDestination,
+    CatalogConservationState,
+)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable code<->id maps for every catalog table."""
+
+    version: int
+    loaded_at: float
+    id_by_code: dict[str, dict[str, int]]
+    code_by_id: dict[str, dict[int, str]]
+
+
+class CatalogCache:
+    """Process-wide catalog lookups, loaded once and invalidated on catalog writes."""
+
+    def __init__(self, models: tuple = CATALOG_MODELS, ttl_seconds: float | None = None):
+        self._models = models
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def snapshot(self, db: Session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version and not self._expired(snapshot):
+            return snapshot
+        return self._load(db)
+
+    def id_for_code(self, db: Session, model, code: str) -> int | None:
+        item_id = self.snapshot(db).id_by_code[model.__tablename__].get(code)
+        if item_id is not None:
+            return item_id
+        # Miss: the code may have been added or re-activated after the snapshot was taken.
+        item_id = db.scalar(select(model.id).where(model.code == code, model.is_active.is_(True)))
+        if item_id is not None:
+            self.invalidate()
+        return item_id
+
+    def code_for_id(self, db: Session, model, item_id: int) -> str | None:
+        return self.codes_for_ids(db, model, [item_id]).get(item_id)
+
+    def codes_for_ids(self, db: Session, model, item_ids: Iterable[int | None]) -> dict[int, str]:
+        known = self.snapshot(db).code_by_id[model.__tablename__]
+        wanted = {item_id for item_id in item_ids if item_id}
+        result = {item_id: known[item_id] for item_id in wanted if item_id in known}
+        missing = wanted - result.keys()
+        if missing:
+            rows = db.execute(select(model.id, model.code).where(model.id.in_(missing))).all()
+            result.update({row.id: row.code for row in rows})
+            if rows:
+                self.invalidate()
+        return result
+
+    def _expired(self, snapshot: CatalogSnapshot) -> bool:
+        if not self._ttl_seconds:
+            return False
+        return time.monotonic() - snapshot.loaded_at > self._ttl_seconds
+
+    def _load(self, db: Session) -> CatalogSnapshot:
+        version = self._version
+        id_by_code: dict[str, dict[str, int]] = {}
+        code_by_id: dict[str, dict[int, str]] = {}
+        for model in self._models:
+            rows = db.execute(select(model.id, model.code, model.is_active)).all()
+            id_by_code[model.__tablename__] = {row.code: row.id for row in rows if row.is_active}
+            code_by_id[model.__tablename__] = {row.id: row.code for row in rows}
+
+        snapshot = CatalogSnapshot(
+            version=version,
+            loaded_at=time.monotonic(),
+            id_by_code=id_by_code,
+            code_by_id=code_by_id,
+        )
+        with self._lock:
+            # Only publish if no invalidation happened while we were reading.
+            if version == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog_cache_ttl_seconds)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_writes(session: Session, flush_context) -> None:
+    if any(isinstance(obj, CATALOG_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["catalogs_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalogs_on_commit(session: Session) -> None:
+    if session.info.pop("catalogs_changed", False):
+        catalog_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_writes(session: Session) -> None:
+    # A read after the flush may have cached codes that are now rolled back.
+    if session.info.pop("catalogs_changed", False):
+        catalog_cache.invalidate()
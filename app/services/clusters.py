@@ -0,0 +1,92 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.models import ObservationStatus
+
+WEB_MERCATOR_WORLD_METERS = 2 * 20037508.342789244
+TILE_SIZE_PX = 256
+CLUSTER_RADIUS_PX = 64
+MAX_CLUSTERS = 5000
+
+_STATUS_COLUMNS = ",\n        ".join(
+    f"count(*) FILTER (WHERE status = :status_{item.name.lower()}) AS status_{item.name.lower()}"
+    for item in ObservationStatus
+)
+
+# Points are bucketed on a Web Mercator grid whose cells are CLUSTER_RADIUS_PX wide on
+# screen, so the number of clusters only depends on the viewport, not on the data.
+_CLUSTER_SQL = text(
+    f"""
+    WITH points AS (
+        SELECT
+            o.id,
+            o.status,
+            ST_Transform(o.geom, 3857) AS geom_3857
+        FROM observations AS o
+        WHERE o.project_id = :project_id
+          AND o.deleted_at IS NULL
+          AND o.geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)
+    ),
+    cells AS (
+        SELECT
+            floor(ST_X(geom_3857) / :cell_size)::bigint AS cell_x,
+            floor(ST_Y(geom_3857) / :cell_size)::bigint AS cell_y,
+            id,
+            status,
+            geom_3857
+        FROM points
+    )
+    SELECT
+        ST_X(ST_Transform(ST_Centroid(ST_Collect(geom_3857)), 4326)) AS lon,
+        ST_Y(ST_Transform(ST_Centroid(ST_Collect(geom_3857)), 4326)) AS lat,
+        count(*) AS count,
+        CASE WHEN count(*) = 1 THEN min(id::text) END AS observation_id,
+        {_STATUS_COLUMNS}
+    FROM cells
+    GROUP BY cell_x, cell_y
+    ORDER BY count(*) DESC
+    LIMIT :max_clusters
+    """
+).bindparams(
+    *(bindparam(f"status_{item.name.lower()}", value=item.value) for item in ObservationStatus)
+)
+
+
+def cell_size_for_zoom(zoom: int) -> float:
+    """Grid cell edge, in Web Mercator meters, for the given zoom level."""
+    return WEB_MERCATOR_WORLD_METERS / (TILE_SIZE_PX * 2**zoom) * CLUSTER_RADIUS_PX
+
+
+def cluster_observations(
+    db: Session,
+    project_id: int,
+    bbox: tuple[float, float, float, float],
+    zoom: int,
+) -> list[dict]:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    rows = db.execute(
+        _CLUSTER_SQL,
+        {
+            "project_id": project_id,
+            "min_lon": min_lon,
+            "min_lat": min_lat,
+            "max_lon": max_lon,
+            "max_lat": max_lat,
+            "cell_size": cell_size_for_zoom(zoom),
+            "max_clusters": MAX_CLUSTERS,
+        },
+    ).mappings()
+    return [
+        {
+            "lon": row["lon"],
+            "lat": row["lat"],
+            "count": row["count"],
+            "observation_id": row["observation_id"],
+            "statuses": {
+                item.value: row[f"status_{item.name.lower()}"]
+                for item in ObservationStatus
+                if row[f"status_{item.name.lower()}"]
+            },
+        }
+        for row in rows
+    ]
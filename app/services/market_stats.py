@@ -0,0 +1,71 @@
+import math
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, select, text
+from sqlalchemy.orm import Session
+
+# Must match the grid baked into the observation_market_stats materialized view.
+STATS_GRID_DEGREES = 0.01
+ALL = "*"
+
+# Kept out of Base.metadata: the view is owned by its migration, not by create_all.
+stats_metadata = MetaData()
+
+observation_market_stats = Table(
+    "observation_market_stats",
+    stats_metadata,
+    Column("project_id", Integer, nullable=False),
+    Column("property_type", String(64), nullable=False),
+    Column("currency", String(16), nullable=False),
+    Column("zone", String(64), nullable=False),
+    Column("period", String(7), nullable=False),
+    Column("observations", Integer, nullable=False),
+    Column("mean", Float, nullable=False),
+    Column("p10", Float, nullable=False),
+    Column("p25", Float, nullable=False),
+    Column("median", Float, nullable=False),
+    Column("p75", Float, nullable=False),
+    Column("p90", Float, nullable=False),
+)
+
+
+def zone_for_point(lon: float, lat: float) -> str:
+    return f"{math.floor(lon / STATS_GRID_DEGREES)}:{math.floor(lat / STATS_GRID_DEGREES)}"
+
+
+def query_market_stats(
+    db: Session,
+    project_id: int,
+    *,
+    property_type: str | None = None,
+    currency: str | None = None,
+    zone: str = ALL,
+    monthly: bool = False,
+    period_from: str | None = None,
+    period_to: str | None = None,
+) -> list[dict]:
+    stats = observation_market_stats.c
+    query = (
+        select(observation_market_stats)
+        .where(stats.project_id == project_id, stats.zone == zone)
+        .order_by(stats.property_type, stats.currency, stats.period)
+    )
+    if property_type:
+        query = query.where(stats.property_type == property_type)
+    if currency:
+        query = query.where(stats.currency == currency)
+    if monthly:
+        query = query.where(stats.period != ALL)
+        if period_from:
+            query = query.where(stats.period >= period_from)
+        if period_to:
+            query = query.where(stats.period <= period_to)
+    else:
+        query = query.where(stats.period == ALL)
+    return [dict(row) for row in db.execute(query).mappings()]
+
+
+def refresh_market_stats(db: Session, *, concurrently: bool = True) -> None:
+    # CONCURRENTLY keeps the view readable during the refresh (needs the unique index).
+    mode = "CONCURRENTLY " if concurrently else ""
+    db.execute(text(f"REFRESH MATERIALIZED VIEW {mode}observation_market_stats"))
+    db.commit()
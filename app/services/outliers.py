@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+import numpy as np
+from sqlalchemy import Float, cast, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Observation, ObservationStatus, ObservationStatusHistory
+from app.services.read_model import refresh_read_rows
+from app.services.tiles import touch_observation_tiles
+from app.services.versions import bump_data_version
+
+# Reviewed (completado) observations are left alone; a human already vouched for them.
+ELIGIBLE_STATUSES = (ObservationStatus.CARGADO, ObservationStatus.POSICIONADO, ObservationStatus.REVISION)
+STREAM_BATCH_SIZE = 50_000
+WRITE_BATCH_SIZE = 5_000
+MAD_SCALE = 1.4826
+
+
+class OutlierMethod(str, Enum):
+    IQR = "iqr"
+    MAD = "mad"
+
+
+@dataclass
+class OutlierReport:
+    scanned: int
+    groups: int
+    flagged: int
+    updated: int
+    dry_run: bool
+
+
+def _load_prices(db: Session, project_id: int, zone_size: float | None) -> dict[str, np.ndarray]:
+    columns = [
+        Observation.id,
+        Observation.status,
+        Observation.property_type_id,
+        func.coalesce(Observation.currency_id, -1),
+        cast(Observation.market_value_total / Observation.surface_total, Float),
+    ]
+    if zone_size:
+        columns += [
+            func.floor(func.ST_X(Observation.geom) / zone_size),
+            func.floor(func.ST_Y(Observation.geom) / zone_size),
+        ]
+    query = (
+        select(*columns)
+        .where(
+            Observation.project_id == project_id,
+            Observation.deleted_at.is_(None),
+            Observation.market_value_total.is_not(None),
+            Observation.surface_total > 0,
+        )
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+    chunks: list[tuple] = []
+    for partition in db.execute(query).partitions():
+        chunks.append(tuple(zip(*partition)))
+    if not chunks:
+        return {}
+
+    def column(index: int, dtype=None) -> np.ndarray:
+        return np.concatenate([np.asarray(chunk[index], dtype=dtype) for chunk in chunks])
+
+    keys = [column(2, np.int64), column(3, np.int64)]
+    if zone_size:
+        # Observations without geometry share a "no zone" bucket.
+        no_zone = np.iinfo(np.int64).min
+        keys += [np.nan_to_num(column(index, np.float64), nan=no_zone).astype(np.int64) for index in (5, 6)]
+    return {
+        "ids": column(0, object),
+        "statuses": np.asarray([status.value for chunk in chunks for status in chunk[1]]),
+        "keys": np.stack(keys, axis=1),
+        "prices": column(4, np.float64),
+    }
+
+
+def _group_quantile(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    position = q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    fraction = position - lower
+    return sorted_values[starts + lower] * (1 - fraction) + sorted_values[starts + upper] * fraction
+
+
+def _grouped_sort(groups: np.ndarray, values: np.ndarray, group_count: int):
+    order = np.lexsort((values, groups))
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return values[order], starts, counts
+
+
+def flag_outliers(
+    groups: np.ndarray,
+    values: np.ndarray,
+    *,
+    method: OutlierMethod,
+    threshold: float,
+    min_group_size: int,
+) -> np.ndarray:
+    """Boolean mask of values that are outliers within their group."""
+    group_count = int(groups.max()) + 1 if groups.size else 0
+    sorted_values, starts, counts = _grouped_sort(groups, values, group_count)
+    usable = counts >= max(min_group_size, 1)
+    safe_counts = np.maximum(counts, 1)
+
+    if method == OutlierMethod.IQR:
+        q1 = _group_quantile(sorted_values, starts, safe_counts, 0.25)
+        q3 = _group_quantile(sorted_values, starts, safe_counts, 0.75)
+        spread = q3 - q1
+        low, high = q1 - threshold * spread, q3 + threshold * spread
+        mask = (values < low[groups]) | (values > high[groups])
+    else:
+        median = _group_quantile(sorted_values, starts, safe_counts, 0.5)
+        deviations = np.abs(values - median[groups])
+        sorted_deviations, _, _ = _grouped_sort(groups, deviations, group_count)
+        mad = _group_quantile(sorted_deviations, starts, safe_counts, 0.5) * MAD_SCALE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = deviations / mad[groups]
+        spread = mad
+        mask = score > threshold
+
+    # Degenerate groups (all prices equal) have no spread to measure against.
+    return mask & usable[groups] & (spread[groups] > 0)
+
+
+def detect_outliers(
+    db: Session,
+    project_id: int,
+    *,
+    method: OutlierMethod = OutlierMethod.MAD,
+    threshold: float = 3.5,
+    min_group_size: int = 8,
+    zone_size: float | None = None,
+    log_scale: bool = True,
+    changed_by: int | None = None,
+    dry_run: bool = False,
+) -> OutlierReport:
+    """Flag price-per-m2 outliers per property type, currency and optional grid zone."""
+    data = _load_prices(db, project_id, zone_size)
+    if not data:
+        return OutlierReport(scanned=0, groups=0, flagged=0, updated=0, dry_run=dry_run)
+
+    _, groups = np.unique(data["keys"], axis=0, return_inverse=True)
+    groups = groups.reshape(-1)
+    prices = data["prices"]
+    values = np.log(np.maximum(prices, np.finfo(np.float64).tiny)) if log_scale else prices
+
+    mask = flag_outliers(groups, values, method=method, threshold=threshold, min_group_size=min_group_size)
+    eligible = np.isin(data["statuses"], [status.value for status in ELIGIBLE_STATUSES])
+    to_update = np.flatnonzero(mask & eligible)
+
+    report = OutlierReport(
+        scanned=int(prices.size),
+        groups=int(groups.max()) + 1,
+        flagged=int(mask.sum()),
+        updated=int(to_update.size),
+        dry_run=dry_run,
+    )
+    if dry_run or not to_update.size:
+        return report
+
+    now = datetime.utcnow()
+    report.updated = 0
+    change_seq = bump_data_version(db, project_id)
+    for start in range(0, to_update.size, WRITE_BATCH_SIZE):
+        ids = data["ids"][to_update[start : start + WRITE_BATCH_SIZE]].tolist()
+        # Statuses may have changed since the scan: only rows that are still eligible are
+        # flagged, and their history records the status they actually had.
+        guards = (
+            Observation.project_id == project_id,
+            Observation.id.in_(ids),
+            Observation.status.in_(ELIGIBLE_STATUSES),
+            Observation.deleted_at.is_(None),
+        )
+        current = select(Observation.id, Observation.status).where(*guards)
+        if db.get_bind().dialect.name == "postgresql":
+            current = current.with_for_update()
+        from_statuses = dict(db.execute(current).all())
+        if not from_statuses:
+            continue
+        updated = db.scalars(
+            update(Observation)
+            .where(*guards)
+            .values(
+                status=ObservationStatus.OUTLIER,
+                is_outlier=True,
+                updated_at=now,
+                updated_by=changed_by,
+                change_seq=change_seq,
+            )
+            .returning(Observation.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.execute(
+            insert(ObservationStatusHistory),
+            [
+                {
+                    "project_id": project_id,
+                    "observation_id": observation_id,
+                    "from_status": from_statuses[observation_id],
+                    "to_status": ObservationStatus.OUTLIER,
+                    "changed_by": changed_by,
+                    "reason": f"outlier detection ({method.value})",
+                    "changed_at": now,
+                }
+                for observation_id in updated
+            ],
+        )
+        refresh_read_rows(db, project_id, updated)
+        touch_observation_tiles(db, project_id, change_seq, updated)
+        report.updated += len(updated)
+    db.commit()
+    return report
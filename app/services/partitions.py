@@ -0,0 +1,62 @@
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+# Must match the modulus baked into migrations 20261018_0008 and 20261018_0009.
+OBSERVATION_PARTITIONS = 16
+PARTITIONED_TABLES = (
+    "observations",
+    "observation_location",
+    "observation_building",
+    "observation_rural",
+    "observation_read",
+)
+
+
+def partition_name(table: str, remainder: int) -> str:
+    return f"{table}_p{remainder:02d}"
+
+
+def partition_remainder(db: Session, project_id: int) -> int:
+    """Hash partition that holds (or will hold) a project's rows; computed, so it works for empty projects."""
+    return db.scalar(
+        text(
+            "SELECT remainder FROM generate_series(0, :modulus - 1) AS remainder "
+            "WHERE satisfies_hash_partition(CAST('observations' AS regclass), :modulus, remainder, :project_id)"
+        ),
+        {"modulus": OBSERVATION_PARTITIONS, "project_id": project_id},
+    )
+
+
+def partition_stats(db: Session, table: str = "observations") -> list[dict]:
+    rows = db.execute(
+        text(
+            """
+            SELECT
+                child.relname AS partition,
+                greatest(child.reltuples, 0)::bigint AS estimated_rows,
+                pg_total_relation_size(child.oid) AS total_bytes,
+                coalesce(stats.n_dead_tup, 0) AS dead_rows,
+                stats.last_autovacuum
+            FROM pg_inherits AS inherits
+            JOIN pg_class AS child ON child.oid = inherits.inhrelid
+            LEFT JOIN pg_stat_user_tables AS stats ON stats.relid = child.oid
+            WHERE inherits.inhparent = CAST(:table AS regclass)
+            ORDER BY child.relname
+            """
+        ),
+        {"table": table},
+    ).mappings()
+    return [dict(row) for row in rows]
+
+
+def vacuum_project(engine: Engine, project_id: int, *, full: bool = False) -> list[str]:
+    """VACUUM ANALYZE only the partitions a project lives in, across every partitioned table."""
+    with Session(engine) as db:
+        remainder = partition_remainder(db, project_id)
+    partitions = [partition_name(table, remainder) for table in PARTITIONED_TABLES]
+    options = "FULL, ANALYZE" if full else "ANALYZE"
+    # VACUUM cannot run inside a transaction block.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for partition in partitions:
+            conn.execute(text(f"VACUUM ({options}) {partition}"))
+    return partitions
@@ -0,0 +1,290 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, event, inspect, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.responses import dumps
+from app.models import (
+    CatalogConservationState,
+    CatalogCurrency,
+    CatalogDestination,
+    CatalogLegalStatus,
+    CatalogPropertyType,
+    CatalogValueOrigin,
+    Observation,
+    ObservationBuilding,
+    ObservationLocation,
+    ObservationReadRow,
+)
+from app.services.catalogs import CATALOG_MODELS, catalog_cache
+from app.services.tiles import touch_observation_tiles
+from app.services.versions import bump_data_version
+
+REBUILD_BATCH_SIZE = 1000
+
+_CHILD_LOADERS = (
+    selectinload(Observation.location),
+    selectinload(Observation.building),
+    selectinload(Observation.rural),
+)
+
+# Catalog foreign keys whose codes are copied into the stored documents.
+_CATALOG_REFERENCES = {
+    CatalogPropertyType: Observation.property_type_id,
+    CatalogCurrency: Observation.currency_id,
+    CatalogValueOrigin: Observation.value_origin_id,
+    CatalogLegalStatus: ObservationLocation.legal_status_id,
+    CatalogConservationState: ObservationBuilding.conservation_state_id,
+    CatalogDestination: ObservationBuilding.destination_id,
+}
+
+
+def resolve_catalog_codes(db: Session, observations: list[Observation]) -> dict[type, dict[int, str]]:
+    locations = [item.location for item in observations if item.location]
+    buildings = [item.building for item in observations if item.building]
+    return {
+        CatalogPropertyType: catalog_cache.codes_for_ids(
+            db, CatalogPropertyType, (item.property_type_id for item in observations)
+        ),
+        CatalogCurrency: catalog_cache.codes_for_ids(db, CatalogCurrency, (item.currency_id for item in observations)),
+        CatalogValueOrigin: catalog_cache.codes_for_ids(
+            db, CatalogValueOrigin, (item.value_origin_id for item in observations)
+        ),
+        CatalogLegalStatus: catalog_cache.codes_for_ids(
+            db, CatalogLegalStatus, (item.legal_status_id for item in locations)
+        ),
+        CatalogConservationState: catalog_cache.codes_for_ids(
+            db, CatalogConservationState, (item.conservation_state_id for item in buildings)
+        ),
+        CatalogDestination: catalog_cache.codes_for_ids(
+            db, CatalogDestination, (item.destination_id for item in buildings)
+        ),
+    }
+
+
+def observation_row(observation: Observation, codes: dict[type, dict[int, str]]) -> dict:
+    """ObservationRead-shaped plain dict, the payload stored in observation_read.document."""
+    property_type_code = codes[CatalogPropertyType].get(observation.property_type_id)
+    currency_code = codes[CatalogCurrency].get(observation.currency_id)
+    value_origin_code = codes[CatalogValueOrigin].get(observation.value_origin_id)
+
+    location = None
+    if observation.location:
+        location = {
+            "padron": observation.location.padron,
+            "neighborhood_type_code": observation.location.neighborhood_type_code,
+            "shape_type_code": observation.location.shape_type_code,
+            "block_position_code": observation.location.block_position_code,
+            "legal_status_code": codes[CatalogLegalStatus].get(observation.location.legal_status_id),
+            "affectation_code": observation.location.affectation_code,
+        }
+
+    building = None
+    if observation.building:
+        building = {
+            "built_surface_total": observation.building.built_surface_total,
+            "warehouse_surface": observation.building.warehouse_surface,
+            "front_meters": observation.building.front_meters,
+            "conservation_state_code": codes[CatalogConservationState].get(
+                observation.building.conservation_state_id
+            ),
+            "destination_code": codes[CatalogDestination].get(observation.building.destination_id),
+            "construction_category_code": observation.building.construction_category_code,
+            "bedrooms_count": observation.building.bedrooms_count,
+            "bathrooms_count": observation.building.bathrooms_count,
+            "garage_count": observation.building.garage_count,
+            "floors_count": observation.building.floors_count,
+            "has_pool": observation.building.has_pool,
+            "antiquity_year": observation.building.antiquity_year,
+        }
+
+    rural = None
+    if observation.rural:
+        rural = {
+            "main_use_code": observation.rural.main_use_code,
+            "sugarcane_surface": observation.rural.sugarcane_surface,
+            "citrus_surface": observation.rural.citrus_surface,
+            "grains_surface": observation.rural.grains_surface,
+            "forest_surface": observation.rural.forest_surface,
+            "other_crops_surface": observation.rural.other_crops_surface,
+            "has_irrigation": observation.rural.has_irrigation,
+            "irrigation_type_code": observation.rural.irrigation_type_code,
+            "irrigated_surface": observation.rural.irrigated_surface,
+            "irrigation_concession_type_code": observation.rural.irrigation_concession_type_code,
+            "has_extraordinary_improvements": observation.rural.has_extraordinary_improvements,
+            "has_rural_improvements": observation.rural.has_rural_improvements,
+        }
+
+    return {
+        "id": observation.id,
+        "project_id": observation.project_id,
+        "property_type": property_type_code,
+        "status": observation.status.value,
+        "price": observation.market_value_total,
+        "currency": currency_code,
+        "valuation_date": observation.valuation_date,
+        "unit_land_value": observation.unit_land_value,
+        "surface_total": observation.surface_total,
+        "surface_unit": observation.surface_unit,
+        "value_origin_code": value_origin_code,
+        "external_uuid": observation.external_uuid,
+        "legacy_fid": observation.legacy_fid,
+        "extras": observation.extras or {},
+        "location": location,
+        "building": building,
+        "rural": rural,
+        "created_at": observation.created_at,
+        "updated_at": observation.updated_at,
+    }
+
+
+def read_values(row: dict, geom: str | None) -> dict:
+    return {
+        "project_id": row["project_id"],
+        "id": row["id"],
+        "status": row["status"],
+        "property_type": row["property_type"],
+        "price": row["price"],
+        "valuation_date": row["valuation_date"],
+        "surface_total": row["surface_total"],
+        "created_at": row["created_at"],
+        "geom": geom,
+        "document": dumps(row).decode(),
+    }
+
+
+def upsert_read_rows(db: Session, values: list[dict]) -> None:
+    if not values:
+        return
+    table = ObservationReadRow.__table__
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.id],
+        set_={key: statement.excluded[key] for key in values[0] if key not in ("project_id", "id")},
+    )
+    db.execute(statement, values)
+
+
+def delete_read_rows(db: Session, project_id: int, observation_ids: Iterable[UUID]) -> None:
+    observation_ids = list(observation_ids)
+    if observation_ids:
+        db.execute(
+            delete(ObservationReadRow).where(
+                ObservationReadRow.project_id == project_id, ObservationReadRow.id.in_(observation_ids)
+            )
+        )
+
+
+def refresh_read_rows(db: Session, project_id: int, observation_ids: Iterable[UUID]) -> dict[UUID, dict]:
+    """Re-render the projection for observations written in the current transaction.
+
+    Returns the rendered rows by id, soft-deleted ones included; those lose their read row.
+    """
+    observation_ids = set(observation_ids)
+    if not observation_ids:
+        return {}
+    observations = db.scalars(
+        select(Observation)
+        .options(*_CHILD_LOADERS)
+        .where(Observation.project_id == project_id, Observation.id.in_(observation_ids))
+        .execution_options(populate_existing=True)
+    ).all()
+    codes = resolve_catalog_codes(db, list(observations))
+    rows = {observation.id: observation_row(observation, codes) for observation in observations}
+    live = [item for item in observations if item.deleted_at is None]
+    delete_read_rows(db, project_id, observation_ids - {item.id for item in live})
+    upsert_read_rows(db, [read_values(rows[item.id], item.geom) for item in live])
+    return rows
+
+
+def rebuild_read_model(db: Session, project_id: int | None = None, *, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """Re-render observation_read from the base tables; the caller commits.
+
+    It runs as one transaction, so readers keep the old projection until the commit.
+    """
+    scope = [] if project_id is None else [Observation.project_id == project_id]
+    read_scope = [] if project_id is None else [ObservationReadRow.project_id == project_id]
+    db.execute(delete(ObservationReadRow).where(*read_scope))
+    written = 0
+    last_key = None
+    while True:
+        query = (
+            select(Observation)
+            .options(*_CHILD_LOADERS)
+            .where(*scope, Observation.deleted_at.is_(None))
+            .order_by(Observation.project_id, Observation.id)
+            .limit(batch_size)
+        )
+        if last_key is not None:
+            query = query.where(tuple_(Observation.project_id, Observation.id) > last_key)
+        observations = list(db.scalars(query).all())
+        if not observations:
+            return written
+        codes = resolve_catalog_codes(db, observations)
+        upsert_read_rows(db, [read_values(observation_row(item, codes), item.geom) for item in observations])
+        written += len(observations)
+        last_key = (observations[-1].project_id, observations[-1].id)
+        db.expunge_all()
+
+
+def _referencing(db: Session, model: type, catalog_ids: set[int]) -> set[tuple[int, UUID]]:
+    column = _CATALOG_REFERENCES[model]
+    entity = column.class_
+    key = entity.id if entity is Observation else entity.observation_id
+    return {tuple(row) for row in db.execute(select(entity.project_id, key).where(column.in_(catalog_ids)))}
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_recoded_catalogs(session: Session, flush_context, instances) -> None:
+    # Runs before the flush so deleted catalog rows can still be matched (their
+    # references are SET NULL or rejected by the database).
+    changed = defaultdict(set)
+    for obj in session.dirty:
+        if isinstance(obj, CATALOG_MODELS) and inspect(obj).attrs.code.history.has_changes():
+            changed[type(obj)].add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, CATALOG_MODELS):
+            changed[type(obj)].add(obj.id)
+    if not changed:
+        return
+    stale = session.info.setdefault("read_rows_stale", set())
+    with session.no_autoflush:
+        for model, catalog_ids in changed.items():
+            stale |= _referencing(session, model, catalog_ids)
+    # Only sessions that recode a catalog pay for the re-render hook.
+    if not event.contains(session, "after_flush_postexec", _rerender_recoded_catalogs):
+        event.listen(session, "after_flush_postexec", _rerender_recoded_catalogs)
+
+
+def _rerender_recoded_catalogs(session: Session, flush_context) -> None:
+    # After the flush, so the documents get the codes this transaction wrote.
+    stale = session.info.pop("read_rows_stale", None)
+    if not stale:
+        return
+    catalog_cache.invalidate()
+    by_project = defaultdict(set)
+    for project_id, observation_id in stale:
+        by_project[project_id].add(observation_id)
+    for project_id in sorted(by_project):
+        observation_ids = by_project[project_id]
+        change_seq = bump_data_version(session, project_id)
+        # The documents change, so /changes must hand them out again.
+        session.execute(
+            update(Observation)
+            .where(Observation.project_id == project_id, Observation.id.in_(observation_ids))
+            .values(change_seq=change_seq)
+            .execution_options(synchronize_session=False)
+        )
+        refresh_read_rows(session, project_id, observation_ids)
+        # Tiles carry the property type code.
+        touch_observation_tiles(session, project_id, change_seq, observation_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_recoded_catalogs(session: Session) -> None:
+    session.info.pop("read_rows_stale", None)
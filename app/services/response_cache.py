@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+
+from app.core.cache_backends import MemoryBackend, RedisBackend, offload, shared_backend
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: bytes | None = None
+        self.error: BaseException | None = None
+
+
+class ResponseCache:
+    """Rendered response bodies keyed by caller-built keys that embed the data version.
+
+    Concurrent misses for one key are coalesced: the first caller renders, the rest
+    wait for its result instead of running the same queries. Coalescing is per process;
+    with the Redis backend the rendered bodies are shared by every worker.
+    """
+
+    def __init__(self, backend: MemoryBackend | RedisBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        value = self.backend.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.backend.set(key, flight.value)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def get_or_compute_async(self, key: str, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        value = await offload(self.backend, self.backend.get, key)
+        if value is not None:
+            return value
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await compute()
+            await offload(self.backend, self.backend.set, key, value)
+            flight.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exc:
+            flight.set_exception(exc)
+            flight.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._async_flights[key]
+
+    def stats(self) -> dict[str, int]:
+        return {**self.backend.stats(), "coalesced": self.coalesced}
+
+
+response_cache = ResponseCache(shared_backend)
@@ -0,0 +1,220 @@
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import Table, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import ARCHIVE_TABLES, Observation, ObservationStatus, ObservationStatusHistory, ProjectDataVersion
+from app.services.read_model import refresh_read_rows
+from app.services.tiles import touch_observation_tiles
+from app.services.versions import bump_data_version
+
+_observations_archive = ARCHIVE_TABLES[Observation.__table__]
+
+
+@dataclass
+class ArchiveReport:
+    batches: int
+    observations: int
+    rows: int
+
+
+def retention_cutoff(days: int | None = None) -> datetime:
+    return datetime.utcnow() - timedelta(days=settings.observation_retention_days if days is None else days)
+
+
+def _key(table: Table):
+    # Child and history rows are matched on the observation they belong to.
+    return tuple_(table.c.project_id, table.c.observation_id if "observation_id" in table.c else table.c.id)
+
+
+def _move(db: Session, keys: list[tuple[int, UUID]], pairs: list[tuple[Table, Table]], archived_at=None) -> int:
+    """Copy every row of ``keys`` from each source to its target, then delete the sources.
+
+    ``pairs`` go parents first; deletes run in reverse so foreign keys never block them.
+    """
+    moved = 0
+    for source, target in pairs:
+        columns = [column for column in source.c if column.name in target.c]
+        values = list(columns)
+        if archived_at is not None:
+            values.append(literal(archived_at, target.c.archived_at.type))
+        names = [column.name for column in columns] + (["archived_at"] if archived_at is not None else [])
+        result = db.execute(insert(target).from_select(names, select(*values).where(_key(source).in_(keys))))
+        moved += result.rowcount
+    for source, _ in reversed(pairs):
+        db.execute(delete(source).where(_key(source).in_(keys)))
+    return moved
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> tuple[list[tuple[int, UUID]], int]:
+    """Move one batch of purgeable observations and their rows to the archive and commit.
+
+    Each batch is its own short transaction, so an interrupted run loses nothing and the
+    next run resumes with whatever is still old enough.
+    """
+    purgeable = (Observation.deleted_at < cutoff, Observation.status == ObservationStatus.ELIMINADO)
+    candidates = db.execute(
+        select(Observation.project_id, Observation.id)
+        .where(*purgeable)
+        .order_by(Observation.deleted_at)
+        .limit(batch_size)
+    ).all()
+    if not candidates:
+        db.rollback()
+        return [], 0
+    # /changes no longer lists these deletions, so the projects' data versions must move. They
+    # are taken before the row locks, in project order, like every other writer takes them.
+    for project_id in sorted({project_id for project_id, _ in candidates}):
+        bump_data_version(db, project_id)
+    query = select(Observation.project_id, Observation.id).where(
+        *purgeable, tuple_(Observation.project_id, Observation.id).in_([tuple(row) for row in candidates])
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # Rows a concurrent writer holds are left for the next batch instead of waiting on them.
+        query = query.with_for_update(skip_locked=True)
+    keys = [tuple(row) for row in db.execute(query).all()]
+    if not keys:
+        db.rollback()
+        return [], 0
+    # Their deletions leave /changes for good, so tokens from before them must resync.
+    watermarks = db.execute(
+        select(Observation.project_id, func.max(Observation.change_seq))
+        .where(_key(Observation.__table__).in_(keys))
+        .group_by(Observation.project_id)
+    ).all()
+    for project_id, change_seq in watermarks:
+        db.execute(
+            update(ProjectDataVersion)
+            .where(ProjectDataVersion.project_id == project_id, ProjectDataVersion.archived_seq < change_seq)
+            .values(archived_seq=change_seq)
+        )
+    moved = _move(db, keys, list(ARCHIVE_TABLES.items()), archived_at=datetime.utcnow())
+    db.commit()
+    return keys, moved
+
+
+def archive_deleted_observations(
+    db: Session,
+    *,
+    cutoff: datetime | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    pause_seconds: float = 0,
+) -> ArchiveReport:
+    cutoff = cutoff or retention_cutoff()
+    batch_size = batch_size or settings.archive_batch_size
+    report = ArchiveReport(batches=0, observations=0, rows=0)
+    while max_batches is None or report.batches < max_batches:
+        keys, moved = archive_batch(db, cutoff, batch_size)
+        if not keys:
+            break
+        report.batches += 1
+        report.observations += len(keys)
+        report.rows += moved
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return report
+
+
+def count_purgeable(db: Session, cutoff: datetime) -> int:
+    return db.scalar(
+        select(func.count())
+        .select_from(Observation)
+        .where(Observation.deleted_at < cutoff, Observation.status == ObservationStatus.ELIMINADO)
+    )
+
+
+def _undelete(
+    db: Session, project_id: int, keys: list[tuple[int, UUID]], changed_by: int | None, change_seq: int
+) -> None:
+    # Back to the status they had before the delete, as recorded in their history.
+    history = ObservationStatusHistory
+    previous_status = (
+        select(history.from_status)
+        .where(
+            history.project_id == Observation.project_id,
+            history.observation_id == Observation.id,
+            history.to_status == ObservationStatus.ELIMINADO,
+        )
+        .order_by(history.changed_at.desc(), history.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    now = datetime.utcnow()
+    db.execute(
+        update(Observation)
+        .where(_key(Observation.__table__).in_(keys))
+        .values(
+            deleted_at=None,
+            status=func.coalesce(previous_status, ObservationStatus.CARGADO),
+            updated_by=changed_by,
+            updated_at=now,
+            change_seq=change_seq,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        insert(history),
+        [
+            {
+                "project_id": project_id,
+                "observation_id": observation_id,
+                "from_status": ObservationStatus.ELIMINADO,
+                "to_status": status,
+                "changed_by": changed_by,
+                "reason": "restore",
+                "changed_at": now,
+            }
+            for observation_id, status in db.execute(
+                select(Observation.id, Observation.status).where(_key(Observation.__table__).in_(keys))
+            )
+        ],
+    )
+    observation_ids = [observation_id for _, observation_id in keys]
+    refresh_read_rows(db, project_id, observation_ids)
+    touch_observation_tiles(db, project_id, change_seq, observation_ids)
+
+
+def restore_observations(
+    db: Session,
+    project_id: int,
+    observation_ids: Iterable[UUID] | None = None,
+    *,
+    undelete: bool = False,
+    changed_by: int | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Move archived observations of a project back; returns how many.
+
+    They come back soft-deleted, exactly as archived, unless ``undelete`` is set. Left
+    deleted, the next purge archives them again once they are past the retention age.
+    """
+    batch_size = batch_size or settings.archive_batch_size
+    query = select(_observations_archive.c.project_id, _observations_archive.c.id).where(
+        _observations_archive.c.project_id == project_id
+    )
+    if observation_ids is not None:
+        query = query.where(_observations_archive.c.id.in_(list(observation_ids)))
+    pairs = [(archive, live) for live, archive in ARCHIVE_TABLES.items()]
+    restored = 0
+    while keys := [tuple(row) for row in db.execute(query.limit(batch_size)).all()]:
+        change_seq = bump_data_version(db, project_id)
+        _move(db, keys, pairs)
+        if undelete:
+            _undelete(db, project_id, keys, changed_by, change_seq)
+        else:
+            # Back as tombstones, which /changes must hand out again to clients past the purge.
+            db.execute(
+                update(Observation)
+                .where(_key(Observation.__table__).in_(keys))
+                .values(updated_at=datetime.utcnow(), change_seq=change_seq)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        restored += len(keys)
+    return restored
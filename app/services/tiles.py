@@ -0,0 +1,138 @@
+import math
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models import Observation, TileCellVersion
+from app.models.types import parse_point_ewkt
+
+MAX_ZOOM = 22
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+# Writes are recorded per tile of this zoom (about 2.4 km wide at the equator). Deeper tiles
+# follow their one enclosing cell; shallower ones the newest of the cells they cover.
+CELL_ZOOM = 14
+
+# The envelope is transformed back to 4326 so the filter can use the GiST index on geom.
+# observation_read holds only live rows with the property type code inlined, so no joins.
+_TILE_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom_3857
+    ),
+    features AS (
+        SELECT
+            ST_AsMVTGeom(ST_Transform(o.geom, 3857), bounds.geom_3857, :extent, :buffer, true) AS geom,
+            o.id::text AS id,
+            o.status AS status,
+            o.property_type AS property_type
+        FROM observation_read AS o
+        CROSS JOIN bounds
+        WHERE o.project_id = :project_id
+          AND o.geom && ST_Transform(bounds.geom_3857, 4326)
+    )
+    SELECT ST_AsMVT(features, 'observations', :extent, 'geom') FROM features
+    """
+)
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def tile_for_point(lon: float, lat: float, z: int) -> tuple[int, int]:
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    n = 2**z
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def render_tile(db: Session, project_id: int, z: int, x: int, y: int) -> bytes:
+    tile = db.scalar(
+        _TILE_SQL,
+        {"project_id": project_id, "z": z, "x": x, "y": y, "extent": TILE_EXTENT, "buffer": TILE_BUFFER},
+    )
+    return bytes(tile or b"")
+
+
+def touch_tiles(db: Session, project_id: int, version: int, geoms: Iterable[str | None]) -> None:
+    """Record, in the caller's write transaction, that tiles around these points changed."""
+    cells = {tile_for_point(*point, CELL_ZOOM) for point in map(parse_point_ewkt, geoms) if point}
+    if not cells:
+        return
+    table = TileCellVersion.__table__
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.x, table.c.y], set_={"version": statement.excluded.version}
+    )
+    db.execute(
+        statement, [{"project_id": project_id, "x": x, "y": y, "version": version} for x, y in sorted(cells)]
+    )
+
+
+def touch_observation_tiles(db: Session, project_id: int, version: int, observation_ids: Iterable[UUID]) -> None:
+    """``touch_tiles`` for writes that only know which observations they changed."""
+    observation_ids = list(observation_ids)
+    if observation_ids:
+        geoms = db.scalars(
+            select(Observation.geom).where(Observation.project_id == project_id, Observation.id.in_(observation_ids))
+        )
+        touch_tiles(db, project_id, version, geoms)
+
+
+def tile_version(db: Session, project_id: int, z: int, x: int, y: int) -> int:
+    """Newest write version among the cells a tile covers; 0 when none was written."""
+    if z >= CELL_ZOOM:
+        shift = z - CELL_ZOOM
+        x_range, y_range = (x >> shift, x >> shift), (y >> shift, y >> shift)
+    else:
+        shift = CELL_ZOOM - z
+        x_range, y_range = (x << shift, ((x + 1) << shift) - 1), (y << shift, ((y + 1) << shift) - 1)
+    version = db.scalar(
+        select(func.max(TileCellVersion.version)).where(
+            TileCellVersion.project_id == project_id,
+            TileCellVersion.x.between(*x_range),
+            TileCellVersion.y.between(*y_range),
+        )
+    )
+    return version or 0
+
+
+class TileCache:
+    """Rendered tiles keyed by (project, tile version, z, x, y).
+
+    The version comes from ``tile_version``, so a write retires only the tiles around the points
+    it touched, whichever worker or CLI job made it; older entries age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None, max_bytes: int | None = None):
+        self._tiles = LRUCache(max_entries, ttl_seconds=ttl_seconds, max_weight=max_bytes, weigher=len)
+
+    def get(self, project_id: int, version: int, z: int, x: int, y: int) -> bytes | None:
+        return self._tiles.get((project_id, version, z, x, y))
+
+    def put(self, project_id: int, version: int, z: int, x: int, y: int, tile: bytes) -> None:
+        self._tiles.set((project_id, version, z, x, y), tile)
+
+    def clear(self) -> None:
+        self._tiles.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._tiles.stats()
+
+
+tile_cache = TileCache(
+    max_entries=settings.tile_cache_max_entries,
+    ttl_seconds=settings.tile_cache_ttl_seconds,
+    max_bytes=settings.tile_cache_max_bytes,
+)
@@ -0,0 +1,49 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import MembershipVersion, ProjectDataVersion
+
+
+def bump_data_version(db: Session, project_id: int) -> int:
+    """Advance the project's data version inside the caller's write transaction.
+
+    The upsert keeps the version row locked until commit, so writes to one project are
+    serialized and versions become visible in commit order. Call it before touching
+    observation rows so every writer takes its locks in the same order.
+    """
+    table = ProjectDataVersion.__table__
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table).values(project_id=project_id, version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.project_id], set_={"version": table.c.version + 1}
+    ).returning(table.c.version)
+    return db.scalar(statement)
+
+
+def data_version(db: Session, project_id: int) -> str:
+    """Changes whenever anything a project read returns may have changed.
+
+    It is read from the database, so every worker and every CLI write agrees on it.
+    """
+    version = db.scalar(select(ProjectDataVersion.version).where(ProjectDataVersion.project_id == project_id))
+    return str(version or 0)
+
+
+def archived_seq(db: Session, project_id: int) -> int:
+    return db.scalar(select(ProjectDataVersion.archived_seq).where(ProjectDataVersion.project_id == project_id)) or 0
+
+
+# The one membership_versions row.
+_MEMBERSHIPS = 1
+
+memberships_version_query = select(MembershipVersion.version).where(MembershipVersion.id == _MEMBERSHIPS)
+
+
+def bump_memberships_version(db: Session) -> None:
+    """Advance the version GET /projects is cached under, inside the caller's transaction."""
+    table = MembershipVersion.__table__
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table).values(id=_MEMBERSHIPS, version=1)
+    db.execute(statement.on_conflict_do_update(index_elements=[table.c.id], set_={"version": table.c.version + 1}))
@@ -17,7 +17,7 @@ BEGIN
     FROM pg_class c
     INNER JOIN pg_namespace n ON n.oid = c.relnamespace
     INNER JOIN pg_attribute a ON a.attrelid = c.oid
-    WHERE c.relkind = 'r'
+    WHERE c.relkind IN ('r', 'p')
       AND n.nspname = 'public'
       AND a.attname = 'project_id'
       AND a.attnum > 0
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.middleware import PROJECT_ID_EXEMPT_PATHS, ProjectScopeMiddleware
+
+
+async def _legacy_require_project_id(request: Request, call_next):
+    # The BaseHTTPMiddleware version this middleware replaced.
+    if request.url.path not in PROJECT_ID_EXEMPT_PATHS:
+        project_id = request.headers.get("X-Project-Id")
+        if not project_id:
+            return JSONResponse(status_code=400, content={"detail": "Missing X-Project-Id header"})
+        if not project_id.isdigit():
+            return JSONResponse(status_code=400, content={"detail": "X-Project-Id must be numeric"})
+        request.state.active_project_id = int(project_id)
+    return await call_next(request)
+
+
+def _build(kind: str) -> FastAPI:
+    app = FastAPI()
+    if kind == "base_http":
+        app.middleware("http")(_legacy_require_project_id)
+    elif kind == "asgi":
+        app.add_middleware(ProjectScopeMiddleware)
+
+    @app.get("/projects/{project_id}/ping")
+    async def ping(project_id: int) -> dict:
+        return {"project_id": project_id}
+
+    return app
+
+
+async def _rps(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"X-Project-Id": "1"}
+        queue = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in queue:
+                await client.get("/projects/1/ping", headers=headers)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+def run(requests: int, concurrency: int) -> None:
+    for kind in ("none", "base_http", "asgi"):
+        rps = asyncio.run(_rps(_build(kind), requests, concurrency))
+        print(f"{kind:>10}: {rps:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare in-process RPS of the tenant middleware implementations.")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency)
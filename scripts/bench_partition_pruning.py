@@ -0,0 +1,55 @@
+import argparse
+import json
+import statistics
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.api.routes.observations import list_query
+from app.core.config import settings
+from app.models import Observation
+
+
+def _scanned_relations(plan: dict) -> set[str]:
+    relations = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        relations |= _scanned_relations(child)
+    return relations
+
+
+def _explain(db: Session, sql: str, pruning: bool) -> tuple[float, int]:
+    db.execute(text(f"SET enable_partition_pruning = {'on' if pruning else 'off'}"))
+    document = db.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    plan = (json.loads(document) if isinstance(document, str) else document)[0]
+    return plan["Execution Time"], len(_scanned_relations(plan["Plan"]))
+
+
+def run(database_url: str, project_id: int | None, limit: int, repeat: int) -> None:
+    engine = create_engine(database_url, future=True)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Partition pruning is PostgreSQL-only; pass a postgresql+psycopg URL")
+    with Session(engine) as db:
+        if project_id is None:
+            project_id = db.scalar(select(Observation.project_id).limit(1))
+            if project_id is None:
+                raise SystemExit("No observations to query; run `python -m scripts.seed` first")
+        query = list_query(db, project_id).limit(limit)
+        sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+        for pruning in (False, True):
+            timings, scanned = [], 0
+            for _ in range(repeat):
+                elapsed_ms, scanned = _explain(db, sql, pruning)
+                timings.append(elapsed_ms)
+            label = "pruning on" if pruning else "pruning off"
+            print(f"{label:>12}: {statistics.median(timings):8.2f} ms median, {scanned:3d} partitions scanned")
+        db.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the observation list with partition pruning on and off.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.database_url, args.project_id, args.limit, args.repeat)
@@ -0,0 +1,69 @@
+import argparse
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.ids import uuid7
+
+GENERATORS = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+def _size(conn, relation: str) -> int:
+    return conn.execute(text("SELECT pg_relation_size(CAST(:relation AS regclass))"), {"relation": relation}).scalar()
+
+
+def _run_one(engine, version: str, rows: int, batch_size: int) -> dict:
+    parent, child = f"bench_keys_{version}", f"bench_keys_{version}_child"
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {child}, {parent}"))
+        conn.execute(text(f"CREATE TABLE {parent} (id uuid PRIMARY KEY, project_id int NOT NULL, price numeric(18, 2))"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {child} (observation_id uuid PRIMARY KEY REFERENCES {parent} (id) ON DELETE CASCADE,"
+                " padron varchar(255))"
+            )
+        )
+
+    generate = GENERATORS[version]
+    insert_parent = text(f"INSERT INTO {parent} (id, project_id, price) VALUES (:id, 1, 1000)")
+    insert_child = text(f"INSERT INTO {child} (observation_id, padron) VALUES (:id, 'P')")
+    started = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        batch = [{"id": generate()} for _ in range(min(batch_size, rows - offset))]
+        with engine.begin() as conn:
+            conn.execute(insert_parent, batch)
+            conn.execute(insert_child, batch)
+    elapsed = time.perf_counter() - started
+
+    with engine.begin() as conn:
+        result = {
+            "rows_per_s": rows / elapsed,
+            "pk_mb": _size(conn, f"{parent}_pkey") / 2**20,
+            "child_pk_mb": _size(conn, f"{child}_pkey") / 2**20,
+            "table_mb": _size(conn, parent) / 2**20,
+        }
+        conn.execute(text(f"DROP TABLE {child}, {parent}"))
+    return result
+
+
+def run(database_url: str, rows: int, batch_size: int) -> None:
+    engine = create_engine(database_url, future=True)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This benchmark measures PostgreSQL B-tree indexes; pass a postgresql+psycopg URL")
+    for version in GENERATORS:
+        result = _run_one(engine, version, rows, batch_size)
+        print(
+            f"{version}: {result['rows_per_s']:9.0f} rows/s, pk {result['pk_mb']:7.1f} MiB, "
+            f"child pk {result['child_pk_mb']:7.1f} MiB, heap {result['table_mb']:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Insert throughput and index size with UUIDv4 vs UUIDv7 keys.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.database_url, args.rows, args.batch_size)
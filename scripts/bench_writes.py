@@ -0,0 +1,169 @@
+import argparse
+import statistics
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import create_engine, delete, event, select
+from sqlalchemy.orm import Session
+
+from app.api.routes import observations
+from app.core.config import settings
+from app.models import (
+    Observation,
+    ObservationBuilding,
+    ObservationLocation,
+    ObservationStatusHistory,
+    Project,
+    User,
+    UserProject,
+)
+from app.schemas.observation import ObservationCreate, ObservationUpdate
+
+
+def _payload(project_id: int, run_id: str, index: int) -> ObservationCreate:
+    return ObservationCreate.model_validate(
+        {
+            "project_id": project_id,
+            "property_type": "urbano_edificado",
+            "status": "cargado",
+            "price": "1000.00",
+            "currency": "USD",
+            "surface_total": "100.00",
+            "extras": {"bench": run_id, "coordinates": [-65.2 + index / 10_000, -26.8]},
+            "location": {"padron": f"B-{index}"},
+            "building": {"bedrooms_count": 2},
+        }
+    )
+
+
+def _legacy_create(db: Session, project_id: int, membership: UserProject, payload: ObservationCreate):
+    # The ORM path this replaced: flush, child INSERTs, history, commit, refresh, lazy child loads.
+    observation = Observation(
+        project_id=project_id,
+        created_by=membership.user_id,
+        updated_by=membership.user_id,
+        **observations._observation_values(db, payload),
+    )
+    db.add(observation)
+    db.flush()
+    observation.location = ObservationLocation(
+        project_id=project_id, observation_id=observation.id, **observations._location_values(db, payload.location)
+    )
+    observation.building = ObservationBuilding(
+        project_id=project_id, observation_id=observation.id, **observations._building_values(db, payload.building)
+    )
+    db.add(
+        ObservationStatusHistory(
+            project_id=project_id,
+            observation_id=observation.id,
+            to_status=observation.status,
+            changed_by=membership.user_id,
+            reason="create",
+        )
+    )
+    db.commit()
+    db.refresh(observation)
+    return observations.observation_rows(db, [observation])[0]
+
+
+def _legacy_update(db: Session, project_id: int, membership: UserProject, observation_id, payload: ObservationUpdate):
+    observation = db.scalar(
+        select(Observation).where(Observation.id == observation_id, Observation.project_id == project_id)
+    )
+    before_status = observation.status
+    for key, value in observations._observation_changes(db, payload, payload.model_dump(exclude_unset=True)).items():
+        setattr(observation, key, value)
+    building = observation.building or ObservationBuilding(project_id=project_id, observation_id=observation.id)
+    for key, value in observations._building_values(db, payload.building).items():
+        setattr(building, key, value)
+    observation.building = building
+    observation.updated_by = membership.user_id
+    observation.updated_at = datetime.utcnow()
+    if before_status != observation.status:
+        db.add(
+            ObservationStatusHistory(
+                project_id=project_id,
+                observation_id=observation.id,
+                from_status=before_status,
+                to_status=observation.status,
+                changed_by=membership.user_id,
+                reason="update",
+            )
+        )
+    db.commit()
+    db.refresh(observation)
+    return observations.observation_rows(db, [observation])[0]
+
+
+def _measure(engine, writes: int, write) -> tuple[float, float]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    timings = []
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for index in range(writes):
+            with Session(engine) as db:
+                started = time.perf_counter()
+                write(db, index)
+                timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statistics.median(timings) * 1000, len(statements) / writes
+
+
+def run(database_url: str, writes: int) -> None:
+    engine = create_engine(database_url, future=True)
+    run_id = uuid4().hex
+    with Session(engine) as db:
+        project_id = db.scalar(select(Project.id).order_by(Project.id))
+        user_id = db.scalar(select(User.id).order_by(User.id))
+        if project_id is None or user_id is None:
+            raise SystemExit("Run migrations and `python -m scripts.seed` first")
+    membership = UserProject(user_id=user_id, project_id=project_id)
+    created: list = []
+
+    def new_create(db: Session, index: int) -> None:
+        result = observations.create_observation(
+            project_id=project_id, payload=_payload(project_id, run_id, index), membership=membership, db=db
+        )
+        created.append(result.id)
+
+    def old_create(db: Session, index: int) -> None:
+        _legacy_create(db, project_id, membership, _payload(project_id, run_id, index))
+
+    def new_update(db: Session, index: int) -> None:
+        payload = ObservationUpdate(status="revision" if index % 2 else "cargado", building={"bedrooms_count": index})
+        observations.update_observation(
+            project_id=project_id, observation_id=created[index], payload=payload, membership=membership, db=db
+        )
+
+    def old_update(db: Session, index: int) -> None:
+        payload = ObservationUpdate(status="cargado" if index % 2 else "revision", building={"bedrooms_count": index})
+        _legacy_update(db, project_id, membership, created[index], payload)
+
+    try:
+        for label, write in (
+            ("create (orm + refresh)", old_create),
+            ("create (returning)", new_create),
+            ("update (orm + refresh)", old_update),
+            ("update (returning)", new_update),
+        ):
+            median_ms, per_write = _measure(engine, writes, write)
+            print(f"{label:>24}: {median_ms:7.2f} ms median, {per_write:4.1f} statements/write")
+    finally:
+        with Session(engine) as db:
+            ids = select(Observation.id).where(Observation.extras["bench"].as_string() == run_id)
+            db.execute(delete(Observation).where(Observation.id.in_(ids)))
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare create/update latency of the ORM and RETURNING write paths.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+    run(args.database_url, args.writes)
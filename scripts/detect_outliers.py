@@ -0,0 +1,37 @@
+import argparse
+from dataclasses import asdict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.outliers import OutlierMethod, detect_outliers
+
+
+def run(project_id: int, **options) -> dict:
+    engine = create_engine(settings.database_url, future=True)
+    with Session(engine) as db:
+        return asdict(detect_outliers(db, project_id, **options))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mark price per m2 outliers of a project as 'outlier'.")
+    parser.add_argument("project_id", type=int)
+    parser.add_argument("--method", choices=[item.value for item in OutlierMethod], default=OutlierMethod.MAD.value)
+    parser.add_argument("--threshold", type=float, default=3.5)
+    parser.add_argument("--min-group-size", type=int, default=8)
+    parser.add_argument("--zone-size", type=float, default=None, help="grid cell edge in degrees")
+    parser.add_argument("--linear", action="store_true", help="use raw prices instead of log prices")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    print(
+        run(
+            args.project_id,
+            method=OutlierMethod(args.method),
+            threshold=args.threshold,
+            min_group_size=args.min_group_size,
+            zone_size=args.zone_size,
+            log_scale=not args.linear,
+            dry_run=args.dry_run,
+        )
+    )
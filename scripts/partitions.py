@@ -0,0 +1,38 @@
+import argparse
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.partitions import PARTITIONED_TABLES, partition_name, partition_remainder, partition_stats, vacuum_project
+
+
+def run(command: str, project_id: int | None, table: str, full: bool) -> None:
+    engine = create_engine(settings.database_url, future=True)
+    if command == "stats":
+        with Session(engine) as db:
+            for row in partition_stats(db, table):
+                print(
+                    f"{row['partition']:>28}: ~{row['estimated_rows']:>10} rows, "
+                    f"{row['total_bytes'] / 2**20:8.1f} MiB, {row['dead_rows']:>8} dead, "
+                    f"autovacuum {row['last_autovacuum'] or '-'}"
+                )
+    elif command == "locate":
+        with Session(engine) as db:
+            remainder = partition_remainder(db, project_id)
+        print(", ".join(partition_name(name, remainder) for name in PARTITIONED_TABLES))
+    else:
+        for partition in vacuum_project(engine, project_id, full=full):
+            print(f"vacuumed {partition}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and maintain the project_id hash partitions.")
+    parser.add_argument("command", choices=["stats", "locate", "vacuum"])
+    parser.add_argument("--project-id", type=int, help="required by locate and vacuum")
+    parser.add_argument("--table", default="observations", choices=PARTITIONED_TABLES, help="table for stats")
+    parser.add_argument("--full", action="store_true", help="VACUUM FULL (rewrites and locks the partitions)")
+    args = parser.parse_args()
+    if args.command != "stats" and args.project_id is None:
+        parser.error(f"{args.command} needs --project-id")
+    run(args.command, args.project_id, args.table, args.full)
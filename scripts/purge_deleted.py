@@ -0,0 +1,54 @@
+import argparse
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.retention import archive_deleted_observations, count_purgeable, restore_observations, retention_cutoff
+
+
+def archive(days: int | None, batch_size: int, max_batches: int | None, pause: float, dry_run: bool) -> None:
+    engine = create_engine(settings.database_url, future=True)
+    cutoff = retention_cutoff(days)
+    with Session(engine) as db:
+        if dry_run:
+            print(f"{count_purgeable(db, cutoff)} soft-deleted observations deleted before {cutoff:%Y-%m-%d %H:%M}")
+            return
+        report = archive_deleted_observations(
+            db, cutoff=cutoff, batch_size=batch_size, max_batches=max_batches, pause_seconds=pause
+        )
+    print(f"archived {report.observations} observations ({report.rows} rows) in {report.batches} batches")
+
+
+def restore(project_id: int, observation_ids: list[UUID] | None, undelete: bool, batch_size: int) -> None:
+    engine = create_engine(settings.database_url, future=True)
+    with Session(engine) as db:
+        restored = restore_observations(db, project_id, observation_ids, undelete=undelete, batch_size=batch_size)
+    print(f"restored {restored} observations of project {project_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old soft-deleted observations, or bring them back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = commands.add_parser("archive", help="move soft-deleted observations past retention to *_archive")
+    archive_parser.add_argument(
+        "--older-than-days", type=int, help=f"default OBSERVATION_RETENTION_DAYS ({settings.observation_retention_days})"
+    )
+    archive_parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    archive_parser.add_argument("--max-batches", type=int, help="stop after this many batches; rerun to continue")
+    archive_parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    archive_parser.add_argument("--dry-run", action="store_true", help="only count what would be archived")
+
+    restore_parser = commands.add_parser("restore", help="move archived observations back to the live tables")
+    restore_parser.add_argument("--project-id", type=int, required=True)
+    restore_parser.add_argument("--id", dest="ids", type=UUID, action="append", help="repeatable; default: all")
+    restore_parser.add_argument("--undelete", action="store_true", help="also clear deleted_at and the eliminado status")
+    restore_parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+
+    args = parser.parse_args()
+    if args.command == "archive":
+        archive(args.older_than_days, args.batch_size, args.max_batches, args.pause, args.dry_run)
+    else:
+        restore(args.project_id, args.ids, args.undelete, args.batch_size)
@@ -0,0 +1,24 @@
+import argparse
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.read_model import REBUILD_BATCH_SIZE, rebuild_read_model
+
+
+def run(project_id: int | None, batch_size: int) -> None:
+    engine = create_engine(settings.database_url, future=True)
+    with Session(engine) as db:
+        written = rebuild_read_model(db, project_id, batch_size=batch_size)
+        db.commit()
+    scope = f"project {project_id}" if project_id is not None else "all projects"
+    print(f"observation_read rebuilt for {scope}: {written} rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render the observation_read projection from the base tables.")
+    parser.add_argument("--project-id", type=int, help="only this project (default: every project)")
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+    run(args.project_id, args.batch_size)
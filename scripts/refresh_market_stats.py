@@ -0,0 +1,25 @@
+import argparse
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.market_stats import refresh_market_stats
+
+
+def run(concurrently: bool = True) -> None:
+    engine = create_engine(settings.database_url, future=True)
+    with Session(engine) as db:
+        refresh_market_stats(db, concurrently=concurrently)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the observation_market_stats materialized view.")
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="plain REFRESH under an ACCESS EXCLUSIVE lock, which blocks readers while it runs, "
+        "instead of CONCURRENTLY; the view is created WITH DATA, so this is never required",
+    )
+    args = parser.parse_args()
+    run(concurrently=not args.blocking)
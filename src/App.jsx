@@ -27,11 +27,23 @@ function buildPoint(coords) {
   };
 }
 
+// Unsaved local points survive a refetch of the visible extent.
+function mergeFetchedPoints(current, fetched) {
+  const unsaved = current.filter((point) => !point.persisted || point.dirty);
+  const unsavedIds = new Set(unsaved.map((point) => String(point.id)));
+  return [...fetched.filter((point) => !unsavedIds.has(String(point.id))), ...unsaved];
+}
+
+function sameBounds(a, b) {
+  return Boolean(a && b) && a.every((value, index) => value === b[index]);
+}
+
 export default function App() {
   const [token, setToken] = useState(() => localStorage.getItem('token'));
   const [projects, setProjects] = useState([]);
   const [projectId, setProjectId] = useState(null);
   const [points, setPoints] = useState([]);
+  const [bbox, setBbox] = useState(null);
   const [selectedId, setSelectedId] = useState(null);
   const [saving, setSaving] = useState(false);
 
@@ -63,15 +75,29 @@ export default function App() {
   }, [token]);
 
   useEffect(() => {
-    if (!token || !projectId) return;
-    getPoints(token, projectId).then((items) => {
-      setPoints(items);
-      setSelectedId(items[0]?.id ?? null);
-      setDraftPoint(null);
-      setPanelOpen(false);
-      setPanelMode('query');
+    setPoints([]);
+    setSelectedId(null);
+    setDraftPoint(null);
+    setPanelOpen(false);
+    setPanelMode('query');
+  }, [projectId]);
+
+  // Only the visible extent is loaded; it is fetched again after every pan and zoom.
+  useEffect(() => {
+    if (!token || !projectId || !bbox) return undefined;
+    let stale = false;
+    getPoints(token, projectId, { bbox }).then((items) => {
+      if (!stale) setPoints((current) => mergeFetchedPoints(current, items));
     });
-  }, [token, projectId]);
+    return () => {
+      stale = true;
+    };
+  }, [token, projectId, bbox]);
+
+  function handleViewChange(bounds) {
+    const next = bounds.map((value) => Number(value.toFixed(6)));
+    setBbox((current) => (sameBounds(current, next) ? current : next));
+  }
 
   async function handleLogin(email, password) {
     const payload = await loginRequest(email, password);
@@ -115,12 +141,14 @@ export default function App() {
     );
   }
 
-  async function persist() {
+  async function persist(nextPoints) {
     if (!projectId) return;
     setSaving(true);
     try {
-      const updated = await savePoints(token, projectId, points);
-      setPoints(updated);
+      setPoints(await savePoints(token, projectId, nextPoints));
+    } catch (error) {
+      if (error.points) setPoints(error.points);
+      throw error;
     } finally {
       setSaving(false);
     }
@@ -128,17 +156,20 @@ export default function App() {
 
   async function saveDraft() {
     if (!draftPoint) return;
+    let nextPoints = points;
     if (panelMode === 'create') {
-      setPoints((current) => [...current, { ...draftPoint, persisted: false }]);
-      setSelectedId(draftPoint.id);
+      nextPoints = [...points, { ...draftPoint, persisted: false }];
     } else if (panelMode === 'edit') {
-      updatePoint({ ...draftPoint, persisted: true });
-      setSelectedId(draftPoint.id);
+      nextPoints = points.map((point) =>
+        String(point.id) === String(draftPoint.id) ? { ...draftPoint, dirty: true } : point,
+      );
     }
+    setPoints(nextPoints);
+    setSelectedId(draftPoint.id);
     setDraftPoint(null);
     setPanelMode('query');
     setTool('query');
-    await persist();
+    await persist(nextPoints);
   }
 
   function cancelDraft() {
@@ -206,8 +237,10 @@ export default function App() {
               ...(points.find((item) => String(item.id) === String(id)) || buildPoint(coords)),
               id,
               coordinates: coords,
+              dirty: true,
             });
           }}
+          onViewChange={handleViewChange}
         />
 
         <RightPanel
@@ -65,6 +65,7 @@ export default function MapView({
   onCreatePointFromMap,
   onPickPointToEdit,
   onMovePoint,
+  onViewChange,
 }) {
   const mapContainerRef = useRef(null);
   const mapRef = useRef(null);
@@ -78,6 +79,20 @@ export default function MapView({
     [points, selectedId, draftPoint],
   );
 
+  // The map is created once; its listeners read the latest props through these refs.
+  const projectRef = useRef(project);
+  const featuresRef = useRef(features);
+  const handlersRef = useRef({});
+  featuresRef.current = features;
+  handlersRef.current = {
+    onMapQuery,
+    onPointQuery,
+    onCreatePointFromMap,
+    onPickPointToEdit,
+    onMovePoint,
+    onViewChange,
+  };
+
   useEffect(() => {
     modeRef.current = mode;
   }, [mode]);
@@ -88,15 +103,18 @@ export default function MapView({
     const map = new maplibregl.Map({
       container: mapContainerRef.current,
       style: BASEMAP_STYLE,
-      center: project.center,
-      zoom: project.zoom,
+      center: projectRef.current.center,
+      zoom: projectRef.current.zoom,
     });
 
     map.addControl(new maplibregl.NavigationControl({ showCompass: false }), 'top-right');
     mapRef.current = map;
 
+    // [minLon, minLat, maxLon, maxLat] of the visible extent, after every pan and zoom.
+    const reportView = () => handlersRef.current.onViewChange?.(map.getBounds().toArray().flat());
+
     map.on('load', () => {
-      map.addSource('points-source', { type: 'geojson', data: features });
+      map.addSource('points-source', { type: 'geojson', data: featuresRef.current });
       map.addLayer({
         id: 'points-layer',
         type: 'circle',
@@ -147,10 +165,10 @@ export default function MapView({
         pointClickRef.current = true;
 
         if (modeRef.current === 'edit') {
-          onPickPointToEdit(pointId);
+          handlersRef.current.onPickPointToEdit(pointId);
           return;
         }
-        onPointQuery(pointId);
+        handlersRef.current.onPointQuery(pointId);
       });
 
       map.on('click', (event) => {
@@ -160,10 +178,10 @@ export default function MapView({
         }
         const coords = [event.lngLat.lng, event.lngLat.lat];
         if (modeRef.current === 'create') {
-          onCreatePointFromMap(coords);
+          handlersRef.current.onCreatePointFromMap(coords);
           return;
         }
-        onMapQuery(coords);
+        handlersRef.current.onMapQuery(coords);
       });
 
       map.on('mousedown', 'points-layer', (event) => {
@@ -176,13 +194,15 @@ export default function MapView({
       map.on('mousemove', (event) => {
         if (modeRef.current !== 'edit') return;
         if (!draggingIdRef.current) return;
-        onMovePoint(draggingIdRef.current, [event.lngLat.lng, event.lngLat.lat]);
+        handlersRef.current.onMovePoint(draggingIdRef.current, [event.lngLat.lng, event.lngLat.lat]);
       });
 
       map.on('mouseup', () => {
         draggingIdRef.current = null;
       });
 
+      map.on('moveend', reportView);
+      reportView();
       setMapReady(true);
     });
 
@@ -191,16 +211,7 @@ export default function MapView({
       mapRef.current = null;
       setMapReady(false);
     };
-  }, [
-    features,
-    onCreatePointFromMap,
-    onMapQuery,
-    onMovePoint,
-    onPickPointToEdit,
-    onPointQuery,
-    project.center,
-    project.zoom,
-  ]);
+  }, []);
 
   useEffect(() => {
     if (!mapReady) return;
@@ -40,24 +40,8 @@ export async function getProjects(token) {
   return response.json();
 }
 
-export async function getPoints(token, projectId) {
-  if (!API_URL) {
-    const key = `points:${projectId}`;
-    const raw = localStorage.getItem(key);
-    if (raw) return JSON.parse(raw);
-    return [];
-  }
-
-  const response = await fetch(`${API_URL}/projects/${projectId}/observations`, {
-    headers: {
-      Authorization: `Bearer ${token}`,
-      'X-Project-Id': String(projectId),
-    },
-  });
-  if (!response.ok) throw new Error('No se pudieron cargar observaciones');
-
-  const observations = await response.json();
-  return observations.map((item) => ({
+function toPoint(item) {
+  return {
     id: item.id,
     name: item.extras?.name || 'Sin nombre',
     description: item.extras?.description || '',
@@ -74,13 +58,39 @@ export async function getPoints(token, projectId) {
     building: item.building ?? {},
     rural: item.rural ?? {},
     persisted: true,
-  }));
+  };
 }
 
+export async function getPoints(token, projectId, { bbox } = {}) {
+  if (!API_URL) {
+    const key = `points:${projectId}`;
+    const raw = localStorage.getItem(key);
+    if (raw) return JSON.parse(raw);
+    return [];
+  }
+
+  // bbox: [minLon, minLat, maxLon, maxLat] of the visible extent, e.g. map.getBounds().toArray().flat().
+  const query = bbox ? `?bbox=${bbox.join(',')}` : '';
+  const response = await fetch(`${API_URL}/projects/${projectId}/observations${query}`, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'X-Project-Id': String(projectId),
+    },
+  });
+  if (!response.ok) throw new Error('No se pudieron cargar observaciones');
+
+  const observations = await response.json();
+  return observations.map(toPoint);
+}
+
+// The :batch endpoint accepts at most this many items per request.
+const BATCH_SIZE = 1000;
+
 export async function savePoints(token, projectId, points) {
   if (!API_URL) {
-    localStorage.setItem(`points:${projectId}`, JSON.stringify(points));
-    return points;
+    const saved = points.map((point) => ({ ...point, persisted: true, dirty: false }));
+    localStorage.setItem(`points:${projectId}`, JSON.stringify(saved));
+    return saved;
   }
 
   function toNumberOrNull(value) {
@@ -115,27 +125,41 @@ export async function savePoints(token, projectId, points) {
     return payload;
   }
 
-  for (const point of points) {
-    const payload = toPayload(point);
-    const method = point.persisted ? 'PATCH' : 'POST';
-    const target = point.persisted
-      ? `${API_URL}/projects/${projectId}/observations/${point.id}`
-      : `${API_URL}/projects/${projectId}/observations`;
-
-    const response = await fetch(target, {
-      method,
+  // Only new or edited points are sent: re-sending saved ones would rewrite every row and
+  // move the project's change feed, ETags and caches for nothing.
+  const pending = points
+    .map((point, position) => ({ point, position }))
+    .filter(({ point }) => !point.persisted || point.dirty);
+  const saved = [...points];
+
+  for (let start = 0; start < pending.length; start += BATCH_SIZE) {
+    const chunk = pending.slice(start, start + BATCH_SIZE);
+    const items = chunk.map(({ point }) => ({
+      ...(point.persisted ? { id: point.id } : {}),
+      data: point.persisted ? { ...toPayload(point), project_id: undefined } : toPayload(point),
+    }));
+
+    const response = await fetch(`${API_URL}/projects/${projectId}/observations:batch`, {
+      method: 'POST',
       headers: {
         'Content-Type': 'application/json',
         Authorization: `Bearer ${token}`,
         'X-Project-Id': String(projectId),
       },
-      body: JSON.stringify(payload),
+      body: JSON.stringify({ mode: 'atomic', items }),
     });
     if (!response.ok) {
       const message = await response.text();
-      throw new Error(`No se pudieron guardar observaciones: ${message}`);
+      const error = new Error(`No se pudieron guardar observaciones: ${message}`);
+      // Earlier chunks are already committed; callers keep them so a retry does not recreate them.
+      error.points = saved;
+      throw error;
     }
-  }
 
-  return getPoints(token, projectId);
+    const result = await response.json();
+    for (const item of result.items) {
+      saved[chunk[item.index].position] = toPoint(item.observation);
+    }
+  }
+  return saved;
 }
@@ -7,33 +7,80 @@ if str(ROOT) not in sys.path:
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.api.deps import get_db
-from app.core.security import get_password_hash
-from app.main import app
-from app.models import Base, Project, ProjectRole, User, UserProject
+from app.api.deps import get_async_db, get_db
+from app.core.cache_backends import shared_backend
+from app.core.security import get_password_hash, token_cache
+from app.main import app, create_app
+from app.models import (
+    Base,
+    CatalogConservationState,
+    CatalogCurrency,
+    CatalogDestination,
+    CatalogLegalStatus,
+    CatalogPropertyType,
+    CatalogValueOrigin,
+    Project,
+    ProjectRole,
+    User,
+    UserProject,
+)
+from app.services.auth_cache import membership_cache
+from app.services.catalogs import catalog_cache
+from app.services.tiles import tile_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches() -> None:
+    # Every test builds its own in-memory database, so process-wide caches must not leak.
+    catalog_cache.invalidate()
+    membership_cache.clear()
+    tile_cache.clear()
+    token_cache.clear()
+    shared_backend.clear()
+    yield
+    catalog_cache.invalidate()
+    membership_cache.clear()
+    tile_cache.clear()
+    token_cache.clear()
+    shared_backend.clear()
 
 
 @pytest.fixture()
-def client() -> TestClient:
-    engine = create_engine(
+def engine() -> Engine:
+    return create_engine(
         "sqlite+pysqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         future=True,
     )
-    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
-    Base.metadata.create_all(bind=engine)
 
+
+def _seed(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
     with Session(engine) as db:
         user = User(email="user@test.com", hashed_password=get_password_hash("test123"))
         other = User(email="other@test.com", hashed_password=get_password_hash("test123"))
         p1 = Project(name="Project 1")
         p2 = Project(name="Project 2")
         db.add_all([user, other, p1, p2])
+        db.add_all(
+            [
+                CatalogPropertyType(code="urbano_baldio", label="Urbano Baldio", sort_order=1),
+                CatalogPropertyType(code="urbano_edificado", label="Urbano Edificado", sort_order=2),
+                CatalogPropertyType(code="rural", label="Rural", sort_order=3),
+                CatalogCurrency(code="ARS", label="Pesos", sort_order=1),
+                CatalogCurrency(code="USD", label="Dolares", sort_order=2),
+                CatalogValueOrigin(code="oferta", label="Oferta", sort_order=1),
+                CatalogLegalStatus(code="escriturado", label="Escriturado", sort_order=1),
+                CatalogDestination(code="vivienda", label="Vivienda", sort_order=1),
+                CatalogConservationState(code="bueno", label="Bueno", sort_order=1),
+            ]
+        )
         db.flush()
         db.add_all(
             [
@@ -43,6 +90,12 @@ def client() -> TestClient:
         )
         db.commit()
 
+
+@pytest.fixture()
+def client(engine: Engine) -> TestClient:
+    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+    _seed(engine)
+
     def override_get_db():
         db = TestingSessionLocal()
         try:
@@ -59,3 +112,44 @@ def client() -> TestClient:
         test_client.close()
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def async_client(tmp_path) -> TestClient:
+    # aiosqlite connections cannot share an in-memory database with the sync seeding engine.
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url.replace("+aiosqlite", "+pysqlite"), future=True)
+    _seed(sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(url, poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    async_app = create_app(async_routes=True)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(async_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture()
+def auth_headers(client: TestClient) -> dict[str, str]:
+    response = client.post("/auth/login", json={"email": "user@test.com", "password": "test123"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}", "X-Project-Id": "1"}
+
+
+@pytest.fixture()
+def query_counter(engine: Engine) -> list[str]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,75 @@
+import inspect
+import json
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def _login(client: TestClient) -> dict[str, str]:
+    response = client.post("/auth/login", json={"email": "user@test.com", "password": "test123"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}", "X-Project-Id": "1"}
+
+
+def test_async_app_serves_coroutine_endpoints() -> None:
+    routes = {
+        (route.path, method): route.endpoint
+        for route in create_app(async_routes=True).routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+    assert inspect.iscoroutinefunction(routes[("/auth/login", "POST")])
+    assert inspect.iscoroutinefunction(routes[("/projects", "GET")])
+    assert inspect.iscoroutinefunction(routes[("/projects/{project_id}/observations", "GET")])
+    assert inspect.iscoroutinefunction(routes[("/projects/{project_id}/observations/{observation_id}", "PATCH")])
+
+
+def test_async_login_and_project_scope(async_client: TestClient) -> None:
+    assert async_client.post("/auth/login", json={"email": "user@test.com", "password": "bad"}).status_code == 401
+    headers = _login(async_client)
+
+    projects = async_client.get("/projects", headers=headers)
+    assert projects.status_code == 200
+    assert [item["id"] for item in projects.json()] == [1]
+
+    assert async_client.get("/projects/current", headers=headers).json()["role"] == "Editor"
+    denied = async_client.get("/projects/current", headers={**headers, "X-Project-Id": "2"})
+    assert denied.status_code == 403
+
+
+def test_async_observation_lifecycle(async_client: TestClient) -> None:
+    headers = _login(async_client)
+    payload = {
+        "project_id": 1,
+        "property_type": "urbano_baldio",
+        "price": "1000.00",
+        "currency": "USD",
+        "surface_total": "10.00",
+        "extras": {"lon": -65.2, "lat": -26.8},
+        "location": {"padron": "P-1", "legal_status_code": "escriturado"},
+    }
+
+    created = async_client.post("/projects/1/observations", json=payload, headers=headers)
+    assert created.status_code == 201, created.text
+    observation_id = created.json()["id"]
+
+    updated = async_client.patch(
+        f"/projects/1/observations/{observation_id}", json={"status": "revision"}, headers=headers
+    )
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["status"] == "revision"
+
+    listed = async_client.get("/projects/1/observations", params={"limit": 1}, headers=headers)
+    assert [item["id"] for item in listed.json()] == [observation_id]
+    assert listed.json()[0]["location"]["legal_status_code"] == "escriturado"
+
+    streamed = async_client.get("/projects/1/observations", params={"stream": 1}, headers=headers)
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in streamed.text.splitlines()] == [observation_id]
+
+    assert async_client.delete(f"/projects/1/observations/{observation_id}", headers=headers).status_code == 204
+    changes = async_client.get("/projects/1/observations/changes", headers=headers).json()
+    assert changes["deleted"] == [observation_id]
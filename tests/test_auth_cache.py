@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import decode_token
+from app.models import ProjectRole, User, UserProject
+
+
+def test_membership_is_cached_after_first_request(
+    client: TestClient, auth_headers: dict, query_counter: list[str]
+) -> None:
+    assert client.get("/projects/current", headers=auth_headers).status_code == 200
+    assert len(query_counter) == 1
+
+    query_counter.clear()
+    assert client.get("/projects/current", headers=auth_headers).json()["role"] == "Editor"
+    assert query_counter == []
+
+
+def test_membership_writes_invalidate_cache(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    assert client.get("/projects/current", headers=auth_headers).json()["role"] == "Editor"
+
+    with Session(engine) as db:
+        membership = db.scalar(select(UserProject).where(UserProject.project_id == 1))
+        membership.role = ProjectRole.VIEWER
+        db.commit()
+    assert client.get("/projects/current", headers=auth_headers).json()["role"] == "Viewer"
+
+    with Session(engine) as db:
+        db.execute(delete(UserProject).where(UserProject.project_id == 1))
+        db.commit()
+    assert client.get("/projects/current", headers=auth_headers).status_code == 403
+
+
+def test_deleted_user_is_rejected(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    assert client.get("/projects/current", headers=auth_headers).status_code == 200
+
+    with Session(engine) as db:
+        db.delete(db.scalar(select(User).where(User.email == "user@test.com")))
+        db.commit()
+    assert client.get("/projects/current", headers=auth_headers).status_code == 401
+
+
+def test_signed_role_claims_skip_the_database(client: TestClient, query_counter: list[str], monkeypatch) -> None:
+    monkeypatch.setattr(settings, "jwt_role_claims", True)
+    response = client.post("/auth/login", json={"email": "user@test.com", "password": "test123"})
+    token = response.json()["access_token"]
+    assert decode_token(token)["roles"] == {"1": "Editor"}
+
+    query_counter.clear()
+    headers = {"Authorization": f"Bearer {token}", "X-Project-Id": "1"}
+    assert client.get("/projects/current", headers=headers).json()["role"] == "Editor"
+    assert query_counter == []
+
+    monkeypatch.setattr(settings, "jwt_role_claims", False)
+    denied = client.get("/projects/current", headers={**headers, "X-Project-Id": "2"})
+    assert denied.status_code == 403
@@ -0,0 +1,38 @@
+import time
+
+from app.core.cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used_entry() -> None:
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_respects_weight_budget() -> None:
+    cache = LRUCache(10, max_weight=5, weigher=len)
+    cache.set("a", b"123")
+    cache.set("b", b"45")
+    cache.set("c", b"6")
+    cache.set("huge", b"123456")
+
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+    assert cache.stats()["weight"] == 3
+
+
+def test_lru_expires_entries() -> None:
+    cache = LRUCache(10)
+    cache.set("a", 1, expires_at=time.monotonic() - 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, CatalogCurrency, CatalogPropertyType
+from app.services.catalogs import CATALOG_MODELS, catalog_cache
+
+
+@pytest.fixture()
+def db() -> Session:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(bind=engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with Session(engine) as session:
+        session.add_all(
+            [
+                CatalogPropertyType(code="urbano_baldio", label="Urbano Baldio"),
+                CatalogPropertyType(code="rural", label="Rural", is_active=False),
+                CatalogCurrency(code="USD", label="Dolares"),
+            ]
+        )
+        session.commit()
+        statements.clear()
+        session.info["statements"] = statements
+        yield session
+
+
+def test_lookups_hit_snapshot_after_first_load(db: Session) -> None:
+    statements = db.info["statements"]
+    property_type_id = catalog_cache.id_for_code(db, CatalogPropertyType, "urbano_baldio")
+    loaded = len(statements)
+
+    assert loaded == len(CATALOG_MODELS)
+    assert catalog_cache.id_for_code(db, CatalogPropertyType, "urbano_baldio") == property_type_id
+    assert catalog_cache.code_for_id(db, CatalogPropertyType, property_type_id) == "urbano_baldio"
+    assert catalog_cache.id_for_code(db, CatalogCurrency, "USD") is not None
+    assert len(statements) == loaded
+
+
+def test_inactive_codes_resolve_by_id_but_not_by_code(db: Session) -> None:
+    assert catalog_cache.id_for_code(db, CatalogPropertyType, "rural") is None
+    rural_id = db.query(CatalogPropertyType.id).filter_by(code="rural").scalar()
+    assert catalog_cache.code_for_id(db, CatalogPropertyType, rural_id) == "rural"
+
+
+def test_catalog_commit_invalidates_snapshot(db: Session) -> None:
+    assert catalog_cache.id_for_code(db, CatalogCurrency, "ARS") is None
+    version = catalog_cache.version
+
+    db.add(CatalogCurrency(code="ARS", label="Pesos"))
+    db.commit()
+
+    assert catalog_cache.version > version
+    assert catalog_cache.id_for_code(db, CatalogCurrency, "ARS") is not None
+
+
+def test_miss_falls_back_to_database(db: Session) -> None:
+    catalog_cache.snapshot(db)
+    # Simulate a write made by another process: no ORM event reaches this cache.
+    db.execute(CatalogCurrency.__table__.insert().values(code="EUR", label="Euros", is_active=True, sort_order=0))
+
+    assert catalog_cache.id_for_code(db, CatalogCurrency, "EUR") is not None
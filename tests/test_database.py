@@ -0,0 +1,61 @@
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import execute_together
+from app.models import Observation, ObservationBuilding, ObservationStatus, ObservationStatusHistory
+
+
+class _PostgresSession:
+    """Compiles instead of executing, as the psycopg dialect would."""
+
+    def __init__(self):
+        self.statements = []
+
+    def get_bind(self):
+        return self
+
+    @property
+    def dialect(self):
+        return postgresql.dialect()
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=self.dialect)))
+        return self
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return None
+
+
+def test_execute_together_is_a_single_statement_on_postgresql() -> None:
+    observation_id = uuid4()
+    table = Observation.__table__
+    session = _PostgresSession()
+
+    rows = execute_together(
+        session,
+        {
+            "before": select(table.c.status).where(table.c.id == observation_id),
+            "history": insert(ObservationStatusHistory.__table__).values(
+                observation_id=observation_id, to_status=ObservationStatus.REVISION
+            ),
+            "observation": update(table)
+            .where(table.c.id == observation_id)
+            .values(status=ObservationStatus.REVISION)
+            .returning(table.c.id, table.c.geom),
+            "building_delete": delete(ObservationBuilding.__table__).where(
+                ObservationBuilding.observation_id == observation_id
+            ),
+        },
+    )
+
+    [sql] = session.statements
+    assert sql.startswith("WITH ")
+    assert "write_history AS" in sql and "write_building_delete AS" in sql
+    assert "FROM write_before LEFT OUTER JOIN write_observation ON true" in sql
+    assert "ST_AsEWKT(write_observation.geom) AS observation__geom" in sql
+    assert rows == {"before": None, "history": None, "observation": None, "building_delete": None}
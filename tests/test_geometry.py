@@ -0,0 +1,24 @@
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import Observation
+from app.models.types import parse_point_ewkt, point_ewkt
+
+
+def test_point_ewkt_round_trip() -> None:
+    value = point_ewkt(-65.2, -26.8)
+
+    assert value == "SRID=4326;POINT(-65.2 -26.8)"
+    assert parse_point_ewkt(value) == (-65.2, -26.8)
+    assert parse_point_ewkt(None) is None
+    assert parse_point_ewkt("SRID=4326;LINESTRING(0 0, 1 1)") is None
+
+
+def test_geometry_is_wrapped_only_on_postgresql() -> None:
+    read = select(Observation.geom)
+    write = insert(Observation).values(project_id=1, geom=point_ewkt(0, 0))
+
+    assert "ST_AsEWKT(observations.geom)" in str(read.compile(dialect=postgresql.dialect()))
+    assert "ST_GeomFromEWKT(" in str(write.compile(dialect=postgresql.dialect()))
+    assert "ST_" not in str(read.compile(dialect=sqlite.dialect()))
+    assert "ST_" not in str(write.compile(dialect=sqlite.dialect()))
@@ -0,0 +1,38 @@
+import time
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.ids import new_observation_id, uuid7
+
+
+def test_uuid7_layout_and_order() -> None:
+    before_ms = time.time_ns() // 1_000_000
+    ids = [uuid7() for _ in range(20_000)]
+    after_ms = time.time_ns() // 1_000_000
+
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert {item.version for item in ids} == {7}
+    assert {item.variant for item in ids} == {"specified in RFC 4122"}
+    assert before_ms <= ids[0].int >> 80 <= ids[-1].int >> 80 <= after_ms + 5
+
+
+def test_observation_id_version_setting(monkeypatch) -> None:
+    assert new_observation_id().version == 7
+    monkeypatch.setattr(settings, "observation_id_version", 4)
+    assert new_observation_id().version == 4
+
+
+def test_new_observations_get_time_ordered_ids(client: TestClient, auth_headers: dict) -> None:
+    ids = []
+    for index in range(3):
+        response = client.post(
+            "/projects/1/observations",
+            json={"project_id": 1, "property_type": "urbano_baldio", "extras": {"name": f"P{index}"}},
+            headers=auth_headers,
+        )
+        ids.append(UUID(response.json()["id"]))
+
+    assert [item.version for item in ids] == [7, 7, 7]
+    assert ids == sorted(ids)
@@ -0,0 +1,60 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, insert
+
+from app.services.market_stats import observation_market_stats, stats_metadata, zone_for_point
+
+
+def _stat(**overrides) -> dict:
+    row = {
+        "project_id": 1,
+        "property_type": "urbano_baldio",
+        "currency": "USD",
+        "zone": "*",
+        "period": "*",
+        "observations": 10,
+        "mean": 110.0,
+        "p10": 50.0,
+        "p25": 80.0,
+        "median": 100.0,
+        "p75": 130.0,
+        "p90": 170.0,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_stats_endpoint_reads_precomputed_rows(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    # On PostgreSQL this is a materialized view; a plain table stands in for it here.
+    stats_metadata.create_all(engine)
+    zone = zone_for_point(-65.205, -26.805)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(observation_market_stats),
+            [
+                _stat(),
+                _stat(currency="ARS", median=90000.0),
+                _stat(period="2026-01", median=95.0),
+                _stat(period="2026-02", median=105.0),
+                _stat(zone=zone, observations=3, median=120.0),
+                _stat(project_id=2, median=1.0),
+            ],
+        )
+
+    overall = client.get("/projects/1/stats", params={"currency": "USD"}, headers=auth_headers)
+    assert overall.status_code == 200, overall.text
+    assert [(row["zone"], row["period"], row["median"]) for row in overall.json()] == [("*", "*", 100.0)]
+
+    monthly = client.get(
+        "/projects/1/stats",
+        params={"currency": "USD", "monthly": True, "period_from": "2026-02"},
+        headers=auth_headers,
+    ).json()
+    assert [(row["period"], row["median"]) for row in monthly] == [("2026-02", 105.0)]
+
+    by_point = client.get("/projects/1/stats", params={"lon": -65.205, "lat": -26.805}, headers=auth_headers).json()
+    assert [(row["zone"], row["observations"]) for row in by_point] == [(zone, 3)]
+
+
+def test_zone_for_point_uses_hundredth_degree_cells() -> None:
+    assert zone_for_point(-65.205, -26.805) == "-6521:-2681"
+    assert zone_for_point(0.004, 0.016) == "0:1"
@@ -0,0 +1,45 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import ProjectScopeMiddleware
+
+
+def _app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProjectScopeMiddleware, exempt_paths={"/open"}, **options)
+
+    @app.get("/scoped")
+    def scoped(request: Request) -> dict:
+        return {"project_id": request.state.active_project_id}
+
+    @app.get("/open")
+    def open_path() -> dict:
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a\n", b"b\n"]), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_project_header_is_required_and_numeric() -> None:
+    client = TestClient(_app())
+
+    assert client.get("/scoped").json() == {"detail": "Missing X-Project-Id header"}
+    response = client.get("/scoped", headers={"X-Project-Id": "abc"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "X-Project-Id must be numeric"}
+    assert client.get("/scoped", headers={"X-Project-Id": "42"}).json() == {"project_id": 42}
+    assert client.get("/open").status_code == 200
+
+
+def test_server_timing_is_opt_in_and_streams_pass_through() -> None:
+    assert "server-timing" not in TestClient(_app()).get("/open").headers
+
+    client = TestClient(_app(server_timing=True))
+    response = client.get("/stream", headers={"X-Project-Id": "1"})
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert response.text == "a\nb\n"
+    assert client.get("/scoped").headers["server-timing"].startswith("app;dur=")
@@ -0,0 +1,407 @@
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.api.pagination import encode_keyset
+from app.core.cache_backends import shared_backend
+from app.models import Observation, ObservationStatus, ObservationStatusHistory
+from app.schemas import ObservationRead
+from app.services.versions import bump_data_version
+
+
+def _payload(index: int, **overrides) -> dict:
+    payload = {
+        "project_id": 1,
+        "property_type": "urbano_edificado",
+        "status": "cargado",
+        "price": "1000.00",
+        "currency": "USD",
+        "surface_total": "100.00",
+        "value_origin_code": "oferta",
+        "extras": {"name": f"Punto {index}", "coordinates": [-65.2 + index / 1000, -26.8]},
+        "location": {"padron": f"P-{index}", "legal_status_code": "escriturado"},
+        "building": {"bedrooms_count": 2, "conservation_state_code": "bueno", "destination_code": "vivienda"},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _create(client: TestClient, headers: dict, count: int) -> list[dict]:
+    created = []
+    for index in range(count):
+        response = client.post("/projects/1/observations", json=_payload(index), headers=headers)
+        assert response.status_code == 201, response.text
+        created.append(response.json())
+    return created
+
+
+def test_create_and_list_round_trip(client: TestClient, auth_headers: dict) -> None:
+    created = _create(client, auth_headers, 1)[0]
+
+    response = client.get("/projects/1/observations", headers=auth_headers)
+
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["id"] == created["id"]
+    assert item["property_type"] == "urbano_edificado"
+    assert item["currency"] == "USD"
+    assert item["value_origin_code"] == "oferta"
+    assert item["location"]["legal_status_code"] == "escriturado"
+    assert item["building"]["conservation_state_code"] == "bueno"
+    assert item["building"]["destination_code"] == "vivienda"
+    assert item["rural"] is None
+
+
+def test_list_fast_path_matches_validated_model(client: TestClient, auth_headers: dict) -> None:
+    _create(client, auth_headers, 1)
+
+    [item] = client.get("/projects/1/observations", headers=auth_headers).json()
+
+    assert item == ObservationRead(**item).model_dump(mode="json")
+    assert item["price"] == "1000.00"
+    assert item["building"]["bedrooms_count"] == 2
+
+
+def test_list_query_count_is_independent_of_page_size(
+    client: TestClient, auth_headers: dict, query_counter: list[str]
+) -> None:
+    _create(client, auth_headers, 2)
+    client.get("/projects/1/observations", headers=auth_headers)  # warm the catalog snapshot
+
+    shared_backend.clear()  # drop the rendered page so the request hits the database again
+    query_counter.clear()
+    assert len(client.get("/projects/1/observations", headers=auth_headers).json()) == 2
+    small_page = len(query_counter)
+
+    _create(client, auth_headers, 8)
+    query_counter.clear()
+    assert len(client.get("/projects/1/observations", headers=auth_headers).json()) == 10
+    large_page = len(query_counter)
+
+    # ETag version + one observation_read scan; membership comes from the auth cache
+    assert small_page == large_page == 2
+
+
+def test_list_streams_ndjson(client: TestClient, auth_headers: dict) -> None:
+    _create(client, auth_headers, 3)
+    expected = client.get("/projects/1/observations", headers=auth_headers).json()
+
+    response = client.get("/projects/1/observations", params={"stream": 1}, headers=auth_headers)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    accept = {**auth_headers, "Accept": "application/x-ndjson"}
+    response = client.get("/projects/1/observations", params={"limit": 2}, headers=accept)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [item["id"] for item in expected[:2]]
+
+
+def test_conditional_get_returns_304_until_a_write(
+    client: TestClient, auth_headers: dict, query_counter: list[str]
+) -> None:
+    [created] = _create(client, auth_headers, 1)
+    detail_url = f"/projects/1/observations/{created['id']}"
+
+    listed = client.get("/projects/1/observations", headers=auth_headers)
+    detail = client.get(detail_url, headers=auth_headers)
+    assert detail.json() == listed.json()[0]
+    assert listed.headers["etag"] != detail.headers["etag"]
+
+    query_counter.clear()
+    cached = client.get("/projects/1/observations", headers={**auth_headers, "If-None-Match": listed.headers["etag"]})
+    assert cached.status_code == 304 and cached.content == b""
+    assert len(query_counter) == 1
+    assert client.get(detail_url, headers={**auth_headers, "If-None-Match": detail.headers["etag"]}).status_code == 304
+
+    client.patch(detail_url, json={"status": "revision"}, headers=auth_headers)
+    fresh = client.get("/projects/1/observations", headers={**auth_headers, "If-None-Match": listed.headers["etag"]})
+    assert fresh.status_code == 200
+    assert fresh.json()[0]["status"] == "revision"
+
+    assert client.get("/projects/1/observations/00000000-0000-0000-0000-000000000000", headers=auth_headers).status_code == 404
+
+
+def test_etag_follows_writes_from_other_processes(client: TestClient, auth_headers: dict, engine) -> None:
+    _create(client, auth_headers, 1)
+    listed = client.get("/projects/1/observations", headers=auth_headers)
+
+    # A CLI job shares only the database with the API workers.
+    with Session(engine) as db:
+        bump_data_version(db, 1)
+        db.commit()
+
+    fresh = client.get("/projects/1/observations", headers={**auth_headers, "If-None-Match": listed.headers["etag"]})
+    assert fresh.status_code == 200 and fresh.headers["etag"] != listed.headers["etag"]
+
+
+def test_list_paginates_with_opaque_cursor(client: TestClient, auth_headers: dict) -> None:
+    created = _create(client, auth_headers, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/projects/1/observations", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == [item["id"] for item in reversed(created)]
+
+
+def test_list_rejects_malformed_cursor(client: TestClient, auth_headers: dict) -> None:
+    response = client.get("/projects/1/observations", params={"cursor": "nope"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_list_applies_server_side_filters(client: TestClient, auth_headers: dict) -> None:
+    client.post(
+        "/projects/1/observations",
+        json=_payload(1, price="500.00", valuation_date="2026-01-10", status="revision"),
+        headers=auth_headers,
+    )
+    client.post(
+        "/projects/1/observations",
+        json=_payload(2, price="5000.00", valuation_date="2026-03-10", surface_total="20.00"),
+        headers=auth_headers,
+    )
+    client.post(
+        "/projects/1/observations",
+        json=_payload(3, property_type="rural", building=None, price=None, currency=None),
+        headers=auth_headers,
+    )
+
+    def names(**params) -> list[str]:
+        response = client.get("/projects/1/observations", params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return sorted(item["extras"]["name"] for item in response.json())
+
+    assert names(status="revision") == ["Punto 1"]
+    assert names(property_type="rural") == ["Punto 3"]
+    assert names(price_min="1000") == ["Punto 2"]
+    assert names(valuation_date_from="2026-01-01", valuation_date_to="2026-02-01") == ["Punto 1"]
+    assert names(surface_max="50") == ["Punto 2"]
+    assert names(property_type=["urbano_edificado", "rural"], price_max="1000") == ["Punto 1"]
+
+
+def test_batch_upsert_creates_and_updates_in_one_request(client: TestClient, auth_headers: dict) -> None:
+    existing = _create(client, auth_headers, 1)[0]
+    external_uuid = "6f1c1c3e-8a0b-4f4e-9a53-4c1b7d0f2a11"
+
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={
+            "items": [
+                {"data": _payload(10)},
+                {"external_uuid": external_uuid, "data": _payload(11)},
+                {"id": existing["id"], "data": {"status": "revision", "location": None}},
+            ]
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["committed"] is True
+    assert (body["created"], body["updated"], body["failed"]) == (2, 1, 0)
+    assert [item["status"] for item in body["items"]] == ["created", "created", "updated"]
+    assert body["items"][1]["observation"]["external_uuid"] == external_uuid
+    assert body["items"][2]["observation"]["status"] == "revision"
+    assert body["items"][2]["observation"]["location"] is None
+
+    # Re-sending the same external_uuid updates instead of duplicating.
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={"items": [{"external_uuid": external_uuid, "data": {"price": "9.00", "currency": "ARS"}}]},
+        headers=auth_headers,
+    )
+    assert response.json()["items"][0]["status"] == "updated"
+    assert len(client.get("/projects/1/observations", headers=auth_headers).json()) == 3
+
+
+def test_batch_atomic_mode_rejects_everything_on_any_error(client: TestClient, auth_headers: dict) -> None:
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={"items": [{"data": _payload(1)}, {"data": _payload(2, property_type="ph")}]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 422
+    body = response.json()
+    assert body["committed"] is False
+    assert body["items"][1]["status"] == "error"
+    assert "property_type" in body["items"][1]["error"]
+    assert client.get("/projects/1/observations", headers=auth_headers).json() == []
+
+
+def test_batch_partial_mode_commits_valid_items(client: TestClient, auth_headers: dict) -> None:
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={
+            "mode": "partial",
+            "items": [
+                {"data": _payload(1)},
+                {"data": _payload(2, value_origin_code="desconocido")},
+                {"id": "00000000-0000-0000-0000-000000000000", "data": {"status": "revision"}},
+            ],
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert "Invalid catalog code" in body["items"][1]["error"]
+    assert body["items"][2]["error"] == "Observation not found"
+    assert len(client.get("/projects/1/observations", headers=auth_headers).json()) == 1
+
+
+def test_batch_reports_external_uuids_of_deleted_rows_per_item(client: TestClient, auth_headers: dict) -> None:
+    deleted_uuid, live_uuid = "11111111-1111-1111-1111-111111111111", "22222222-2222-2222-2222-222222222222"
+    ids = {
+        external_uuid: client.post(
+            "/projects/1/observations", json=_payload(0, external_uuid=external_uuid), headers=auth_headers
+        ).json()["id"]
+        for external_uuid in (deleted_uuid, live_uuid)
+    }
+    client.delete(f"/projects/1/observations/{ids[deleted_uuid]}", headers=auth_headers)
+
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={
+            "mode": "partial",
+            "items": [
+                {"external_uuid": deleted_uuid, "data": _payload(1)},
+                {"data": _payload(2, external_uuid=live_uuid)},
+                {"data": _payload(3)},
+            ],
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert body["items"][0]["error"] == "external_uuid belongs to a deleted observation"
+    assert body["items"][1]["error"] == "external_uuid already belongs to another observation"
+    assert {item["id"] for item in client.get("/projects/1/observations", headers=auth_headers).json()} == {
+        ids[live_uuid],
+        body["items"][2]["id"],
+    }
+
+
+def test_changes_feed_returns_updates_and_tombstones_since_token(
+    client: TestClient, auth_headers: dict
+) -> None:
+    first, second = _create(client, auth_headers, 2)
+
+    response = client.get("/projects/1/observations/changes", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["changes"]] == [first["id"], second["id"]]
+    assert body["deleted"] == []
+    token = body["next_token"]
+
+    empty = client.get("/projects/1/observations/changes", params={"since": token}, headers=auth_headers).json()
+    assert empty == {"changes": [], "deleted": [], "next_token": token, "has_more": False}
+
+    client.patch(f"/projects/1/observations/{first['id']}", json={"location": None}, headers=auth_headers)
+    client.delete(f"/projects/1/observations/{second['id']}", headers=auth_headers)
+
+    body = client.get("/projects/1/observations/changes", params={"since": token}, headers=auth_headers).json()
+    assert [item["id"] for item in body["changes"]] == [first["id"]]
+    assert body["changes"][0]["location"] is None
+    assert body["deleted"] == [second["id"]]
+
+
+def test_changes_feed_pages_with_has_more(client: TestClient, auth_headers: dict) -> None:
+    _create(client, auth_headers, 3)
+
+    body = client.get("/projects/1/observations/changes", params={"limit": 2}, headers=auth_headers).json()
+    assert len(body["changes"]) == 2 and body["has_more"] is True
+
+    rest = client.get(
+        "/projects/1/observations/changes",
+        params={"limit": 2, "since": body["next_token"]},
+        headers=auth_headers,
+    ).json()
+    assert len(rest["changes"]) == 1 and rest["has_more"] is False
+
+
+def test_changes_token_follows_commit_order_not_timestamps(
+    client: TestClient, auth_headers: dict, engine
+) -> None:
+    first, second = _create(client, auth_headers, 2)
+    token = client.get("/projects/1/observations/changes", headers=auth_headers).json()["next_token"]
+
+    # A write whose timestamp predates the token (a slow transaction) still shows up after it.
+    client.patch(f"/projects/1/observations/{first['id']}", json={"status": "revision"}, headers=auth_headers)
+    with engine.begin() as conn:
+        conn.execute(update(Observation).values(updated_at=datetime(2000, 1, 1)))
+
+    body = client.get("/projects/1/observations/changes", params={"since": token}, headers=auth_headers).json()
+    assert [item["id"] for item in body["changes"]] == [first["id"]]
+
+    legacy = encode_keyset(datetime(2000, 1, 1), UUID(second["id"]))
+    response = client.get("/projects/1/observations/changes", params={"since": legacy}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_geom_is_derived_from_extras_coordinates(client: TestClient, auth_headers: dict, engine) -> None:
+    created = _create(client, auth_headers, 1)[0]
+    client.post(
+        "/projects/1/observations",
+        json=_payload(2, extras={"coordinates": ["x", 1]}),
+        headers=auth_headers,
+    )
+
+    with engine.connect() as conn:
+        rows = dict(conn.execute(select(Observation.id, Observation.geom)).all())
+    assert rows.pop(UUID(created["id"])) == "SRID=4326;POINT(-65.2 -26.8)"
+    assert list(rows.values()) == [None]
+
+
+def test_list_rejects_malformed_bbox(client: TestClient, auth_headers: dict) -> None:
+    response = client.get("/projects/1/observations", params={"bbox": "1,2,3"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_writes_build_the_response_from_returned_rows(
+    client: TestClient, auth_headers: dict, query_counter: list[str], engine
+) -> None:
+    [created] = _create(client, auth_headers, 1)
+    url = f"/projects/1/observations/{created['id']}"
+
+    query_counter.clear()
+    response = client.patch(url, json={"status": "revision", "building": {"bedrooms_count": 4}}, headers=auth_headers)
+    updated = response.json()
+    # data version bump, before, history, UPDATE ... RETURNING, location read, building upsert,
+    # rural read, observation_read upsert, tile cells; no refresh
+    assert len(query_counter) == 9
+    assert updated["status"] == "revision"
+    assert updated["building"]["bedrooms_count"] == 4 and updated["building"]["destination_code"] is None
+    assert updated["location"] == created["location"]
+    assert updated == client.get(url, headers=auth_headers).json()
+
+    client.patch(url, json={"location": None, "extras": {"coordinates": [-65.0, -26.0]}}, headers=auth_headers)
+    assert client.get(url, headers=auth_headers).json()["location"] is None
+    with engine.connect() as conn:
+        history = conn.execute(
+            select(ObservationStatusHistory.from_status, ObservationStatusHistory.to_status).order_by(
+                ObservationStatusHistory.id
+            )
+        ).all()
+    assert [(row.from_status, row.to_status) for row in history] == [
+        (None, ObservationStatus.CARGADO),
+        (ObservationStatus.CARGADO, ObservationStatus.REVISION),
+    ]
+
+    missing = client.patch(
+        "/projects/1/observations/00000000-0000-0000-0000-000000000000", json={"location": None}, headers=auth_headers
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,87 @@
+from uuid import UUID
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Observation, ObservationStatus, ObservationStatusHistory
+from app.services import outliers
+from app.services.outliers import OutlierMethod, detect_outliers, flag_outliers
+
+
+def test_flag_outliers_is_computed_per_group() -> None:
+    groups = np.array([0] * 9 + [1] * 9)
+    values = np.array([10, 11, 12, 10, 11, 12, 10, 11, 90] + [1000, 1040, 960, 1020, 980, 1010, 990, 1030, 970.0])
+
+    for method, threshold in ((OutlierMethod.IQR, 1.5), (OutlierMethod.MAD, 3.5)):
+        mask = flag_outliers(groups, values, method=method, threshold=threshold, min_group_size=5)
+        assert np.flatnonzero(mask).tolist() == [8]
+
+
+def test_flag_outliers_skips_small_and_degenerate_groups() -> None:
+    groups = np.array([0, 0, 0, 1, 1, 1, 1, 1])
+    values = np.array([1, 2, 500, 7, 7, 7, 7, 7.0])
+
+    mask = flag_outliers(groups, values, method=OutlierMethod.MAD, threshold=3.5, min_group_size=4)
+
+    assert not mask.any()
+
+
+PRICES = ["1000.00", "1100.00", "950.00", "1050.00", "980.00", "1020.00", "990.00", "1010.00", "99000.00"]
+
+
+def _create_lots(client: TestClient, auth_headers: dict) -> list[str]:
+    ids = []
+    for index, price in enumerate(PRICES):
+        payload = {
+            "project_id": 1,
+            "property_type": "urbano_baldio",
+            "price": price,
+            "currency": "USD",
+            "surface_total": "10.00",
+            "extras": {"name": f"Lote {index}"},
+        }
+        response = client.post("/projects/1/observations", json=payload, headers=auth_headers)
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_detect_endpoint_marks_outliers_and_writes_history(client: TestClient, auth_headers: dict) -> None:
+    ids = _create_lots(client, auth_headers)
+
+    dry_run = client.post("/projects/1/observations/outliers:detect", json={"dry_run": True}, headers=auth_headers)
+    assert dry_run.status_code == 200, dry_run.text
+    assert dry_run.json() == {"scanned": 9, "groups": 1, "flagged": 1, "updated": 1, "dry_run": True}
+
+    report = client.post("/projects/1/observations/outliers:detect", json={}, headers=auth_headers).json()
+    assert report["updated"] == 1
+
+    items = {item["id"]: item["status"] for item in client.get("/projects/1/observations", headers=auth_headers).json()}
+    assert items[ids[-1]] == "outlier"
+    assert sum(status == "outlier" for status in items.values()) == 1
+
+    again = client.post("/projects/1/observations/outliers:detect", json={}, headers=auth_headers).json()
+    assert again["flagged"] == 1 and again["updated"] == 0
+
+
+def test_detect_skips_rows_reviewed_after_the_scan(
+    client: TestClient, auth_headers: dict, engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reviewed = UUID(_create_lots(client, auth_headers)[-1])
+    load_prices = outliers._load_prices
+
+    def scan_then_review(db: Session, project_id: int, zone_size: float | None) -> dict:
+        data = load_prices(db, project_id, zone_size)
+        # A reviewer completes the outlier between the scan and the write.
+        db.execute(update(Observation).where(Observation.id == reviewed).values(status=ObservationStatus.COMPLETADO))
+        return data
+
+    monkeypatch.setattr(outliers, "_load_prices", scan_then_review)
+    with Session(engine) as db:
+        report = detect_outliers(db, 1)
+        assert report.flagged == 1 and report.updated == 0
+        assert db.get(Observation, (1, reviewed)).status == ObservationStatus.COMPLETADO
+        outlier_history = select(func.count()).where(ObservationStatusHistory.to_status == ObservationStatus.OUTLIER)
+        assert db.scalar(outlier_history) == 0
@@ -0,0 +1,20 @@
+from app.models import Observation, ObservationBuilding, ObservationLocation, ObservationRural, ObservationStatusHistory
+from app.services.partitions import PARTITIONED_TABLES, partition_name
+
+
+def test_partition_key_leads_every_partitioned_primary_key() -> None:
+    assert [column.name for column in Observation.__table__.primary_key] == ["project_id", "id"]
+    for model in (ObservationLocation, ObservationBuilding, ObservationRural):
+        assert model.__tablename__ in PARTITIONED_TABLES
+        assert [column.name for column in model.__table__.primary_key] == ["project_id", "observation_id"]
+
+
+def test_children_and_history_reference_the_composite_key() -> None:
+    for model in (ObservationLocation, ObservationBuilding, ObservationRural, ObservationStatusHistory):
+        (foreign_key,) = [fk for fk in model.__table__.foreign_key_constraints if fk.referred_table.name == "observations"]
+        assert [element.target_fullname for element in foreign_key.elements] == ["observations.project_id", "observations.id"]
+
+
+def test_partition_name() -> None:
+    assert partition_name("observations", 3) == "observations_p03"
+    assert partition_name("observation_rural", 15) == "observation_rural_p15"
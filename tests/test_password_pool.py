@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.password_pool import PasswordPool, PasswordPoolBusy, password_pool
+from app.core.security import get_password_hash
+from app.models import User
+
+
+def test_pool_verifies_in_worker_processes() -> None:
+    pool = PasswordPool(workers=1, max_pending=4)
+    try:
+        hashed = get_password_hash("secret")
+        assert pool.verify_and_update("secret", hashed) == (True, None)
+        assert pool.verify_and_update("wrong", hashed) == (False, None)
+        assert pool.stats()["completed"] == 2 and pool.stats()["pending"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_when_full() -> None:
+    pool = PasswordPool(workers=1, max_pending=0)
+    with pytest.raises(PasswordPoolBusy):
+        pool.verify_and_update("secret", get_password_hash("secret"))
+    assert pool.stats()["rejected"] == 1
+
+
+def test_login_returns_503_when_pool_is_saturated(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    response = client.post("/auth/login", json={"email": "user@test.com", "password": "test123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_outdated_cost(client: TestClient, engine: Engine) -> None:
+    with Session(engine) as db:
+        user = db.scalar(select(User).where(User.email == "user@test.com"))
+        user.hashed_password = bcrypt.using(rounds=4).hash("test123")
+        db.commit()
+
+    response = client.post("/auth/login", json={"email": "user@test.com", "password": "test123"})
+    assert response.status_code == 200
+
+    with Session(engine) as db:
+        hashed = db.scalar(select(User.hashed_password).where(User.email == "user@test.com"))
+    assert hashed.startswith(f"$2b${settings.bcrypt_rounds:02d}$")
+    assert client.post("/auth/login", json={"email": "user@test.com", "password": "test123"}).status_code == 200
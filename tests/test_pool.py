@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.core.pool import InstrumentedQueuePool
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect():
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 1
+        assert stats["wait"]["count"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["wait"]["timeouts"] == 1
+    assert stats["wait"]["buckets"]["+Inf"] == 1
+    engine.dispose()
+
+
+def test_pool_endpoint_requires_internal_token(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "internal_token", None)
+    assert client.get("/internal/pool").status_code == 404
+
+    monkeypatch.setattr(settings, "internal_token", "s3cret")
+    assert client.get("/internal/pool", headers={"X-Internal-Token": "nope"}).status_code == 401
+
+    response = client.get("/internal/pool", headers={"X-Internal-Token": "s3cret"})
+    assert response.status_code == 200
+    sync = response.json()["sync"]
+    assert sync["size"] == settings.db_pool_size
+    assert set(sync["wait"]) == {"count", "sum_ms", "buckets", "timeouts"}
@@ -0,0 +1,120 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, delete, event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache_backends import shared_backend
+from app.models import CatalogDestination, ObservationReadRow
+from app.services.read_model import _rerender_recoded_catalogs, rebuild_read_model
+
+
+def _payload(index: int, **overrides) -> dict:
+    payload = {
+        "project_id": 1,
+        "property_type": "urbano_edificado",
+        "price": "1000.00",
+        "currency": "USD",
+        "surface_total": "100.00",
+        "extras": {"name": f"Punto {index}", "coordinates": [-65.2 + index / 1000, -26.8]},
+        "location": {"padron": f"P-{index}", "legal_status_code": "escriturado"},
+        "building": {"bedrooms_count": 2, "destination_code": "vivienda"},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _projection(engine: Engine) -> dict:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(ObservationReadRow.id, ObservationReadRow.status, ObservationReadRow.geom, ObservationReadRow.document)
+        ).all()
+    return {row.id: row._tuple()[1:] for row in rows}
+
+
+def test_write_paths_keep_the_projection_equal_to_a_rebuild(
+    client: TestClient, auth_headers: dict, engine: Engine
+) -> None:
+    url = "/projects/1/observations"
+    ids = [client.post(url, json=_payload(index), headers=auth_headers).json()["id"] for index in range(4)]
+    client.patch(f"{url}/{ids[0]}", json={"status": "revision", "building": None}, headers=auth_headers)
+    client.patch(f"{url}/{ids[1]}", json={"extras": {"coordinates": [-64.0, -27.0]}}, headers=auth_headers)
+    client.delete(f"{url}/{ids[2]}", headers=auth_headers)
+    client.post(
+        f"{url}:batch",
+        json={"items": [{"data": _payload(10)}, {"id": ids[3], "data": {"location": None}}]},
+        headers=auth_headers,
+    )
+
+    maintained = _projection(engine)
+    assert len(maintained) == 4 and ids[2] not in {str(key) for key in maintained}
+    with Session(engine) as db:
+        assert rebuild_read_model(db, batch_size=2) == 4
+        db.commit()
+    assert _projection(engine) == maintained
+
+
+def test_reads_come_from_the_projection(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    created = [client.post("/projects/1/observations", json=_payload(i), headers=auth_headers).json() for i in range(2)]
+    detail_url = f"/projects/1/observations/{created[0]['id']}"
+    assert client.get(detail_url, headers=auth_headers).json() == created[0]
+
+    with engine.begin() as conn:
+        conn.execute(delete(ObservationReadRow))
+    shared_backend.clear()  # raw SQL bypasses the version bump that would change the cache key
+    assert client.get("/projects/1/observations", headers=auth_headers).json() == []
+    assert client.get(detail_url, headers=auth_headers).status_code == 404
+
+    with Session(engine) as db:
+        assert rebuild_read_model(db, project_id=1) == 2
+        db.commit()
+    shared_backend.clear()
+    assert client.get("/projects/1/observations", headers=auth_headers).json() == created[::-1]
+    assert client.get(detail_url, headers=auth_headers).json() == created[0]
+
+
+def test_patch_to_eliminado_leaves_the_projection(client: TestClient, auth_headers: dict) -> None:
+    kept, deleted = (
+        client.post("/projects/1/observations", json=_payload(index), headers=auth_headers).json()["id"]
+        for index in range(2)
+    )
+    detail_url = f"/projects/1/observations/{deleted}"
+
+    response = client.patch(detail_url, json={"status": "eliminado"}, headers=auth_headers)
+    assert response.status_code == 200 and response.json()["status"] == "eliminado"
+
+    assert [item["id"] for item in client.get("/projects/1/observations", headers=auth_headers).json()] == [kept]
+    assert client.get(detail_url, headers=auth_headers).status_code == 404
+    changes = client.get("/projects/1/observations/changes", headers=auth_headers).json()
+    assert changes["deleted"] == [deleted]
+
+
+def test_catalog_recode_rerenders_documents(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    created = client.post("/projects/1/observations", json=_payload(0), headers=auth_headers).json()
+
+    with Session(engine) as db:
+        assert not event.contains(db, "after_flush_postexec", _rerender_recoded_catalogs)
+        db.scalars(select(CatalogDestination).filter_by(code="vivienda")).one().code = "residencial"
+        db.commit()
+        assert event.contains(db, "after_flush_postexec", _rerender_recoded_catalogs)
+
+    detail = client.get(f"/projects/1/observations/{created['id']}", headers=auth_headers).json()
+    assert detail["building"]["destination_code"] == "residencial"
+    maintained = _projection(engine)
+    with Session(engine) as db:
+        rebuild_read_model(db)
+        db.commit()
+    assert _projection(engine) == maintained
+
+
+def test_batch_keeps_the_observation_of_items_it_soft_deletes(client: TestClient, auth_headers: dict) -> None:
+    created = client.post("/projects/1/observations", json=_payload(0), headers=auth_headers).json()
+
+    response = client.post(
+        "/projects/1/observations:batch",
+        json={"items": [{"id": created["id"], "data": {"status": "eliminado"}}]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    [item] = response.json()["items"]
+    assert item["observation"]["id"] == created["id"] and item["observation"]["status"] == "eliminado"
+    assert client.get("/projects/1/observations", headers=auth_headers).json() == []
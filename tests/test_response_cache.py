@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from app.core.cache_backends import MemoryBackend, shared_backend
+from app.models import ProjectRole, User, UserProject
+from app.services.response_cache import ResponseCache
+from app.services.versions import memberships_version_query
+
+
+def test_concurrent_misses_render_once() -> None:
+    cache = ResponseCache(MemoryBackend(max_entries=8, max_bytes=1024))
+    release = threading.Event()
+    calls = []
+
+    def compute() -> bytes:
+        calls.append(1)
+        release.wait(timeout=5)
+        return b"page"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.coalesced < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [b"page"] * 4
+    assert cache.get_or_compute("k", compute) == b"page" and calls == [1]
+
+
+def test_concurrent_async_misses_render_once() -> None:
+    cache = ResponseCache(MemoryBackend(max_entries=8, max_bytes=1024))
+    calls = []
+
+    async def compute() -> bytes:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"page"
+
+    async def main() -> list[bytes]:
+        return await asyncio.gather(*(cache.get_or_compute_async("k", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == [b"page"] * 5
+    assert calls == [1] and cache.coalesced == 4
+
+
+def test_async_path_keeps_blocking_backends_off_the_event_loop() -> None:
+    class NetworkBackend(MemoryBackend):
+        blocking = True
+
+        def get(self, key: str) -> bytes | None:
+            threads.add(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key: str, value: bytes) -> None:
+            threads.add(threading.get_ident())
+            super().set(key, value)
+
+    threads = set()
+    cache = ResponseCache(NetworkBackend(max_entries=8, max_bytes=1024))
+
+    async def compute() -> bytes:
+        return b"page"
+
+    async def main() -> tuple[int, list[bytes]]:
+        pages = [await cache.get_or_compute_async("k", compute) for _ in range(2)]
+        return threading.get_ident(), pages
+
+    loop_thread, pages = asyncio.run(main())
+    assert pages == [b"page"] * 2
+    assert threads and loop_thread not in threads
+
+
+def test_memory_backend_evicts_by_size() -> None:
+    backend = MemoryBackend(max_entries=100, max_bytes=10)
+    backend.set("a", b"12345")
+    backend.set("b", b"12345")
+    backend.set("c", b"12345")
+
+    assert backend.get("a") is None
+    assert backend.get("c") == b"12345"
+
+
+def test_list_page_is_served_from_cache_until_a_write(
+    client: TestClient, auth_headers: dict, query_counter: list[str]
+) -> None:
+    payload = {
+        "project_id": 1,
+        "property_type": "urbano_baldio",
+        "status": "cargado",
+        "extras": {"name": "Punto 1"},
+    }
+    client.post("/projects/1/observations", json=payload, headers=auth_headers)
+    first = client.get("/projects/1/observations", headers=auth_headers)
+
+    query_counter.clear()
+    second = client.get("/projects/1/observations", headers=auth_headers)
+    assert second.content == first.content
+    assert len(query_counter) == 1  # only the ETag version lookup
+
+    client.post("/projects/1/observations", json={**payload, "extras": {"name": "Punto 2"}}, headers=auth_headers)
+    assert len(client.get("/projects/1/observations", headers=auth_headers).json()) == 2
+
+
+def test_project_list_follows_membership_changes(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    assert [project["id"] for project in client.get("/projects", headers=auth_headers).json()] == [1]
+
+    with Session(engine) as db:
+        user = db.scalar(select(User).where(User.email == "user@test.com"))
+        db.add(UserProject(user_id=user.id, project_id=2, role=ProjectRole.VIEWER))
+        db.commit()
+
+    assert [project["id"] for project in client.get("/projects", headers=auth_headers).json()] == [1, 2]
+
+
+def test_project_list_key_lives_in_the_database(client: TestClient, auth_headers: dict, engine: Engine) -> None:
+    assert [project["id"] for project in client.get("/projects", headers=auth_headers).json()] == [1]
+    with Session(engine) as db:
+        before = db.scalar(memberships_version_query)
+        user = db.scalar(select(User).where(User.email == "user@test.com"))
+        user.hashed_password = "rehashed"  # as a login with stale bcrypt rounds does
+        db.commit()
+        assert db.scalar(memberships_version_query) == before
+        db.add(UserProject(user_id=user.id, project_id=2, role=ProjectRole.VIEWER))
+        db.commit()
+        assert db.scalar(memberships_version_query) == before + 1
+
+    # Another worker's process state (the memory backend's counters) plays no part in the key.
+    shared_backend.clear()
+    assert [project["id"] for project in client.get("/projects", headers=auth_headers).json()] == [1, 2]
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import ARCHIVE_TABLES, Observation, ObservationLocation, ObservationStatus, ObservationStatusHistory
+from app.services.retention import archive_deleted_observations, restore_observations, retention_cutoff
+
+
+def _create(client: TestClient, headers: dict, index: int) -> str:
+    payload = {
+        "project_id": 1,
+        "property_type": "urbano_edificado",
+        "status": "revision",
+        "extras": {"name": f"Punto {index}"},
+        "location": {"padron": f"P-{index}"},
+        "building": {"bedrooms_count": 2},
+    }
+    return client.post("/projects/1/observations", json=payload, headers=headers).json()["id"]
+
+
+def _count(db: Session, table, observation_id: str) -> int:
+    key = table.c.observation_id if "observation_id" in table.c else table.c.id
+    return db.scalar(select(func.count()).select_from(table).where(key == UUID(observation_id)))
+
+
+def test_changes_tokens_from_before_an_archived_deletion_must_resync(
+    client: TestClient, auth_headers: dict, engine: Engine
+) -> None:
+    kept, old = (_create(client, auth_headers, index) for index in range(2))
+    stale = client.get("/projects/1/observations/changes", headers=auth_headers).json()["next_token"]
+    client.delete(f"/projects/1/observations/{old}", headers=auth_headers)
+    current = client.get("/projects/1/observations/changes", headers=auth_headers).json()["next_token"]
+    with engine.begin() as conn:
+        conn.execute(
+            update(Observation)
+            .where(Observation.id == UUID(old))
+            .values(deleted_at=datetime.utcnow() - timedelta(days=400))
+        )
+    with Session(engine) as db:
+        assert archive_deleted_observations(db, cutoff=retention_cutoff(180)).observations == 1
+
+    gone = client.get("/projects/1/observations/changes", params={"since": stale}, headers=auth_headers)
+    assert gone.status_code == 410
+    # A client that had already seen the deletion loses nothing and keeps syncing.
+    changes = client.get("/projects/1/observations/changes", params={"since": current}, headers=auth_headers)
+    assert changes.status_code == 200 and changes.json()["deleted"] == []
+    resynced = client.get("/projects/1/observations/changes", headers=auth_headers).json()
+    assert [item["id"] for item in resynced["changes"]] == [kept]
+
+
+def test_purge_archives_old_deletions_in_batches_and_restores(
+    client: TestClient, auth_headers: dict, engine: Engine
+) -> None:
+    kept, recent, old, older = (_create(client, auth_headers, index) for index in range(4))
+    for observation_id in (recent, old, older):
+        client.delete(f"/projects/1/observations/{observation_id}", headers=auth_headers)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Observation)
+            .where(Observation.id.in_([UUID(old), UUID(older)]))
+            .values(deleted_at=datetime.utcnow() - timedelta(days=400))
+        )
+
+    with Session(engine) as db:
+        report = archive_deleted_observations(db, cutoff=retention_cutoff(180), batch_size=1, max_batches=1)
+        # observation + location + building + two history rows (create, delete)
+        assert (report.batches, report.observations, report.rows) == (1, 1, 5)
+        report = archive_deleted_observations(db, cutoff=retention_cutoff(180), batch_size=1)
+        assert (report.batches, report.observations) == (1, 1)
+        assert archive_deleted_observations(db, cutoff=retention_cutoff(180)).observations == 0
+
+        archived = {"observations": 1, "observation_location": 1, "observation_building": 1, "observation_rural": 0}
+        for observation_id in (old, older):
+            for live, archive in ARCHIVE_TABLES.items():
+                assert _count(db, live, observation_id) == 0
+                assert _count(db, archive, observation_id) == archived.get(live.name, 2)
+        assert db.get(Observation, (1, UUID(recent))).deleted_at is not None
+        assert _count(db, ObservationLocation.__table__, kept) == 1
+
+        # A later write moves the client's token past the seq the row had when it was archived.
+        client.patch(f"/projects/1/observations/{kept}", json={"extras": {"name": "Punto 0b"}}, headers=auth_headers)
+        token = client.get("/projects/1/observations/changes", headers=auth_headers).json()["next_token"]
+        assert restore_observations(db, 1, [UUID(old)]) == 1
+        assert db.get(Observation, (1, UUID(old))).status == ObservationStatus.ELIMINADO
+        changes = client.get("/projects/1/observations/changes", params={"since": token}, headers=auth_headers)
+        assert changes.json()["deleted"] == [old]
+        assert restore_observations(db, 1, undelete=True) == 1
+        restored = db.get(Observation, (1, UUID(older)))
+        assert restored.deleted_at is None and restored.status == ObservationStatus.REVISION
+        assert db.scalars(
+            select(ObservationStatusHistory.reason)
+            .where(ObservationStatusHistory.observation_id == UUID(older))
+            .order_by(ObservationStatusHistory.id)
+        ).all() == ["create", "delete", "restore"]
+        assert all(_count(db, archive, older) == 0 for archive in ARCHIVE_TABLES.values())
+
+    listed = client.get("/projects/1/observations", headers=auth_headers).json()
+    assert {item["id"] for item in listed} == {kept, older}
+    assert client.get(f"/projects/1/observations/{older}", headers=auth_headers).json()["location"]["padron"] == "P-3"
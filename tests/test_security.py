@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+def test_decode_token_caches_verified_claims() -> None:
+    token = create_access_token("7")
+    hits, misses = token_cache.hits, token_cache.misses
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second and first["sub"] == "7"
+    assert (token_cache.hits - hits, token_cache.misses - misses) == (1, 1)
+    second["sub"] = "tampered"
+    assert decode_token(token)["sub"] == "7"
+
+
+def test_decode_token_never_caches_invalid_or_expired_tokens() -> None:
+    forged = jwt.encode({"sub": "1"}, "not-the-secret", algorithm=settings.algorithm)
+    expired = create_access_token("1", expires_delta=timedelta(seconds=-1))
+
+    assert decode_token(forged) is None
+    assert decode_token(expired) is None
+    assert len(token_cache) == 0
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.api.routes import observations
+from app.services.clusters import cell_size_for_zoom
+from app.models.types import point_ewkt
+from app.services.tiles import (
+    CELL_ZOOM,
+    MAX_ZOOM,
+    TileCache,
+    is_valid_tile,
+    tile_for_point,
+    tile_version,
+    touch_tiles,
+)
+
+
+def test_tile_for_point_matches_slippy_map_scheme() -> None:
+    assert tile_for_point(0.0, 0.0, 0) == (0, 0)
+    assert tile_for_point(0.1, 0.1, 1) == (1, 0)
+    assert tile_for_point(-65.2, -26.8, 10) == (326, 591)
+    assert tile_for_point(180.0, -90.0, 3) == (7, 7)
+
+
+def test_is_valid_tile_bounds() -> None:
+    assert is_valid_tile(0, 0, 0)
+    assert is_valid_tile(MAX_ZOOM, 2**MAX_ZOOM - 1, 0)
+    assert not is_valid_tile(2, 4, 0)
+    assert not is_valid_tile(MAX_ZOOM + 1, 0, 0)
+
+
+def test_tiles_are_keyed_on_their_version() -> None:
+    cache = TileCache(max_entries=100)
+    cache.put(1, 3, 0, 0, 0, b"one")
+    cache.put(2, 3, 0, 0, 0, b"two")
+
+    assert cache.get(1, 3, 0, 0, 0) == b"one"
+    assert cache.get(1, 4, 0, 0, 0) is None
+    assert cache.get(2, 3, 0, 0, 0) == b"two"
+
+
+def test_tile_version_covers_deeper_and_shallower_tiles(client: TestClient, engine: Engine) -> None:
+    with Session(engine) as db:
+        touch_tiles(db, 1, 5, [point_ewkt(-65.2, -26.8), None])
+        touch_tiles(db, 2, 9, [point_ewkt(-65.2, -26.8)])
+        cell = tile_for_point(-65.2, -26.8, CELL_ZOOM)
+        deep = tile_for_point(-65.2, -26.8, 18)
+        assert tile_version(db, 1, CELL_ZOOM, *cell) == 5
+        assert tile_version(db, 1, 18, *deep) == 5
+        assert tile_version(db, 1, 10, *tile_for_point(-65.2, -26.8, 10)) == 5
+        assert tile_version(db, 1, 0, 0, 0) == 5
+        assert tile_version(db, 1, 10, *tile_for_point(10.0, 10.0, 10)) == 0
+        assert tile_version(db, 1, 18, deep[0] + 2**5, deep[1]) == 0
+
+
+def test_writes_retire_only_the_tiles_around_them(
+    client: TestClient, auth_headers: dict, engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rendered = []
+
+    def fake_render(db: Session, project_id: int, z: int, x: int, y: int) -> bytes:
+        rendered.append((z, x, y))
+        return b"tile %d" % len(rendered)
+
+    monkeypatch.setattr(observations, "render_tile", fake_render)
+    here = "/projects/1/observations/tiles/12/{}/{}.mvt".format(*tile_for_point(-65.2, -26.8, 12))
+    elsewhere = "/projects/1/observations/tiles/12/{}/{}.mvt".format(*tile_for_point(10.0, 10.0, 12))
+    assert client.get(here, headers=auth_headers).content == b"tile 1"
+    assert client.get(elsewhere, headers=auth_headers).content == b"tile 2"
+
+    payload = {"project_id": 1, "property_type": "urbano_baldio", "extras": {"coordinates": [-65.2, -26.8]}}
+    created = client.post("/projects/1/observations", json=payload, headers=auth_headers).json()
+    assert client.get(here, headers=auth_headers).content == b"tile 3"
+    assert client.get(elsewhere, headers=auth_headers).content == b"tile 2"
+
+    # Moving the point retires the tile it leaves as well as the one it lands in.
+    client.patch(
+        f"/projects/1/observations/{created['id']}", json={"extras": {"coordinates": [10.0, 10.0]}}, headers=auth_headers
+    )
+    assert client.get(here, headers=auth_headers).content == b"tile 4"
+    assert client.get(elsewhere, headers=auth_headers).content == b"tile 5"
+
+
+def test_tile_endpoint_rejects_out_of_range_tiles(client: TestClient, auth_headers: dict) -> None:
+    response = client.get("/projects/1/observations/tiles/1/5/0.mvt", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_cluster_grid_cells_halve_with_each_zoom_level() -> None:
+    assert cell_size_for_zoom(0) == pytest.approx(2 * 20037508.342789244 / 4)
+    assert cell_size_for_zoom(11) == pytest.approx(cell_size_for_zoom(10) / 2)
+
+
+def test_cluster_endpoint_validates_bbox_and_zoom(client: TestClient, auth_headers: dict) -> None:
+    url = "/projects/1/observations/clusters"
+    assert client.get(url, params={"bbox": "0,0,1", "zoom": 3}, headers=auth_headers).status_code == 400
+    assert client.get(url, params={"bbox": "0,0,1,1", "zoom": 40}, headers=auth_headers).status_code == 422